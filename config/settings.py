@@ -19,22 +19,154 @@ class Config:
     DEFAULT_BROWSER = os.getenv('BROWSER', 'chrome')
     HEADLESS = os.getenv('HEADLESS', 'true').lower() == 'true'
     
+    # Page reuse: skip reloading a page the driver already holds an untouched copy of
+    REUSE_PAGES = os.getenv('REUSE_PAGES', 'false').lower() == 'true'
+    
     # Timeout settings
     DEFAULT_TIMEOUT = 10
     PAGE_LOAD_TIMEOUT = 30
     SCRIPT_TIMEOUT = 30
     
+    # Network/CPU emulation profiles (Chrome): latency in ms, throughput in bytes/s, CPU slowdown factor.
+    # Combine profiles with '+', e.g. '3G+4x-cpu'.
+    THROTTLE = os.getenv('THROTTLE')
+    THROTTLE_PROFILES = {
+        'slow-3G': {'latency': 2000, 'download': 400 * 1024 // 8, 'upload': 400 * 1024 // 8},
+        '3G': {'latency': 300, 'download': 1600 * 1024 // 8, 'upload': 768 * 1024 // 8},
+        'slow-4G': {'latency': 150, 'download': 1600 * 1024 // 8, 'upload': 750 * 1024 // 8, 'cpu': 4},
+        '4G': {'latency': 20, 'download': 4096 * 1024 // 8, 'upload': 3072 * 1024 // 8},
+        '4x-cpu': {'cpu': 4},
+        '6x-cpu': {'cpu': 6},
+    }
+    
     # Screenshot settings
     SCREENSHOT_ON_FAILURE = True
     SCREENSHOT_DIR = 'reports/screenshots'
+    SCREENSHOT_FORMAT = os.getenv('SCREENSHOT_FORMAT', 'png')  # png, jpeg or webp
+    SCREENSHOT_QUALITY = int(os.getenv('SCREENSHOT_QUALITY', '80'))
+    SCREENSHOT_COMPRESS = True
+    
+    # Visual checks: baselines per browser, viewport and page object; diff images only for failures
+    VISUAL_BASELINE_DIR = os.getenv('VISUAL_BASELINE_DIR', 'visual_baselines')
+    VISUAL_DIFF_DIR = 'reports/visual'
+    VISUAL_UPDATE = os.getenv('VISUAL_UPDATE', 'false').lower() == 'true'
+    VISUAL_PIXEL_THRESHOLD = 24  # max per-channel difference of a matching pixel
+    VISUAL_ANTI_ALIASING = True  # ignore pixels matched by a neighbour in the other image
+    VISUAL_MAX_DIFF_PIXELS = 0  # differing pixels left after the anti-aliasing tolerance
+    VISUAL_MASK_COLOR = (255, 0, 255)
+    
+    # Flight recorder: rolling screencast, console and network buffer dumped on failure (Chrome)
+    FLIGHT_RECORDER = os.getenv('FLIGHT_RECORDER', 'false').lower() == 'true'
+    FLIGHT_RECORDER_DIR = 'reports/flight_recorder'
+    FLIGHT_RECORDER_SECONDS = 15
+    FLIGHT_RECORDER_MAX_BYTES = 16 * 1024 * 1024
+    FLIGHT_RECORDER_MAX_EVENTS = 2000
+    FLIGHT_RECORDER_INTERVAL = 0.5
+    FLIGHT_RECORDER_QUALITY = 40
+    FLIGHT_RECORDER_WIDTH = 640
+    FLIGHT_RECORDER_HEIGHT = 360
+    
+    # Per-test browser resource probe: leak thresholds are growth over one test,
+    # recycle limits are absolute values that trigger a browser restart
+    RESOURCE_PROBE = os.getenv('RESOURCE_PROBE', 'false').lower() == 'true'
+    RESOURCE_LEAK_THRESHOLDS = {
+        'js_heap': 5 * 1024 * 1024,
+        'dom_nodes': 1000,
+        'listeners': 200,
+        'documents': 2,
+        'windows': 0
+    }
+    RESOURCE_RECYCLE_LIMITS = {
+        'browser_rss': 2 * 1024 * 1024 * 1024,
+        'js_heap': 512 * 1024 * 1024
+    }
+    
+    # Core Web Vitals (LCP, CLS, TBT, INP) per page object; observers are injected through CDP (Chrome)
+    WEB_VITALS = os.getenv('WEB_VITALS', 'false').lower() == 'true'
+    
+    # Performance budgets per page object/URL path, checked on every page visit:
+    # 'report' lists violations after the run, 'strict' also fails the test, 'off' disables them
+    PERF_BUDGETS = os.getenv('PERF_BUDGETS', 'report')
+    PERF_BUDGETS_FILE = os.getenv('PERF_BUDGETS_FILE', 'config/performance_budgets.json')
+    
+    # Chrome traces of performance-marked tests (--chrome-trace), streamed to reports/traces/*.json.gz
+    CHROME_TRACE = os.getenv('CHROME_TRACE', 'false').lower() == 'true'
+    TRACE_DIR = 'reports/traces'
+    TRACE_CATEGORIES = os.getenv(
+        'TRACE_CATEGORIES',
+        'devtools.timeline,disabled-by-default-devtools.timeline,disabled-by-default-devtools.timeline.frame,'
+        'toplevel,v8.execute,blink.user_timing,loading'
+    ).split(',')
+    TRACE_TOP_TASKS = 10
+    TRACE_TIMEOUT = 60  # seconds to wait for Chrome to start tracing or to hand over the trace
+    
+    # Per-test time breakdown (--profile-time): tables and folded stacks for the slowest tests
+    PROFILE_DIR = 'reports/profile'
+    PROFILE_TOP = 10
     
     # Report settings
     REPORT_DIR = 'reports'
     HTML_REPORT_FILE = 'reports/test_report.html'
+    JUNIT_REPORT_FILE = 'reports/junit.xml'
+    JSON_REPORT_FILE = 'reports/report.json'
+    RESULTS_STREAM_DIR = 'reports/results'  # one JSONL file per xdist worker
+    PROGRESS_PORT = int(os.getenv('PROGRESS_PORT', '0'))  # 0 = no live progress server
+    LEAN_REPORT_DIR = 'reports/lean'
+    LEAN_REPORT_PAGE_SIZE = 100
+    LEAN_REPORT_THUMBNAIL_WIDTH = 240
     
     # Test data
     TEST_DATA_DIR = 'test_data'
     
+    # Run history kept between test runs (not cleaned with reports)
+    HISTORY_DIR = os.getenv('TEST_HISTORY_DIR', '.test_history')
+    
+    # Runner daemon (warm interpreter and browsers) listens on localhost
+    DAEMON_PORT = int(os.getenv('RUNNER_DAEMON_PORT', '47800'))
+    
+    # Per-test durations used to balance shards
+    DURATIONS_FILE = os.path.join(HISTORY_DIR, 'durations.json')
+    # Every shard plans from the same committed file so all agents compute the same split;
+    # each shard reports its durations and the merge command folds them into an updated copy
+    SHARD_DURATIONS_FILE = os.getenv('SHARD_DURATIONS_FILE', 'config/test_durations.json')
+    SHARD_DURATIONS_REPORT = 'reports/durations.json'
+    
+    # Flaky test tracking: scores over the last FLAKINESS_WINDOW runs of each test
+    FLAKINESS_DB = os.path.join(HISTORY_DIR, 'flakiness.db')
+    FLAKINESS_WINDOW = 20
+    FLAKINESS_MIN_RUNS = 3
+    FLAKINESS_RERUN_THRESHOLD = 0.1
+    FLAKINESS_QUARANTINE_THRESHOLD = 0.3
+    
+    # Performance history: the latest PERF_RECENT_RUNS runs are compared with the PERF_BASELINE_RUNS before them
+    PERF_HISTORY_DB = os.path.join(HISTORY_DIR, 'perf_history.db')
+    PERF_RECENT_RUNS = 3
+    PERF_BASELINE_RUNS = 20
+    PERF_MIN_BASELINE = 5
+    PERF_ALPHA = 0.01
+    PERF_MIN_CHANGE = 0.10  # ignore significant but small (<10%) slowdowns
+    PERF_SAMPLE_ITERATIONS = 5  # warm runs per perf_sample, after one cold run
+    
+    # Resource waterfall per page visit (Resource Timing); resources more than
+    # WATERFALL_SLOWDOWN_MS slower than their running average are reported
+    WATERFALL = os.getenv('WATERFALL', 'false').lower() == 'true'
+    WATERFALL_DIR = 'reports/waterfall'
+    WATERFALL_BASELINE_FILE = os.path.join(HISTORY_DIR, 'resource_baseline.json')
+    WATERFALL_BUFFER_SIZE = 1000
+    WATERFALL_TOP = 5
+    WATERFALL_SLOWDOWN_MS = 200
+    
+    # Load mode reports
+    LOAD_REPORT_DIR = 'reports/load'
+    LOAD_MAX_ERROR_RATE = 0.01  # share of failed iterations that fails the load run
+    
+    # Test impact analysis
+    IMPACT_INDEX_FILE = os.path.join(HISTORY_DIR, 'impact_index.json')
+    IMPACT_FULL_RUN_PATHS = [
+        'utils/', 'config/', 'test_data/', 'tests/conftest.py',
+        'run_tests.py', 'pytest.ini', 'requirements.txt'
+    ]
+    
     # Authentication credentials
     BASIC_AUTH_USERNAME = 'admin'
     BASIC_AUTH_PASSWORD = 'admin'
@@ -1,16 +1,31 @@
-from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException
 from utils.helpers import WaitHelpers, ScreenshotHelper, ActionHelper, AlertHelper, SelectHelper
+from utils.page_state import PageStateTracker
+from utils.page_metrics import PageMetricsRecorder, collect_page_metrics
+from utils.web_vitals import WebVitalsRecorder
+from utils.resource_waterfall import WaterfallRecorder
+from utils.perf_budgets import CommandCounter
+from utils.driver_factory import DriverFactory
 from config.settings import Config
 import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Annotation only: importing selenium.webdriver costs most of this module's import time
+    from selenium.webdriver.remote.webdriver import WebDriver
 
 class BasePage:
     """Base page class containing common functionality for all pages"""
     
-    def __init__(self, driver: WebDriver):
+    # Page objects opt in to page reuse by listing the methods that change page state
+    MUTATING_METHODS = None
+    
+    # Locators of dynamic elements that assert_visual paints over
+    VISUAL_MASKS = ()
+    # Locators of the elements assert_visual compares; empty for the whole viewport
+    VISUAL_REGIONS = ()
+    
+    def __init__(self, driver: "WebDriver"):
         self.driver = driver
         self.wait_helper = WaitHelpers(driver)
         self.action_helper = ActionHelper(driver)
@@ -19,9 +34,43 @@ class BasePage:
     
     # Navigation methods
     def go_to_url(self, url):
-        """Navigate to specified URL"""
+        """Navigate to specified URL, reusing an untouched copy of it when page reuse is enabled"""
+        reusable = Config.REUSE_PAGES and self.MUTATING_METHODS is not None
+        if reusable and PageStateTracker.is_clean_copy(self.driver, url):
+            # No load, so no metrics, vitals or waterfall: the reports count the visit as reused instead
+            PageStateTracker.record_reuse(self.driver, type(self).__name__)
+            return
+        
+        if PageMetricsRecorder.is_active(self.driver):
+            CommandCounter.finish_visit(self.driver)
+        
+        if Config.WEB_VITALS:
+            # The page being left is done: read its vitals before the document goes away
+            WebVitalsRecorder.flush(self.driver)
+            injected = WebVitalsRecorder.prepare(self.driver)
+        if Config.WATERFALL:
+            WaterfallRecorder.prepare(self.driver)
+        
         self.driver.get(url)
         self.wait_for_page_to_load()
+        
+        if Config.WEB_VITALS:
+            WebVitalsRecorder.page_loaded(self.driver, type(self).__name__, injected)
+        
+        if reusable:
+            PageStateTracker.record_clean_load(self.driver, url)
+        else:
+            PageStateTracker.forget(self.driver)
+        
+        if PageMetricsRecorder.is_active(self.driver) and self.collect_performance_metrics() is not None:
+            CommandCounter.start_visit(self.driver)
+        
+        if Config.WATERFALL:
+            WaterfallRecorder.capture(self.driver, type(self).__name__)
+    
+    def mark_page_dirty(self):
+        """Record that the current page state may have changed"""
+        PageStateTracker.mark_dirty(self.driver)
     
     def get_current_url(self):
         """Get current page URL"""
@@ -33,15 +82,18 @@ class BasePage:
     
     def refresh_page(self):
         """Refresh current page"""
+        self.mark_page_dirty()
         self.driver.refresh()
         self.wait_for_page_to_load()
     
     def go_back(self):
         """Navigate back in browser history"""
+        self.mark_page_dirty()
         self.driver.back()
     
     def go_forward(self):
         """Navigate forward in browser history"""
+        self.mark_page_dirty()
         self.driver.forward()
     
     # Element finding methods
@@ -88,32 +140,38 @@ class BasePage:
     # Interaction methods
     def click(self, locator):
         """Click on element"""
+        self.mark_page_dirty()
         element = self.find_element_clickable(locator)
         element.click()
     
     def double_click(self, locator):
         """Double click on element"""
+        self.mark_page_dirty()
         element = self.find_element_clickable(locator)
         self.action_helper.double_click(element)
     
     def right_click(self, locator):
         """Right click on element"""
+        self.mark_page_dirty()
         element = self.find_element_clickable(locator)
         self.action_helper.right_click(element)
     
     def hover_over_element(self, locator):
         """Hover over element"""
+        self.mark_page_dirty()
         element = self.find_element_visible(locator)
         self.action_helper.hover_over_element(element)
     
     def enter_text(self, locator, text):
         """Enter text into input field"""
+        self.mark_page_dirty()
         element = self.find_element_visible(locator)
         element.clear()
         element.send_keys(text)
     
     def clear_text(self, locator):
         """Clear text from input field"""
+        self.mark_page_dirty()
         element = self.find_element_visible(locator)
         element.clear()
     
@@ -130,11 +188,13 @@ class BasePage:
     # Dropdown methods
     def select_dropdown_by_text(self, locator, text):
         """Select dropdown option by visible text"""
+        self.mark_page_dirty()
         element = self.find_element_visible(locator)
         SelectHelper.select_by_text(element, text)
     
     def select_dropdown_by_value(self, locator, value):
         """Select dropdown option by value"""
+        self.mark_page_dirty()
         element = self.find_element_visible(locator)
         SelectHelper.select_by_value(element, value)
     
@@ -146,12 +206,14 @@ class BasePage:
     # Checkbox and radio button methods
     def check_checkbox(self, locator):
         """Check checkbox if not already checked"""
+        self.mark_page_dirty()
         element = self.find_element_clickable(locator)
         if not element.is_selected():
             element.click()
     
     def uncheck_checkbox(self, locator):
         """Uncheck checkbox if checked"""
+        self.mark_page_dirty()
         element = self.find_element_clickable(locator)
         if element.is_selected():
             element.click()
@@ -164,10 +226,12 @@ class BasePage:
     # Alert methods
     def accept_alert(self):
         """Accept alert dialog"""
+        self.mark_page_dirty()
         return self.alert_helper.accept_alert()
     
     def dismiss_alert(self):
         """Dismiss alert dialog"""
+        self.mark_page_dirty()
         return self.alert_helper.dismiss_alert()
     
     def get_alert_text(self):
@@ -176,6 +240,7 @@ class BasePage:
     
     def send_keys_to_alert(self, text):
         """Send keys to alert prompt"""
+        self.mark_page_dirty()
         self.alert_helper.send_keys_to_alert(text)
     
     # Screenshot methods
@@ -188,23 +253,32 @@ class BasePage:
         element = self.find_element_visible(locator)
         return self.screenshot_helper.take_element_screenshot(self.driver, element, filename)
     
+    def take_element_screenshots(self, locators, filename=None):
+        """Take screenshots of every element matching the locators with a single capture"""
+        elements = [element for locator in locators for element in self.find_elements(locator)]
+        return self.screenshot_helper.take_element_screenshots(self.driver, elements, filename)
+    
     # Scroll methods
     def scroll_to_element(self, locator):
         """Scroll to element"""
+        self.mark_page_dirty()
         element = self.find_element(locator)
         self.action_helper.scroll_to_element(element)
     
     def scroll_to_top(self):
         """Scroll to top of page"""
+        self.mark_page_dirty()
         self.driver.execute_script("window.scrollTo(0, 0);")
     
     def scroll_to_bottom(self):
         """Scroll to bottom of page"""
+        self.mark_page_dirty()
         self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
     
     # Window and frame methods
     def switch_to_frame(self, frame_locator):
         """Switch to iframe"""
+        self.mark_page_dirty()
         frame = self.find_element(frame_locator)
         self.driver.switch_to.frame(frame)
     
@@ -214,6 +288,7 @@ class BasePage:
     
     def switch_to_window(self, window_handle):
         """Switch to specific window"""
+        self.mark_page_dirty()
         self.driver.switch_to.window(window_handle)
     
     def get_window_handles(self):
@@ -222,6 +297,7 @@ class BasePage:
     
     def close_current_window(self):
         """Close current window"""
+        self.mark_page_dirty()
         self.driver.close()
     
     # Wait methods
@@ -244,11 +320,35 @@ class BasePage:
         """Simple wait for specified seconds"""
         time.sleep(seconds)
     
+    # Visual methods
+    def assert_visual(self, name, regions=None, masks=None):
+        """Compare the viewport, or the given regions, with the stored baseline (VISUAL_REGIONS and VISUAL_MASKS by default)"""
+        # NumPy and Pillow are only imported by pages that take visual checks, not during collection
+        from utils.visual import VisualCheck
+        
+        regions = self.VISUAL_REGIONS if regions is None else regions
+        masks = self.VISUAL_MASKS if masks is None else masks
+        return VisualCheck(self.driver, type(self).__name__).assert_matches(name, regions, masks)
+    
+    # Performance methods
+    def collect_performance_metrics(self):
+        """Get navigation, paint, resource and long task timings of the current page from the browser"""
+        try:
+            visit = collect_page_metrics(self.driver)
+        except Exception as e:
+            print(f"Failed to collect performance metrics: {str(e)}")
+            return None
+        visit["throttle"] = DriverFactory.get_throttling(self.driver)
+        PageMetricsRecorder.record(self.driver, type(self).__name__, visit)
+        return visit["metrics"]
+    
     # JavaScript execution methods
     def execute_script(self, script, *args):
         """Execute JavaScript"""
+        self.mark_page_dirty()
         return self.driver.execute_script(script, *args)
     
     def execute_async_script(self, script, *args):
         """Execute asynchronous JavaScript"""
+        self.mark_page_dirty()
         return self.driver.execute_async_script(script, *args)
@@ -7,6 +7,11 @@ import time
 class CheckboxesPage(BasePage):
     """Page Object for Checkboxes example"""
     
+    MUTATING_METHODS = (
+        "check_first_checkbox", "uncheck_first_checkbox",
+        "check_second_checkbox", "uncheck_second_checkbox"
+    )
+    
     def __init__(self, driver):
         super().__init__(driver)
         self.url = f"{Config.BASE_URL}/checkboxes"
@@ -53,6 +58,11 @@ class CheckboxesPage(BasePage):
 class DropdownPage(BasePage):
     """Page Object for Dropdown example"""
     
+    MUTATING_METHODS = (
+        "select_option_by_text", "select_option_by_value",
+        "select_option_1", "select_option_2"
+    )
+    
     def __init__(self, driver):
         super().__init__(driver)
         self.url = f"{Config.BASE_URL}/dropdown"
@@ -97,6 +107,12 @@ class DynamicContentPage(BasePage):
     CLICK_HERE_LINK = (By.LINK_TEXT, "click here")
     CONTENT_ROWS = (By.CSS_SELECTOR, ".large-10.columns")
     IMAGES = (By.CSS_SELECTOR, ".large-2.columns img")
+    INTRODUCTION = (By.CSS_SELECTOR, "#content .example > p")
+    
+    # The rows of random text change height and move everything below them,
+    # so masks cannot steady the viewport: only the heading and the
+    # introduction have a fixed size
+    VISUAL_REGIONS = (PAGE_TITLE, INTRODUCTION)
     
     def navigate_to_dynamic_content(self):
         """Navigate to dynamic content page"""
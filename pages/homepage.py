@@ -5,6 +5,18 @@ from config.settings import Config
 class HomePage(BasePage):
     """Page Object for the-internet.herokuapp.com homepage"""
     
+    # Every click_* method navigates away from the homepage
+    MUTATING_METHODS = (
+        "click_basic_auth_link", "click_form_authentication_link", "click_checkboxes_link",
+        "click_dropdown_link", "click_dynamic_content_link", "click_dynamic_controls_link",
+        "click_dynamic_loading_link", "click_file_download_link", "click_file_upload_link",
+        "click_hovers_link", "click_javascript_alerts_link", "click_drag_and_drop_link",
+        "click_context_menu_link", "click_inputs_link", "click_key_presses_link",
+        "click_multiple_windows_link", "click_notification_messages_link", "click_redirect_link",
+        "click_sortable_data_tables_link", "click_status_codes_link", "click_typos_link",
+        "click_wysiwyg_editor_link"
+    )
+    
     def __init__(self, driver):
         super().__init__(driver)
         self.url = f"{Config.BASE_URL}/"
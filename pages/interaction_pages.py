@@ -8,6 +8,10 @@ import os
 class HoversPage(BasePage):
     """Page Object for Hovers example"""
     
+    MUTATING_METHODS = (
+        "hover_over_user_1", "hover_over_user_2", "hover_over_user_3", "click_user_1_link"
+    )
+    
     def __init__(self, driver):
         super().__init__(driver)
         self.url = f"{Config.BASE_URL}/hovers"
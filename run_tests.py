@@ -3,7 +3,6 @@
 Test Automation Framework - Test Runner
 Comprehensive test execution script with advanced features
 """
-import pytest
 import sys
 import os
 import argparse
@@ -20,12 +19,11 @@ def get_pytest_args(args):
     """Convert command line arguments to pytest arguments"""
     pytest_args = []
     
-    # Add HTML report
-    if args.html_report:
-        pytest_args.extend([
-            "--html", Config.HTML_REPORT_FILE,
-            "--self-contained-html"
-        ])
+    # pytest.ini writes the HTML report; the lean report is built from streamed results instead
+    if args.lean_report:
+        pytest_args.extend(["--stream-results", "--no-html-report"])
+    elif not args.html_report:
+        pytest_args.append("--no-html-report")
     
     # Add browser option
     pytest_args.extend(["--browser", args.browser])
@@ -56,9 +54,15 @@ def get_pytest_args(args):
     if args.verbose:
         pytest_args.extend(["-v", "-s"])
     
-    # Add reruns for flaky tests
+    # Add reruns, only for tests with a flaky history unless asked otherwise
     if args.reruns > 0:
-        pytest_args.extend(["--reruns", str(args.reruns)])
+        if args.rerun_all:
+            pytest_args.extend(["--reruns", str(args.reruns)])
+        else:
+            pytest_args.extend(["--flaky-reruns", str(args.reruns)])
+    
+    # Add flaky test lane
+    pytest_args.extend(["--lane", args.lane])
     
     # Add capture option
     if args.capture == "no":
@@ -71,10 +75,370 @@ def get_pytest_args(args):
     if args.max_failures > 0:
         pytest_args.extend(["--maxfail", str(args.max_failures)])
     
+    # Add flight recorder
+    if args.flight_recorder:
+        pytest_args.append("--flight-recorder")
+    
+    # Add network/CPU emulation
+    if args.throttle:
+        pytest_args.extend(["--throttle", args.throttle])
+    
+    # Add Web Vitals collection
+    if args.web_vitals:
+        pytest_args.append("--web-vitals")
+    
+    # Add resource waterfall capture
+    if args.waterfall:
+        pytest_args.append("--waterfall")
+    
+    # Add performance budget mode
+    if args.perf_budgets:
+        pytest_args.extend(["--perf-budgets", args.perf_budgets])
+    
+    # Add Chrome tracing of performance tests
+    if args.chrome_trace:
+        pytest_args.append("--chrome-trace")
+    if args.trace_categories:
+        pytest_args.extend(["--trace-categories", args.trace_categories])
+    
+    # Add visual baseline update
+    if args.update_visual_baselines:
+        pytest_args.append("--update-visual-baselines")
+    
+    # Add per-test time breakdown
+    if args.profile_time:
+        pytest_args.append("--profile-time")
+    
+    # Add browser resource probing
+    if args.resource_probe:
+        pytest_args.append("--resource-probe")
+    
+    # Add streamed results and live progress
+    if args.stream_results and not args.lean_report:
+        pytest_args.append("--stream-results")
+    
+    if args.progress_port:
+        pytest_args.extend(["--progress-port", str(args.progress_port)])
+    
+    # Add page reuse
+    if args.reuse_pages:
+        pytest_args.append("--reuse-pages")
+    
+    # Add test impact analysis
+    if args.record_impact:
+        pytest_args.append("--impact-record")
+    
+    if args.changed_since:
+        pytest_args.extend(["--impact-since", args.changed_since])
+    
+    # Add sharding with machine-readable outputs for the merge command
+    if args.shard:
+        pytest_args.extend([
+            "--shard", args.shard,
+            "--junitxml", Config.JUNIT_REPORT_FILE,
+            "--json-report", "--json-report-file", Config.JSON_REPORT_FILE
+        ])
+    
     return pytest_args
 
+def merge_command(argv):
+    """Merge the report directories of sharded runs into one report"""
+    from utils.report_merge import ShardReportMerger
+    
+    parser = argparse.ArgumentParser(
+        prog="run_tests.py merge",
+        description="Merge JUnit/JSON/HTML outputs and screenshots of sharded runs"
+    )
+    parser.add_argument("shard_dirs", nargs="+", help="Report directories written by each shard")
+    parser.add_argument(
+        "-o", "--output",
+        default=os.path.join(Config.REPORT_DIR, "merged"),
+        help="Directory for the merged report (default: reports/merged)"
+    )
+    args = parser.parse_args(argv)
+    
+    totals = ShardReportMerger(args.shard_dirs, args.output).merge()
+    print(f"📦 Merged {len(args.shard_dirs)} shards into {args.output}")
+    print(f"🧮 Tests: {totals['tests']}, failed: {totals['failed']}, errors: {totals['error']}")
+    durations_file = os.path.join(args.output, ShardReportMerger.DURATIONS_FILE)
+    if os.path.exists(durations_file):
+        print(f"⏱️  Updated shard durations: {durations_file} (commit as {Config.SHARD_DURATIONS_FILE} to rebalance)")
+    return 1 if totals["failed"] or totals["error"] else 0
+
+def report_command(argv):
+    """Build the lean report, or a self-contained page for one test, from streamed results"""
+    from utils.lean_report import LeanReportBuilder
+    
+    parser = argparse.ArgumentParser(
+        prog="run_tests.py report",
+        description="Build the lean HTML report from the JSONL results of the last --stream-results run"
+    )
+    parser.add_argument(
+        "--results",
+        default=Config.RESULTS_STREAM_DIR,
+        help="Directory with the streamed results (default: reports/results)"
+    )
+    parser.add_argument(
+        "-o", "--output",
+        default=Config.LEAN_REPORT_DIR,
+        help="Directory for the lean report (default: reports/lean)"
+    )
+    parser.add_argument(
+        "--export",
+        metavar="NODEID",
+        help="Write a single self-contained HTML file for this test instead"
+    )
+    args = parser.parse_args(argv)
+    
+    builder = LeanReportBuilder(args.output, args.results)
+    if args.export:
+        output_file = os.path.join(args.output, "export.html")
+        try:
+            builder.export_test(args.export, output_file)
+        except ValueError as e:
+            print(f"❌ {str(e)}")
+            return 1
+        print(f"📤 Exported {args.export} to {output_file}")
+        return 0
+    
+    totals = builder.build()
+    print(f"📊 Lean report: {os.path.join(args.output, 'index.html')} ({totals['tests']} tests)")
+    return 0
+
+def perf_report_command(argv):
+    """Flag statistically significant slowdowns in the performance history"""
+    from utils.perf_history import PerfHistoryStore, PerfRegressionDetector
+    
+    parser = argparse.ArgumentParser(
+        prog="run_tests.py perf-report",
+        description="Compare the latest runs' timings with earlier runs (one-sided Mann-Whitney U test)"
+    )
+    parser.add_argument("--env", "--environment", dest="environment", default="dev",
+                        help="Environment the runs were against (default: dev)")
+    parser.add_argument("--browser", default="chrome", help="Browser the runs used (default: chrome)")
+    parser.add_argument("--recent", type=int, default=Config.PERF_RECENT_RUNS,
+                        help=f"Number of latest runs to test (default: {Config.PERF_RECENT_RUNS})")
+    parser.add_argument("--baseline", type=int, default=Config.PERF_BASELINE_RUNS,
+                        help=f"Number of earlier runs to compare with (default: {Config.PERF_BASELINE_RUNS})")
+    parser.add_argument("--alpha", type=float, default=Config.PERF_ALPHA,
+                        help=f"Significance level (default: {Config.PERF_ALPHA})")
+    args = parser.parse_args(argv)
+    
+    store = PerfHistoryStore()
+    results = PerfRegressionDetector(store, args.recent, args.baseline, args.alpha).analyze(args.environment, args.browser)
+    store.close()
+    
+    if not results:
+        print(f"No performance history for {args.environment}/{args.browser}")
+        return 0
+    
+    print(f"📈 Performance: last {args.recent} runs vs previous {args.baseline} ({args.environment}/{args.browser})")
+    print(f"{'verdict':<12} {'baseline':>9} {'recent':>9} {'change':>8} {'p':>7}  measurement")
+    for result in results:
+        if "p_value" not in result:
+            print(f"{'-':<12} {'':>9} {'':>9} {'':>8} {'':>7}  {result['nodeid']} [{result['name']}] "
+                  f"({result['verdict']}: {result['baseline']} baseline runs)")
+            continue
+        unit = "" if result["name"].startswith("cls") else "s"
+        print(f"{result['verdict']:<12} {result['baseline_median']:>8.3f}{unit:1} {result['recent_median']:>8.3f}{unit:1} "
+              f"{result['change'] * 100:>+7.1f}% {result['p_value']:>7.4f}  {result['nodeid']} [{result['name']}]")
+    
+    regressions = [result for result in results if result["verdict"] == "REGRESSION"]
+    if regressions:
+        print(f"❌ {len(regressions)} significant regression(s)")
+        return 1
+    print("✅ No significant regressions")
+    return 0
+
+def load_command(argv):
+    """Run a page object scenario concurrently in a pool of headless browsers"""
+    from utils.load_results import parse_duration
+    
+    parser = argparse.ArgumentParser(
+        prog="run_tests.py load",
+        description="Browser-driven load: every virtual user runs the scenario in its own headless browser"
+    )
+    parser.add_argument("--scenario", default="login", help="Scenario to run (default: login)")
+    parser.add_argument("--users", type=int, default=5, help="Number of virtual users (default: 5)")
+    parser.add_argument("--duration", default="1m", help="Run time, e.g. 30s, 5m (default: 1m)")
+    parser.add_argument("--ramp-up", default="0s", help="Time over which users are started (default: 0s)")
+    parser.add_argument("--pacing", default="0s",
+                        help="Minimum time between iteration starts per user (default: 0s)")
+    parser.add_argument("--browser", choices=["chrome", "firefox"], default="chrome")
+    parser.add_argument("--env", "--environment", dest="environment", choices=["dev", "staging", "prod"],
+                        default="dev", help="Environment to load (default: dev)")
+    parser.add_argument("--max-error-rate", type=float, default=Config.LOAD_MAX_ERROR_RATE,
+                        help=f"Fail when more iterations than this fail (default: {Config.LOAD_MAX_ERROR_RATE})")
+    args = parser.parse_args(argv)
+    
+    Config.ENVIRONMENT = args.environment
+    Config.BASE_URL = Config.BASE_URLS[args.environment]
+    from utils.browser_load import BrowserLoadRunner
+    from utils.load_scenarios import SCENARIOS
+    
+    if args.scenario not in SCENARIOS:
+        print(f"❌ Unknown scenario '{args.scenario}', choose from: {', '.join(sorted(SCENARIOS))}")
+        return 2
+    
+    print(f"🏋️ Load: {args.scenario} with {args.users} users for {args.duration} against {Config.BASE_URL}")
+    runner = BrowserLoadRunner(
+        SCENARIOS[args.scenario], args.scenario, args.users, parse_duration(args.duration),
+        ramp_up=parse_duration(args.ramp_up), pacing=parse_duration(args.pacing), browser=args.browser
+    )
+    results = runner.run()
+    
+    print("=" * 60)
+    print(results.format_table())
+    report = results.save(extra={"mode": "browser", "users": args.users, "base_url": Config.BASE_URL})
+    print(f"📊 Load report: {report}")
+    iteration = results.summary()["steps"].get("iteration")
+    return 1 if iteration is None or iteration["error_rate"] > args.max_error_rate else 0
+
+def http_load_command(argv):
+    """Replay the HTTP requests behind a page flow with asyncio virtual users"""
+    from utils.load_results import parse_duration
+    from utils.http_load import HTTP_SCENARIOS, HttpLoadRunner
+    from utils.stand_in_server import StandInServer
+    
+    parser = argparse.ArgumentParser(
+        prog="run_tests.py http-load",
+        description="Browserless load: closed loop with --users, or open loop with --rate arrivals per second"
+    )
+    parser.add_argument("--scenario", choices=sorted(HTTP_SCENARIOS), default="login",
+                        help="Flow to replay (default: login)")
+    parser.add_argument("--users", type=int, default=100, help="Closed loop virtual users (default: 100)")
+    parser.add_argument("--rate", type=float, help="Open loop: new flows per second instead of fixed users")
+    parser.add_argument("--duration", default="1m", help="Run time, e.g. 30s, 5m (default: 1m)")
+    parser.add_argument("--ramp-up", default="0s", help="Time to reach full users/rate (default: 0s)")
+    parser.add_argument("--pacing", default="0s",
+                        help="Closed loop: minimum time between iteration starts per user (default: 0s)")
+    parser.add_argument("--max-in-flight", type=int, default=10000,
+                        help="Open loop: flows in progress before new arrivals are dropped (default: 10000)")
+    parser.add_argument("--connections", type=int, default=0,
+                        help="Maximum open connections, 0 for no limit (default: 0)")
+    parser.add_argument("--env", "--environment", dest="environment", choices=["dev", "staging", "prod"],
+                        default="dev", help="Environment to load (default: dev)")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="Target a local stand-in server instead of the environment")
+    parser.add_argument("--max-error-rate", type=float, default=Config.LOAD_MAX_ERROR_RATE,
+                        help=f"Fail when more iterations than this fail (default: {Config.LOAD_MAX_ERROR_RATE})")
+    args = parser.parse_args(argv)
+    
+    stand_in = StandInServer().start() if args.stand_in else None
+    base_url = stand_in.base_url if stand_in else Config.BASE_URLS[args.environment]
+    model = f"{args.rate:g}/s open loop" if args.rate else f"{args.users} users"
+    print(f"🏋️ HTTP load: {args.scenario}, {model} for {args.duration} against {base_url}")
+    
+    try:
+        results = HttpLoadRunner(
+            HTTP_SCENARIOS[args.scenario], f"http_{args.scenario}", base_url,
+            users=args.users, duration=parse_duration(args.duration), ramp_up=parse_duration(args.ramp_up),
+            pacing=parse_duration(args.pacing), arrival_rate=args.rate, max_in_flight=args.max_in_flight,
+            connection_limit=args.connections
+        ).run()
+    finally:
+        if stand_in:
+            stand_in.stop()
+    
+    print("=" * 60)
+    print(results.format_table())
+    report = results.save(extra={"mode": "http", "model": model, "base_url": base_url})
+    print(f"📊 Load report: {report}")
+    iteration = results.summary()["steps"].get("iteration")
+    return 1 if iteration is None or iteration["error_rate"] > args.max_error_rate else 0
+
+def daemon_command(argv):
+    """Start, stop or query the persistent runner daemon"""
+    from utils.runner_daemon import DaemonClient, start_daemon
+    
+    parser = argparse.ArgumentParser(
+        prog="run_tests.py daemon",
+        description="Manage the runner daemon that keeps the interpreter and browsers warm"
+    )
+    parser.add_argument("action", choices=["start", "stop", "status"])
+    args = parser.parse_args(argv)
+    
+    client = DaemonClient()
+    if args.action == "start":
+        if client.is_running():
+            print(f"🔥 Runner daemon already running: {client.status()}")
+        else:
+            print(f"🔥 Runner daemon started (pid {start_daemon()})")
+    elif args.action == "stop":
+        if client.is_running():
+            print(f"🛑 Runner daemon stopped (pid {client.stop()})")
+        else:
+            print("Runner daemon is not running")
+    else:
+        if client.is_running():
+            print(f"🔥 Runner daemon running: {client.status()}")
+        else:
+            print("Runner daemon is not running")
+            return 1
+    return 0
+
+def run_in_daemon(pytest_args):
+    """Send the test selection to the runner daemon, starting it if needed"""
+    from utils.runner_daemon import DaemonClient, start_daemon
+    
+    client = DaemonClient()
+    if not client.is_running():
+        print(f"🔥 Starting runner daemon (pid {start_daemon()})")
+    return client.run(pytest_args)
+
+def watch_loop(args, extra_args=()):
+    """Rerun the tests affected by each change in the warm runner daemon"""
+    from utils.runner_daemon import DaemonClient, start_daemon
+    from utils.watch import FileWatcher, AffectedTestFinder
+    
+    # The watched files pick the tests; keep each run lean
+    args.test_path = None
+    args.html_report = False
+    base_args = get_pytest_args(args) + list(extra_args)
+    
+    client = DaemonClient()
+    if not client.is_running():
+        print(f"🔥 Starting runner daemon (pid {start_daemon()})")
+    
+    watcher = FileWatcher(WATCHED_DIRS)
+    finder = AffectedTestFinder()
+    mode = "inotify" if watcher.uses_inotify else "polling"
+    print(f"👀 Watching {', '.join(WATCHED_DIRS)} ({mode}), Ctrl+C to stop")
+    
+    try:
+        while True:
+            changed = watcher.wait_for_changes()
+            targets = finder.find(changed)
+            print("=" * 60)
+            print(f"✏️ Changed: {', '.join(sorted(changed))}")
+            if not targets:
+                print("No affected tests")
+                continue
+            print(f"🧪 Running: {' '.join(targets)}")
+            exit_code = client.run(base_args + targets)
+            print("✅ Passed" if exit_code == 0 else f"❌ Failed with exit code: {exit_code}")
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+    return 0
+
+WATCHED_DIRS = ["pages", "tests", "utils", "test_data"]
+
+COMMANDS = {
+    "merge": merge_command,
+    "report": report_command,
+    "perf-report": perf_report_command,
+    "load": load_command,
+    "http-load": http_load_command,
+    "daemon": daemon_command,
+}
+
 def main():
     """Main function"""
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        return COMMANDS[sys.argv[1]](sys.argv[2:])
+    
     parser = argparse.ArgumentParser(
         description="Test Automation Framework - Advanced Test Runner",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -92,8 +456,83 @@ Examples:
   # Run tests matching keyword in headless mode
   python run_tests.py -k "login" --headless
   
-  # Run regression tests with reruns for flaky tests
+  # Run the framework's own unit tests (no browser)
+  python run_tests.py --unit
+  
+  # Run regression tests with reruns for historically flaky tests
   python run_tests.py -m regression --reruns 2
+  
+  # Run the quarantined flaky tests separately
+  python run_tests.py --lane quarantine --reruns 2
+  
+  # Group tests by page and reuse untouched page loads
+  python run_tests.py --functional --reuse-pages
+  
+  # Record the impact index, then run only tests affected by a branch
+  python run_tests.py --regression --record-impact
+  python run_tests.py --regression --changed-since origin/main
+  
+  # Run shard 2 of 4 on this agent, then merge the shards' report directories
+  python run_tests.py --regression --shard 2/4
+  python run_tests.py merge shard-1/reports shard-2/reports shard-3/reports shard-4/reports
+  
+  # Iterate on one test through the warm runner daemon
+  python run_tests.py daemon start
+  python run_tests.py tests/test_homepage.py -k title --daemon --no-html-report
+  python run_tests.py daemon stop
+  
+  # Rerun the tests affected by every saved change
+  python run_tests.py --watch
+  
+  # Stream results as JSONL and follow progress in a browser
+  python run_tests.py --parallel --stream-results --progress-port 8765
+  
+  # Keep large failing runs light: paginated report, screenshots linked not inlined
+  python run_tests.py --regression --lean-report
+  python run_tests.py report --export "tests/test_homepage.py::TestHomePage::test_page_title"
+  
+  # Save pytest-benchmark baselines of the sampled flows, then compare against the latest one
+  python run_tests.py --performance --benchmark-autosave
+  python run_tests.py --performance --benchmark-compare --benchmark-compare-fail=median:20%
+  
+  # Track Web Vitals per page object across runs, then look for regressions
+  python run_tests.py --regression --web-vitals
+  python run_tests.py perf-report
+  
+  # Fail tests whose page visits exceed config/performance_budgets.json
+  python run_tests.py --regression --perf-budgets strict
+  
+  # Accept intended UI changes as the new visual baselines
+  python run_tests.py --ui --update-visual-baselines
+  
+  # Explain a slow performance test with a Chrome trace (open it in ui.perfetto.dev)
+  python run_tests.py --performance --chrome-trace
+  
+  # Find which asset made a page slower than usual
+  python run_tests.py --smoke --waterfall
+  
+  # See where the slowest tests spend their time (flamegraph: reports/profile/slowest.folded)
+  python run_tests.py --smoke --profile-time
+  
+  # Find tests that leave state behind in the shared browser
+  python run_tests.py --regression --resource-probe
+  
+  # Run the performance budgets as a slow mobile client
+  python run_tests.py --performance --throttle slow-4G
+  
+  # Check the performance tests' history for significant slowdowns
+  python run_tests.py perf-report --env staging --recent 3 --baseline 20
+  
+  # Reuse the page objects as a load scenario: 50 browsers, 1 minute ramp-up
+  python run_tests.py load --scenario login --users 50 --duration 5m --ramp-up 1m --pacing 10s
+  
+  # Replay the login requests without browsers: 2000 users, or 500 new logins per second
+  python run_tests.py http-load --scenario login --users 2000 --duration 5m --ramp-up 1m
+  python run_tests.py http-load --scenario download --rate 500 --duration 2m
+  python run_tests.py http-load --scenario upload --users 50 --duration 10s --stand-in
+  
+  # Show where test collection spends its import time
+  python run_tests.py --profile-imports --no-html-report
         """
     )
     
@@ -193,7 +632,20 @@ Examples:
         "--reruns",
         type=int,
         default=0,
-        help="Number of times to rerun failed tests (default: 0)"
+        help="Number of times to rerun failures of historically flaky tests (default: 0)"
+    )
+    
+    parser.add_argument(
+        "--rerun-all",
+        action="store_true",
+        help="Apply --reruns to every failing test, not only flaky ones"
+    )
+    
+    parser.add_argument(
+        "--lane",
+        choices=["main", "quarantine", "all"],
+        default="main",
+        help="Run the main lane, only quarantined flaky tests, or all tests (default: main)"
     )
     
     parser.add_argument(
@@ -210,6 +662,131 @@ Examples:
         help="Stop after N failures (default: 0 = no limit)"
     )
     
+    parser.add_argument(
+        "--flight-recorder",
+        action="store_true",
+        help="Dump the last seconds of screencast, console and network activity on failure (Chrome)"
+    )
+    
+    parser.add_argument(
+        "--throttle",
+        metavar="PROFILE",
+        help=f"Emulate a slow client for every test (Chrome): {', '.join(Config.THROTTLE_PROFILES)}; combine with '+'"
+    )
+    
+    parser.add_argument(
+        "--web-vitals",
+        action="store_true",
+        help="Collect LCP, CLS, TBT and INP per page object and store them in the performance history (Chrome)"
+    )
+    
+    parser.add_argument(
+        "--waterfall",
+        action="store_true",
+        help="Capture resource waterfalls per page visit; report slow, large, blocking and third-party assets"
+    )
+    
+    parser.add_argument(
+        "--perf-budgets",
+        choices=["off", "report", "strict"],
+        help="Check page visits against config/performance_budgets.json (default: report)"
+    )
+    
+    parser.add_argument(
+        "--chrome-trace",
+        action="store_true",
+        help="Record and summarize a Chrome trace of each performance test (reports/traces)"
+    )
+    
+    parser.add_argument(
+        "--trace-categories",
+        help="Comma-separated trace categories for --chrome-trace"
+    )
+    
+    parser.add_argument(
+        "--update-visual-baselines",
+        action="store_true",
+        help="Accept the current screenshots as the new visual baselines"
+    )
+    
+    parser.add_argument(
+        "--profile-time",
+        action="store_true",
+        help="Break each test's time down into setup, navigation, waits, WebDriver, sleep and Python; export folded stacks"
+    )
+    
+    parser.add_argument(
+        "--resource-probe",
+        action="store_true",
+        help="Track browser memory, DOM nodes and listeners per test; restart the browser when it grows too large"
+    )
+    
+    parser.add_argument(
+        "--lean-report",
+        action="store_true",
+        help="Write a small paginated report with external screenshots to reports/lean instead of the self-contained HTML"
+    )
+    
+    parser.add_argument(
+        "--stream-results",
+        action="store_true",
+        help="Stream a JSONL record per test phase to reports/results/ while tests run"
+    )
+    
+    parser.add_argument(
+        "--progress-port",
+        type=int,
+        default=0,
+        metavar="PORT",
+        help="Serve live progress on http://127.0.0.1:PORT/ (default: off)"
+    )
+    
+    # Page reuse
+    parser.add_argument(
+        "--reuse-pages",
+        action="store_true",
+        help="Group tests by target page and skip reloading untouched pages"
+    )
+    
+    # Test impact analysis
+    parser.add_argument(
+        "--record-impact",
+        action="store_true",
+        help="Record which page objects and locators each test touches"
+    )
+    
+    parser.add_argument(
+        "--changed-since",
+        metavar="REF",
+        help="Only run tests affected by changes since the given git revision"
+    )
+    
+    # Sharding
+    parser.add_argument(
+        "--shard",
+        metavar="I/N",
+        help="Run only shard I of N, balanced by the shared test durations file (config/test_durations.json)"
+    )
+    
+    # Runner daemon
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run in the persistent runner daemon (warm interpreter and browser)"
+    )
+    
+    parser.add_argument(
+        "--profile-imports",
+        action="store_true",
+        help="Collect the selected tests under -X importtime and summarize import cost"
+    )
+    
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch pages/, tests/, utils/ and test_data/ and rerun affected tests in a warm browser"
+    )
+    
     # Predefined test suites
     parser.add_argument(
         "--smoke",
@@ -259,8 +836,16 @@ Examples:
         help="Run authentication tests"
     )
     
-    # Parse arguments
-    args = parser.parse_args()
+    parser.add_argument(
+        "--unit",
+        action="store_const",
+        const="unit",
+        dest="markers",
+        help="Run the framework's unit tests (no browser)"
+    )
+    
+    # Parse arguments; options the runner doesn't know (e.g. --benchmark-autosave) go to pytest
+    args, pytest_extra_args = parser.parse_known_args()
     
     # Setup environment
     print(f"🚀 Test Automation Framework")
@@ -282,11 +867,29 @@ Examples:
     if args.test_path:
         print(f"📁 Test Path: {args.test_path}")
     
+    if args.reuse_pages:
+        print(f"♻️ Page Reuse: enabled")
+    
+    if args.changed_since:
+        print(f"🎯 Impacted Tests Since: {args.changed_since}")
+    
+    if args.shard:
+        print(f"🧩 Shard: {args.shard}")
+    
+    if args.lane != "main":
+        print(f"🚧 Lane: {args.lane}")
+    
+    if args.throttle:
+        print(f"🐢 Throttle: {args.throttle}")
+    
     print("=" * 60)
     
     # Setup directories
     setup_directories()
     
+    if args.watch:
+        return watch_loop(args, pytest_extra_args)
+    
     # Add project root to Python path
     sys.path.insert(0, '.')
     
@@ -294,17 +897,24 @@ Examples:
     pytest_args = get_pytest_args(args)
     
     # Add any additional arguments passed to the script
-    pytest_args.extend([arg for arg in sys.argv[1:] if arg.startswith('-') and arg not in [
-        '--browser', '--headless', '--no-headless', '--env', '--environment',
-        '--parallel', '--workers', '--html-report', '--no-html-report',
-        '--smoke', '--regression', '--functional', '--ui', '--performance', '--auth'
-    ]])
+    pytest_args.extend(pytest_extra_args)
     
     print(f"🏃 Running pytest with args: {' '.join(pytest_args)}")
     print("=" * 60)
     
+    if args.profile_imports:
+        from utils.import_profile import ImportTimeProfiler
+        profiler = ImportTimeProfiler(pytest_args)
+        profile = profiler.run()
+        print(profiler.summarize(profile))
+        return profile["exit_code"]
+    
     # Run pytest
-    exit_code = pytest.main(pytest_args)
+    if args.daemon:
+        exit_code = run_in_daemon(pytest_args)
+    else:
+        import pytest
+        exit_code = pytest.main(pytest_args)
     
     print("=" * 60)
     if exit_code == 0:
@@ -312,7 +922,11 @@ Examples:
     else:
         print(f"❌ Tests failed with exit code: {exit_code}")
     
-    if args.html_report:
+    if args.lean_report:
+        from utils.lean_report import LeanReportBuilder
+        LeanReportBuilder().build()
+        print(f"📊 Lean Report: {os.path.join(Config.LEAN_REPORT_DIR, 'index.html')}")
+    elif args.html_report:
         print(f"📊 HTML Report: {Config.HTML_REPORT_FILE}")
     
     print(f"📸 Screenshots: {Config.SCREENSHOT_DIR}")
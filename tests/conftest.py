@@ -1,10 +1,22 @@
 import pytest
 import os
+import json
 from datetime import datetime
 from utils.driver_factory import DriverFactory
+from utils.driver_pool import DriverPool
 from utils.helpers import ScreenshotHelper, FileHelper
+from utils.screenshots import ScreenshotPipeline
+from utils.page_state import PageLocalityGrouper, PageStateTracker
+from utils.page_metrics import PageMetricsRecorder
+from utils.perf_budgets import CommandCounter
+from utils.web_vitals import WebVitalsRecorder
+from utils.resource_waterfall import WaterfallRecorder
 from config.settings import Config
 
+# Page objects load the recorders above anyway. Every other plugin module is
+# imported where its option is checked, so switched-off features cost nothing
+# at startup (sqlite3, http.server, ...).
+
 def pytest_addoption(parser):
     """Add command line options"""
     parser.addoption("--browser", action="store", default="chrome", 
@@ -13,6 +25,44 @@ def pytest_addoption(parser):
                      help="Run tests in headless mode (true/false)")
     parser.addoption("--env", action="store", default="dev", 
                      help="Environment to run tests against (dev/staging/prod)")
+    parser.addoption("--reuse-pages", action="store_true", default=False,
+                     help="Group tests by target page and skip reloading untouched pages")
+    parser.addoption("--impact-record", action="store_true", default=False,
+                     help="Record page objects and locators each test touches into the impact index")
+    parser.addoption("--impact-since", action="store", default=None,
+                     help="Only run tests affected by changes since the given git revision")
+    parser.addoption("--shard", action="store", default=None,
+                     help="Run only shard i of N balanced by the shared durations file (e.g. 2/4)")
+    parser.addoption("--flight-recorder", action="store_true", default=False,
+                     help="Keep a rolling screencast/console/network buffer and dump it on failure (Chrome)")
+    parser.addoption("--flaky-reruns", action="store", type=int, default=0,
+                     help="Rerun failures of tests with a flaky history up to N times")
+    parser.addoption("--lane", action="store", default="main", choices=["main", "quarantine", "all"],
+                     help="Run the main lane, only quarantined flaky tests, or all tests")
+    parser.addoption("--throttle", action="store", default=Config.THROTTLE,
+                     help="Network/CPU emulation profile for every test, e.g. slow-4G or 3G+4x-cpu (Chrome)")
+    parser.addoption("--resource-probe", action="store_true", default=False,
+                     help="Record browser memory/DOM/listener growth per test and recycle bloated browsers")
+    parser.addoption("--web-vitals", action="store_true", default=False,
+                     help="Collect LCP, CLS, TBT and INP for every page object visit (Chrome)")
+    parser.addoption("--waterfall", action="store_true", default=False,
+                     help="Capture the resource waterfall of every page visit and point at slow assets")
+    parser.addoption("--perf-budgets", action="store", default=Config.PERF_BUDGETS, choices=["off", "report", "strict"],
+                     help="Check every page visit against config/performance_budgets.json: report or fail on violations")
+    parser.addoption("--chrome-trace", action="store_true", default=False,
+                     help="Record a Chrome trace of every performance test and summarize its main thread (Chrome)")
+    parser.addoption("--trace-categories", action="store", default=None,
+                     help="Comma-separated trace categories for --chrome-trace")
+    parser.addoption("--update-visual-baselines", action="store_true", default=False,
+                     help="Overwrite visual baselines with the current screenshots instead of comparing")
+    parser.addoption("--profile-time", action="store_true", default=False,
+                     help="Break each test's wall time down into setup, navigation, waits, WebDriver, sleep and Python")
+    parser.addoption("--no-html-report", action="store_true", default=False,
+                     help="Skip the self-contained HTML report that pytest.ini turns on")
+    parser.addoption("--stream-results", action="store_true", default=False,
+                     help="Append a JSONL record per test phase to reports/results/<worker>.jsonl")
+    parser.addoption("--progress-port", action="store", type=int, default=Config.PROGRESS_PORT,
+                     help="Serve live progress on http://127.0.0.1:PORT/ (0 = off)")
 
 @pytest.fixture(scope="session")
 def driver(request):
@@ -24,15 +74,178 @@ def driver(request):
     os.makedirs(Config.REPORT_DIR, exist_ok=True)
     os.makedirs(Config.SCREENSHOT_DIR, exist_ok=True)
     
-    driver_instance = DriverFactory.get_driver(browser, headless)
+    # Reuses a warm browser when running inside the runner daemon
+    driver_instance = DriverPool.acquire(browser, headless, DriverFactory.get_driver)
+    
+    # A pooled browser may still emulate the profile of an earlier run
+    if Config.THROTTLE or DriverPool.keep_alive:
+        DriverFactory.apply_throttling(driver_instance, Config.THROTTLE)
+    
+    if Config.FLIGHT_RECORDER:
+        from utils.flight_recorder import FlightRecorder
+        recorder = FlightRecorder(driver_instance)
+        if recorder.start():
+            request.config._flight_recorder = recorder
+    
     yield driver_instance
-    driver_instance.quit()
+    
+    # The recorder is replaced when the browser is recycled
+    recorder = getattr(request.config, "_flight_recorder", None)
+    if recorder is not None:
+        recorder.stop()
+    DriverPool.release(driver_instance, browser, headless)
 
 @pytest.fixture(scope="function")
 def page(driver):
     """Page fixture for individual tests"""
     return driver
 
+@pytest.fixture(autouse=True)
+def resource_probe(request, driver):
+    """Record what each test leaves behind in the browser and recycle it when it grows too large"""
+    if not Config.RESOURCE_PROBE:
+        yield None
+        return
+    from utils.flight_recorder import FlightRecorder
+    from utils.resource_probe import ResourceProbe, find_leaks, find_overuse
+    
+    config = request.config
+    reason = getattr(config, "_resource_recycle", None)
+    if reason:
+        # Recycle before the next test so failure screenshots and recordings still see the old browser
+        config._resource_recycle = None
+        DriverPool.recycle(driver, DriverFactory.restart_browser)
+        config._resource_probe = None
+        recorder = getattr(config, "_flight_recorder", None)
+        if recorder is not None:
+            recorder.stop()
+            recorder = FlightRecorder(driver)
+            config._flight_recorder = recorder if recorder.start() else None
+    
+    probe = getattr(config, "_resource_probe", None)
+    if probe is None:
+        probe = config._resource_probe = ResourceProbe(driver)
+    before = probe.sample()
+    yield probe
+    after = probe.sample()
+    
+    delta = ResourceProbe.delta(before, after)
+    request.node.user_properties.append(("resources", {
+        "before": before, "after": after, "delta": delta,
+        "leaks": find_leaks(delta, Config.RESOURCE_LEAK_THRESHOLDS)
+    }))
+    overuse = find_overuse(after, Config.RESOURCE_RECYCLE_LIMITS)
+    if overuse:
+        config._resource_recycle = ", ".join(f"{key}={after[key]:.0f}" for key in overuse)
+        request.node.user_properties.append(("browser_recycled", config._resource_recycle))
+
+@pytest.fixture(autouse=True)
+def throttling(request, driver):
+    """Apply the test's @pytest.mark.throttle profile, then restore the session profile"""
+    marker = request.node.get_closest_marker("throttle")
+    profile = marker.args[0] if marker else Config.THROTTLE
+    if marker:
+        DriverFactory.apply_throttling(driver, profile)
+    if profile:
+        request.node.user_properties.append(("throttle", profile))
+    yield profile
+    if marker:
+        DriverFactory.apply_throttling(driver, Config.THROTTLE)
+
+@pytest.fixture
+def perf_timer(request):
+    """Named timings stored in the performance history"""
+    from utils.perf_history import PerfTimer
+    return PerfTimer(request.node)
+
+@pytest.fixture
+def perf_sample(request, perf_timer):
+    """Time a flow one cold and K warm times: perf_sample(flow, name=..., setup=...)"""
+    from utils.perf_sampling import PerfSampler
+    
+    marker = request.node.get_closest_marker("perf_sample")
+    iterations = marker.kwargs.get("iterations") if marker else None
+    benchmark = None
+    if request.config.pluginmanager.hasplugin("benchmark"):
+        benchmark = request.getfixturevalue("benchmark")
+    return PerfSampler(iterations, benchmark, perf_timer, request.node).sample
+
+@pytest.fixture
+def page_metrics(request, driver):
+    """Browser timings of every page loaded through go_to_url during the test"""
+    # The performance budgets may already be recording this test's visits
+    started = PageMetricsRecorder.get(driver) is None
+    metrics = PageMetricsRecorder.start(driver) if started else PageMetricsRecorder.get(driver)
+    yield metrics
+    if Config.WEB_VITALS:
+        WebVitalsRecorder.flush(driver)
+    if started:
+        PageMetricsRecorder.stop(driver)
+    if metrics.visits:
+        request.node.user_properties.append(("page_metrics", metrics.visits))
+
+@pytest.fixture(autouse=True)
+def performance_budgets(request, driver):
+    """Check every page visit of the test against the budgets file"""
+    budgets = getattr(request.config, "_perf_budgets", None)
+    if budgets is None:
+        yield
+        return
+    started = PageMetricsRecorder.get(driver) is None
+    metrics = PageMetricsRecorder.start(driver) if started else PageMetricsRecorder.get(driver)
+    yield
+    if Config.WEB_VITALS:
+        WebVitalsRecorder.flush(driver)
+    if started:
+        PageMetricsRecorder.stop(driver)
+    
+    violations = budgets.check(metrics.visits)
+    request.node.user_properties.append(("performance_budgets", {"checked": len(metrics.visits), "violations": violations}))
+    if violations and Config.PERF_BUDGETS == "strict":
+        pytest.fail("Performance budget exceeded:\n" + "\n".join(violations))
+
+@pytest.fixture(autouse=True)
+def chrome_trace(request, driver):
+    """Trace performance tests in Chrome and attach the trace and its summary"""
+    if not Config.CHROME_TRACE or request.node.get_closest_marker("performance") is None:
+        yield
+        return
+    from utils.chrome_trace import ChromeTracer, build_trace_path, summarize_trace
+    
+    tracer = ChromeTracer(driver, build_trace_path(request.node.nodeid))
+    if not tracer.start():
+        yield
+        return
+    # Tracing slows the browser down: the timings of this run go to their own history series
+    request.node.user_properties.append(("chrome_trace", True))
+    yield
+    path = tracer.stop()
+    if path:
+        request.node.user_properties.append(("artifact", path))
+        try:
+            request.node.user_properties.append(("trace_summary", summarize_trace(path)))
+        except Exception as e:
+            print(f"Failed to summarize Chrome trace: {str(e)}")
+
+@pytest.fixture(autouse=True)
+def web_vitals(request, driver):
+    """Report the Web Vitals of the page objects the test used, per page object"""
+    yield
+    if not Config.WEB_VITALS:
+        return
+    WebVitalsRecorder.flush(driver)
+    for entry in WebVitalsRecorder.take(driver):
+        request.node.user_properties.append(("page_vitals", entry))
+
+@pytest.fixture(autouse=True)
+def resource_waterfall(request, driver):
+    """Report the resource waterfalls captured on each go_to_url"""
+    yield
+    if not Config.WATERFALL:
+        return
+    for visit in WaterfallRecorder.take(driver):
+        request.node.user_properties.append(("waterfall", visit))
+
 @pytest.fixture(autouse=True)
 def capture_screenshot_on_failure(request, driver):
     """Automatically capture screenshot on test failure"""
@@ -41,7 +254,36 @@ def capture_screenshot_on_failure(request, driver):
         test_name = request.node.name
         class_name = request.node.parent.name if hasattr(request.node, 'parent') else "unknown"
         filename = f"{class_name}_{test_name}_failed"
-        ScreenshotHelper.take_screenshot(driver, filename)
+        # Capture now, compress and write on the screenshot writer thread
+        path = ScreenshotHelper.take_screenshot_async(driver, filename, test_name=f"{class_name}_{test_name}")
+        if path:
+            request.node.user_properties.append(("artifact", path))
+        
+        recorder = getattr(request.config, "_flight_recorder", None)
+        if recorder is not None:
+            replay_dir = recorder.dump(f"{class_name}_{test_name}")
+            request.node.user_properties.append(("artifact", os.path.join(replay_dir, "replay.html")))
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """Trace page object usage while the test body runs, then close the last page visit and note reused pages"""
+    tracer = getattr(item.config, "_impact_tracer", None)
+    if tracer is not None:
+        tracer.start()
+    try:
+        yield
+    finally:
+        if tracer is not None:
+            from utils.impact import test_symbol
+            symbols = tracer.stop()
+            item.config._impact_results[item.nodeid] = [test_symbol(item.nodeid)] + symbols
+        # The last visit ends with the test body, not with the fixture teardowns after it
+        driver = item.funcargs.get("driver")
+        if driver is not None:
+            CommandCounter.finish_visit(driver)
+            reused = PageStateTracker.take_reused(driver)
+            if reused:
+                item.user_properties.append(("reused_pages", reused))
 
 @pytest.hookimpl(tryfirst=True, hookwrapper=True)
 def pytest_runtest_makereport(item, call):
@@ -49,6 +291,21 @@ def pytest_runtest_makereport(item, call):
     outcome = yield
     rep = outcome.get_result()
     setattr(item, "rep_" + rep.when, rep)
+    
+    # Attach collected page metrics and resource usage to the HTML report
+    if rep.when == "teardown" and item.config.pluginmanager.hasplugin("html"):
+        attachments = {"page_metrics": "Page metrics", "resources": "Browser resources", "trace_summary": "Trace summary"}
+        extras = [(attachments[key], value) for key, value in item.user_properties if key in attachments]
+        traces = [value for key, value in item.user_properties if key == "artifact" and value.endswith(".json.gz")]
+        if extras or traces:
+            import pytest_html
+            rep.extras = getattr(rep, "extras", []) + [pytest_html.extras.json(value, name=name) for name, value in extras]
+            # Open in chrome://tracing or ui.perfetto.dev; linked relative to the report so it survives being archived
+            report_dir = os.path.dirname(os.path.abspath(item.config.getoption("htmlpath") or Config.HTML_REPORT_FILE))
+            rep.extras += [
+                pytest_html.extras.url(os.path.relpath(os.path.abspath(path), report_dir), name="Chrome trace")
+                for path in traces
+            ]
 
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_environment(request):
@@ -61,6 +318,9 @@ def setup_test_environment(request):
     
     yield
     
+    # Make sure background screenshot writes are on disk
+    ScreenshotPipeline.flush()
+    
     # Clean up after tests
     FileHelper.cleanup_downloads()
 
@@ -86,6 +346,7 @@ def pytest_html_results_summary(prefix, summary, postfix):
     prefix.extend([f"<p>Test Execution Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>"])
 
 # Custom markers for test categorization
+@pytest.hookimpl(tryfirst=True)
 def pytest_configure(config):
     """Configure custom markers"""
     config.addinivalue_line("markers", "smoke: mark test as smoke test")
@@ -93,6 +354,8 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "functional: mark test as functional test")
     config.addinivalue_line("markers", "ui: mark test as UI test")
     config.addinivalue_line("markers", "performance: mark test as performance test")
+    config.addinivalue_line("markers", "perf_sample(iterations): number of warm runs for the perf_sample fixture")
+    config.addinivalue_line("markers", "throttle(profile): emulate a slow network/CPU profile for the test, e.g. 'slow-4G'")
     config.addinivalue_line("markers", "cross_browser: mark test as cross-browser test")
     config.addinivalue_line("markers", "accessibility: mark test as accessibility test")
     config.addinivalue_line("markers", "negative: mark test as negative test")
@@ -102,3 +365,166 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "file_operations: mark test as file operations test")
     config.addinivalue_line("markers", "navigation: mark test as navigation test")
     config.addinivalue_line("markers", "advanced: mark test as advanced test")
+    config.addinivalue_line("markers", "unit: mark test as unit test of the framework (no browser)")
+    
+    # Before pytest-html reads it: without a path it does not build the report
+    if config.getoption("--no-html-report") and hasattr(config.option, "htmlpath"):
+        config.option.htmlpath = None
+    
+    if config.getoption("--reuse-pages"):
+        Config.REUSE_PAGES = True
+    
+    if config.getoption("--flight-recorder"):
+        Config.FLIGHT_RECORDER = True
+    
+    if config.getoption("--resource-probe"):
+        Config.RESOURCE_PROBE = True
+    
+    if config.getoption("--web-vitals"):
+        Config.WEB_VITALS = True
+    
+    if config.getoption("--waterfall"):
+        Config.WATERFALL = True
+    
+    if config.getoption("--update-visual-baselines"):
+        Config.VISUAL_UPDATE = True
+    
+    if config.getoption("--chrome-trace"):
+        Config.CHROME_TRACE = True
+    if config.getoption("--trace-categories"):
+        Config.TRACE_CATEGORIES = config.getoption("--trace-categories").split(",")
+    
+    if config.getoption("--throttle"):
+        DriverFactory.parse_throttle_profile(config.getoption("--throttle"))
+        Config.THROTTLE = config.getoption("--throttle")
+    
+    Config.PERF_BUDGETS = config.getoption("--perf-budgets")
+    if Config.PERF_BUDGETS != "off":
+        from utils.perf_budgets import PerformanceBudgets
+        budgets = PerformanceBudgets().load()
+        if budgets:
+            config._perf_budgets = budgets
+            if "webdriver_commands" in budgets.metrics():
+                CommandCounter.install()
+    
+    if config.getoption("--impact-record"):
+        from utils.impact import ImpactTracer
+        config._impact_tracer = ImpactTracer()
+        config._impact_results = {}
+    
+    if config.getoption("--shard"):
+        from utils.sharding import ShardPlanner
+        try:
+            config._shard = ShardPlanner.parse(config.getoption("--shard"))
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+    
+    is_controller = not hasattr(config, "workerinput")
+    if is_controller:
+        from utils.perf_history import PerfHistoryRecorder, PerfHistoryStore
+        from utils.perf_sampling import PerfSampleReport
+        from utils.sharding import DurationRecorder, DurationStore
+        report_file = Config.SHARD_DURATIONS_REPORT if config.getoption("--shard") else None
+        config.pluginmanager.register(DurationRecorder(DurationStore(), report_file), "duration_recorder")
+        config.pluginmanager.register(PerfHistoryRecorder(
+            PerfHistoryStore(), config.getoption("--env"), config.getoption("--browser")
+        ), "perf_history_recorder")
+        config.pluginmanager.register(PerfSampleReport(), "perf_sample_report")
+    
+    if config.getoption("--stream-results"):
+        from utils.result_stream import ResultStreamWriter, clear_results
+        if is_controller:
+            clear_results()
+        config.pluginmanager.register(ResultStreamWriter(), "result_stream_writer")
+    
+    if config.getoption("--profile-time"):
+        from utils.time_profile import WallTimeProfiler, WallTimeReport
+        config.pluginmanager.register(WallTimeProfiler(), "wall_time_profiler")
+        if is_controller:
+            config.pluginmanager.register(WallTimeReport(), "wall_time_report")
+    
+    if is_controller and Config.WEB_VITALS:
+        from utils.web_vitals import WebVitalsReport
+        config.pluginmanager.register(WebVitalsReport(), "web_vitals_report")
+    
+    if is_controller and getattr(config, "_perf_budgets", None):
+        from utils.perf_budgets import BudgetReport
+        from utils.web_vitals import VITALS
+        # Vitals budgets need --web-vitals; they are not checked, and the report says so, without it
+        unchecked = [] if Config.WEB_VITALS else sorted(set(VITALS) & config._perf_budgets.metrics())
+        config.pluginmanager.register(BudgetReport(unchecked), "budget_report")
+    
+    if is_controller and Config.WATERFALL:
+        from utils.resource_waterfall import WaterfallReport
+        config.pluginmanager.register(WaterfallReport(), "waterfall_report")
+    
+    if is_controller and Config.RESOURCE_PROBE:
+        from utils.resource_probe import ResourceReport
+        config.pluginmanager.register(ResourceReport(), "resource_report")
+    
+    if is_controller and config.getoption("--progress-port"):
+        from utils.result_stream import ProgressServer
+        config.pluginmanager.register(ProgressServer(config.getoption("--progress-port")), "progress_server")
+    
+    from utils.flakiness import FlakinessStore, FlakinessTracker
+    config.pluginmanager.register(FlakinessTracker(
+        FlakinessStore(),
+        reruns=config.getoption("--flaky-reruns"),
+        lane=config.getoption("--lane"),
+        record=is_controller
+    ), "flakiness_tracker")
+
+def pytest_unconfigure(config):
+    """Undo process-wide patches, so the runner daemon's next run starts from plain WebDriver"""
+    CommandCounter.uninstall()
+
+def pytest_collection_modifyitems(config, items):
+    """Select tests affected by recent changes and group tests by target page"""
+    since = config.getoption("--impact-since")
+    if since:
+        from utils.impact import ImpactIndex, ImpactSelector
+        index = ImpactIndex().load()
+        affected = ImpactSelector(index, since).select() if index.tests else None
+        if affected is not None:
+            # Tests missing from the index have never been traced, so they always run
+            selected = [item for item in items if item.nodeid in affected or item.nodeid not in index.tests]
+            deselected = [item for item in items if item not in selected]
+            if deselected:
+                config.hook.pytest_deselected(items=deselected)
+                items[:] = selected
+    
+    shard = getattr(config, "_shard", None)
+    if shard:
+        from utils.sharding import DurationStore, ShardPlanner
+        index, total = shard
+        # Plan from the shared file, not this agent's history, so every shard gets the same split
+        shards, _ = ShardPlanner(DurationStore(Config.SHARD_DURATIONS_FILE).load().durations).split(items, total)
+        selected = shards[index - 1]
+        deselected = [item for item in items if item not in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = selected
+    
+    if Config.REUSE_PAGES:
+        PageLocalityGrouper.group_items(items)
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write traced page object usage to the impact index"""
+    config = session.config
+    if not config.getoption("--impact-record"):
+        return
+    from utils.impact import ImpactIndex
+    
+    index = ImpactIndex()
+    workerinput = getattr(config, "workerinput", None)
+    if workerinput is not None:
+        # xdist worker: leave a fragment for the controller to merge
+        os.makedirs(os.path.dirname(index.path), exist_ok=True)
+        with open(index.fragment_path(workerinput["workerid"]), "w") as file:
+            json.dump(config._impact_results, file)
+        return
+    
+    index.load()
+    index.merge_fragments()
+    index.update(config._impact_results)
+    index.save()
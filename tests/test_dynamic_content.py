@@ -160,6 +160,14 @@ class TestDynamicContent:
         
         assert len(new_content_texts) == len(content_texts), "Content structure should be maintained"
         assert len(new_image_sources) == len(image_sources), "Image structure should be maintained"
+    
+    @pytest.mark.ui
+    def test_dynamic_content_visual(self, driver):
+        """Test the static parts of the page against their visual baselines"""
+        dynamic_page = DynamicContentPage(driver)
+        dynamic_page.navigate_to_dynamic_content()
+        
+        dynamic_page.assert_visual("dynamic_content")
 
 @pytest.mark.dynamic_content
 @pytest.mark.functional
@@ -264,20 +272,19 @@ class TestDynamicLoading:
         assert "Hello World!" in finish_text
     
     @pytest.mark.performance
-    def test_dynamic_loading_performance(self, driver):
+    @pytest.mark.perf_sample(iterations=5)
+    def test_dynamic_loading_performance(self, driver, perf_sample):
         """Test dynamic loading performance"""
-        import time
-        
         loading_page = DynamicLoadingExample1Page(driver)
-        loading_page.navigate_to_example_1()
         
-        start_time = time.time()
-        loading_page.click_start()
-        loading_page.wait_for_loading_to_complete(timeout=15)
-        end_time = time.time()
+        def load():
+            loading_page.click_start()
+            loading_page.wait_for_loading_to_complete(timeout=15)
         
-        loading_duration = end_time - start_time
-        assert loading_duration < 10.0, f"Loading took too long: {loading_duration} seconds"
+        # Each run starts from a freshly loaded page; only the loading itself is timed
+        result = perf_sample(load, name="dynamic_loading", setup=loading_page.navigate_to_example_1)
+        # The cold run keeps the original single-load limit
+        result.assert_percentiles(p50=8.0, p95=10.0, cold=10.0)
         
         finish_text = loading_page.get_finish_text()
         assert "Hello World!" in finish_text
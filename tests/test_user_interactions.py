@@ -65,6 +65,17 @@ class TestHovers:
         # Should navigate to user profile page
         current_url = hovers_page.get_current_url()
         assert "users/1" in current_url
+    
+    def test_user_images_screenshots(self, driver):
+        """Test capturing every user image from a single screenshot"""
+        hovers_page = HoversPage(driver)
+        hovers_page.navigate_to_hovers()
+        
+        paths = hovers_page.take_element_screenshots([hovers_page.USER_IMAGES], "user_image")
+        
+        assert len(paths) == 3, "Should capture all three user images"
+        for path in paths:
+            assert path is not None and os.path.exists(path), f"Element screenshot should be written: {path}"
 
 @pytest.mark.user_interactions
 @pytest.mark.functional
@@ -395,19 +406,16 @@ class TestInteractionWorkflows:
         key_page.test_space_key()
     
     @pytest.mark.performance
-    def test_interaction_performance(self, driver):
+    def test_interaction_performance(self, driver, perf_timer):
         """Test interaction performance"""
-        import time
-        
         # Test hover performance
         hovers_page = HoversPage(driver)
         hovers_page.navigate_to_hovers()
         
-        start_time = time.time()
-        hovers_page.hover_over_user_1()
-        hovers_page.hover_over_user_2()
-        hovers_page.hover_over_user_3()
-        end_time = time.time()
+        with perf_timer.measure("hover_users") as timing:
+            hovers_page.hover_over_user_1()
+            hovers_page.hover_over_user_2()
+            hovers_page.hover_over_user_3()
         
-        hover_duration = end_time - start_time
+        hover_duration = timing["seconds"]
         assert hover_duration < 2.0, f"Hover interactions took too long: {hover_duration} seconds"
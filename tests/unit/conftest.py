@@ -0,0 +1,49 @@
+import pytest
+
+# Unit tests cover the framework's own logic and never start a browser:
+# the driver-based autouse fixtures of tests/conftest.py are replaced here.
+
+@pytest.fixture
+def resource_probe():
+    yield None
+
+@pytest.fixture
+def throttling():
+    yield None
+
+@pytest.fixture
+def performance_budgets():
+    yield None
+
+@pytest.fixture
+def chrome_trace():
+    yield None
+
+@pytest.fixture
+def web_vitals():
+    yield None
+
+@pytest.fixture
+def resource_waterfall():
+    yield None
+
+@pytest.fixture
+def capture_screenshot_on_failure():
+    yield None
+
+class FakeItem:
+    """Stand-in for a collected pytest item: a node id and markers"""
+    
+    def __init__(self, nodeid, markers=()):
+        self.nodeid = nodeid
+        self.markers = [pytest.Mark(name, (), {}) for name in markers]
+    
+    def iter_markers(self):
+        return iter(self.markers)
+
+@pytest.fixture
+def make_items():
+    """Build fake items from node ids, optionally with marker names: make_items("a::t", ("b::t", ["smoke"]))"""
+    def make(*specs):
+        return [FakeItem(spec) if isinstance(spec, str) else FakeItem(*spec) for spec in specs]
+    return make
@@ -0,0 +1,55 @@
+import pytest
+from config.settings import Config
+from utils.flakiness import FlakinessStore, flake_score
+
+@pytest.mark.unit
+class TestFlakeScore:
+    """Test cases for flake scores"""
+    
+    def test_stable_tests_score_zero(self):
+        """Test that consistently passing or failing tests are not flaky"""
+        assert flake_score([]) == 0.0
+        assert flake_score(["passed"] * 10) == 0.0
+        assert flake_score(["failed"] * 10) == 0.0
+    
+    def test_single_break_scores_low(self):
+        """Test that a test that broke once and stayed broken scores low"""
+        assert flake_score(["passed"] * 5 + ["failed"] * 5) == pytest.approx(0.1)
+    
+    def test_flipping_tests_score_high(self):
+        """Test that a test flipping on every run scores close to 1"""
+        assert flake_score(["passed", "failed"] * 5) == pytest.approx(0.9)
+    
+    def test_passed_on_rerun_counts_as_flaky(self):
+        """Test that runs only passing on rerun count towards the score"""
+        assert flake_score(["passed", "flaky", "passed", "passed"]) == pytest.approx(0.25)
+        assert flake_score(["flaky"] * 4) == 1.0
+
+@pytest.mark.unit
+class TestFlakinessStore:
+    """Test cases for the outcome history"""
+    
+    def test_scores_need_minimum_history(self, tmp_path):
+        """Test that tests with too few runs get no score"""
+        store = FlakinessStore(str(tmp_path / "flakiness.db"))
+        for _ in range(Config.FLAKINESS_MIN_RUNS - 1):
+            store.record({"t.py::test_new": "failed"})
+        for outcome in ["passed", "failed"] * Config.FLAKINESS_MIN_RUNS:
+            store.record({"t.py::test_flaky": outcome})
+        
+        scores = store.get_scores()
+        store.close()
+        
+        assert "t.py::test_new" not in scores
+        assert scores["t.py::test_flaky"] >= Config.FLAKINESS_QUARANTINE_THRESHOLD
+    
+    def test_history_is_limited_to_window(self, tmp_path):
+        """Test that only the latest runs are kept in the history"""
+        store = FlakinessStore(str(tmp_path / "flakiness.db"))
+        for outcome in ["failed"] * 5 + ["passed"] * 3:
+            store.record({"t.py::test_a": outcome})
+        
+        history = store.get_history(window=3)
+        store.close()
+        
+        assert history == {"t.py::test_a": ["passed", "passed", "passed"]}
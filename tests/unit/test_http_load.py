@@ -0,0 +1,44 @@
+import pytest
+from utils.http_load import HTTP_SCENARIOS, HttpLoadRunner
+from utils.stand_in_server import StandInServer
+
+pytest.importorskip("aiohttp")
+
+@pytest.fixture(scope="module")
+def stand_in():
+    """Stand-in server shared by the load tests"""
+    with StandInServer() as server:
+        yield server
+
+@pytest.mark.unit
+class TestHttpLoad:
+    """Test cases for HTTP load against the stand-in server"""
+    
+    @pytest.mark.parametrize("scenario", sorted(HTTP_SCENARIOS))
+    def test_scenario_runs_without_errors(self, stand_in, scenario):
+        """Test that every flow completes against the stand-in"""
+        results = HttpLoadRunner(
+            HTTP_SCENARIOS[scenario], scenario, stand_in.base_url, users=2, duration=0.5, report_interval=60
+        ).run()
+        iteration = results.summary()["steps"]["iteration"]
+        
+        assert iteration["count"] > 0
+        assert iteration["errors"] == 0
+    
+    def test_keep_alive_responses_are_not_delayed(self, stand_in):
+        """Test that reused connections answer without the ~40ms delayed-ACK stall"""
+        results = HttpLoadRunner(
+            HTTP_SCENARIOS["login"], "login", stand_in.base_url, users=1, duration=0.5, report_interval=60
+        ).run()
+        
+        assert results.summary()["steps"]["GET /secure"]["p50"] < 0.02
+    
+    def test_open_loop_records_arrivals(self, stand_in):
+        """Test that the open loop starts flows at the arrival rate"""
+        results = HttpLoadRunner(
+            HTTP_SCENARIOS["download"], "download", stand_in.base_url, arrival_rate=50, duration=0.5, report_interval=60
+        ).run()
+        iteration = results.summary()["steps"]["iteration"]
+        
+        assert iteration["count"] > 5
+        assert iteration["errors"] == 0
@@ -0,0 +1,25 @@
+import pytest
+from utils.impact import ImpactIndex, ImpactSelector, is_affected_by
+from utils.impact import test_symbol as symbol_of  # not collected as a test
+
+@pytest.mark.unit
+class TestImpactSelector:
+    """Test cases for change-based test selection"""
+    
+    def test_symbols_of_node_ids(self):
+        """Test converting node ids into test symbols"""
+        assert symbol_of("tests/test_a.py::TestA::test_b[chrome]") == "tests/test_a.py::TestA.test_b"
+        assert symbol_of("tests/test_a.py") == "tests/test_a.py"
+    
+    def test_changed_symbol_containment(self):
+        """Test that members of a changed class or module are affected"""
+        assert is_affected_by("pages/a.py::APage.open", "pages/a.py::APage")
+        assert is_affected_by("pages/a.py::APage", "pages/a.py")
+        assert not is_affected_by("pages/a.py::APageTwo", "pages/a.py::APage")
+    
+    def test_invalid_revision_is_a_usage_error(self):
+        """Test that an unknown git revision is reported as a usage error"""
+        selector = ImpactSelector(ImpactIndex(), "no-such-revision-for-impact")
+        
+        with pytest.raises(pytest.UsageError, match="no-such-revision-for-impact"):
+            selector.get_changed_lines()
@@ -0,0 +1,118 @@
+import threading
+import pytest
+from selenium.webdriver.remote.webdriver import WebDriver
+from utils.page_metrics import PageMetricsRecorder
+from utils.perf_budgets import BudgetReport, CommandCounter
+
+class FakeDriver:
+    """Driver whose commands do nothing"""
+    
+    session_id = "command-counter-session"
+
+@pytest.fixture
+def counter(monkeypatch):
+    """CommandCounter installed over a no-op WebDriver.execute, with page metrics recording"""
+    monkeypatch.setattr(WebDriver, "execute", lambda driver, command, params=None: None)
+    # The session may already count commands for the budgets file
+    monkeypatch.setattr(CommandCounter, "_original", None)
+    CommandCounter.install()
+    driver = FakeDriver()
+    metrics = PageMetricsRecorder.start(driver)
+    yield driver, metrics
+    PageMetricsRecorder.stop(driver)
+    CommandCounter.finish_visit(driver)
+    CommandCounter.uninstall()
+
+def send(driver, count):
+    for _ in range(count):
+        WebDriver.execute(driver, "findElement")
+
+@pytest.mark.unit
+class TestCommandCounter:
+    """Test cases for per-visit WebDriver command counts"""
+    
+    def test_counts_commands_between_start_and_finish(self, counter):
+        """Test that only the commands of the open visit are charged to it"""
+        driver, metrics = counter
+        send(driver, 2)
+        metrics.add("LoginPage", {"url": "http://site/login", "metrics": {}})
+        CommandCounter.start_visit(driver)
+        send(driver, 3)
+        CommandCounter.finish_visit(driver)
+        send(driver, 4)
+        CommandCounter.finish_visit(driver)
+        
+        assert metrics.visits[0]["metrics"] == {"webdriver_commands": 3}
+    
+    def test_ignores_other_threads(self, counter):
+        """Test that background threads sending commands are not counted"""
+        driver, metrics = counter
+        metrics.add("LoginPage", {"url": "http://site/login", "metrics": {}})
+        CommandCounter.start_visit(driver)
+        send(driver, 1)
+        thread = threading.Thread(target=send, args=(driver, 5))
+        thread.start()
+        thread.join()
+        CommandCounter.finish_visit(driver)
+        
+        assert metrics.visits[0]["metrics"] == {"webdriver_commands": 1}
+    
+    def test_charges_the_visit_that_started(self, counter):
+        """Test that visits recorded later, e.g. from Web Vitals, do not take the count"""
+        driver, metrics = counter
+        metrics.add("LoginPage", {"url": "http://site/login", "metrics": {}})
+        CommandCounter.start_visit(driver)
+        send(driver, 2)
+        metrics.update("http://site/secure", {"lcp": 900})
+        CommandCounter.finish_visit(driver)
+        
+        assert metrics.visits[0]["metrics"] == {"webdriver_commands": 2}
+        assert metrics.visits[1]["metrics"] == {"lcp": 900}
+
+class FakeTerminal:
+    """Terminal reporter collecting the lines written"""
+    
+    def __init__(self):
+        self.lines = []
+    
+    def section(self, title):
+        self.lines.append(f"== {title}")
+    
+    def write_line(self, line):
+        self.lines.append(line)
+
+class FakeReport:
+    """Teardown report carrying user properties"""
+    
+    def __init__(self, user_properties):
+        self.when = "teardown"
+        self.nodeid = "tests/test_login.py::test_login"
+        self.user_properties = user_properties
+
+@pytest.mark.unit
+class TestBudgetReport:
+    """Test cases for the budget summary"""
+    
+    def test_reports_unchecked_vitals_budgets(self):
+        """Test that vitals budgets skipped without --web-vitals are named in the summary"""
+        report = BudgetReport(["lcp"])
+        report.checked = 3
+        terminal = FakeTerminal()
+        report.pytest_terminal_summary(terminal)
+        
+        assert terminal.lines[1:] == ["3 page visits checked, 0 budget violations", "Not checked without --web-vitals: lcp"]
+    
+    def test_reports_reused_page_visits(self):
+        """Test that visits served from a reused page are counted as not checked"""
+        report = BudgetReport()
+        report.pytest_runtest_logreport(FakeReport([
+            ("performance_budgets", {"checked": 1, "violations": []}),
+            ("reused_pages", ["LoginPage", "LoginPage"])
+        ]))
+        terminal = FakeTerminal()
+        report.pytest_terminal_summary(terminal)
+        
+        assert terminal.lines[1:] == [
+            "1 page visits checked, 0 budget violations",
+            "Not checked: 2 reused page visits (no page load to measure)"
+        ]
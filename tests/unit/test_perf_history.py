@@ -0,0 +1,70 @@
+import sqlite3
+import pytest
+from utils.perf_history import PerfHistoryRecorder, PerfHistoryStore, PerfRegressionDetector, mann_whitney_u
+
+class FakeReport:
+    """Stand-in for a pytest test report"""
+    
+    def __init__(self, when, outcome, duration=0.0, user_properties=(), keywords=("performance",)):
+        self.nodeid = "tests/test_perf.py::test_load"
+        self.when = when
+        self.outcome = outcome
+        self.skipped = outcome == "skipped"
+        self.duration = duration
+        self.user_properties = list(user_properties)
+        self.keywords = set(keywords)
+
+@pytest.mark.unit
+class TestPerfHistory:
+    """Test cases for the performance history"""
+    
+    def test_mann_whitney_detects_slower_runs(self):
+        """Test the one-sided test on clearly slower and identical samples"""
+        _, p_slower = mann_whitney_u([2.0, 2.1, 2.2], [1.0, 1.1, 0.9, 1.05, 0.95, 1.02])
+        _, p_same = mann_whitney_u([1.0, 1.0, 1.0], [1.0, 1.0, 1.0, 1.0, 1.0])
+        
+        assert p_slower < 0.05
+        assert p_same >= 0.5
+    
+    def test_failed_runs_are_recorded_with_outcome(self, tmp_path):
+        """Test that timings of failing tests reach the history with their outcome"""
+        store = PerfHistoryStore(str(tmp_path / "perf.db"))
+        recorder = PerfHistoryRecorder(store, "dev", "chrome")
+        recorder.pytest_runtest_logreport(FakeReport(
+            "call", "failed", 12.5, [("perf_measurement", ("login", 9.0))]
+        ))
+        recorder.pytest_runtest_logreport(FakeReport("teardown", "passed"))
+        recorder.pytest_runtest_logreport(FakeReport("call", "skipped", 0.1))
+        recorder.pytest_sessionfinish(None)
+        
+        rows = sqlite3.connect(str(tmp_path / "perf.db")).execute(
+            "SELECT name, value, outcome FROM measurements ORDER BY name"
+        ).fetchall()
+        assert rows == [("call", 12.5, "failed"), ("login", 9.0, "failed")]
+    
+    def test_throttled_and_traced_runs_form_their_own_series(self, tmp_path):
+        """Test that emulation and tracing suffix the measurement names, vitals included"""
+        store = PerfHistoryStore(str(tmp_path / "perf.db"))
+        recorder = PerfHistoryRecorder(store, "dev", "chrome")
+        properties = [("throttle", "slow-4G"), ("chrome_trace", True)]
+        recorder.pytest_runtest_logreport(FakeReport("call", "passed", 3.0, properties))
+        recorder.pytest_runtest_logreport(FakeReport("teardown", "passed", user_properties=properties + [
+            ("page_vitals", {"page": "LoginPage", "url": "http://site/login", "lcp": 1500, "cls": None})
+        ]))
+        recorder.pytest_sessionfinish(None)
+        
+        rows = sqlite3.connect(str(tmp_path / "perf.db")).execute(
+            "SELECT nodeid, name FROM measurements ORDER BY name"
+        ).fetchall()
+        assert rows == [("tests/test_perf.py::test_load", "call@slow-4G@trace"), ("page:LoginPage", "lcp@slow-4G@trace")]
+    
+    def test_regression_verdict(self, tmp_path):
+        """Test that a slower recent series is flagged against its baseline"""
+        store = PerfHistoryStore(str(tmp_path / "perf.db"))
+        for value in [1.0, 1.1, 0.9, 1.05, 0.95, 1.0, 1.02, 0.98, 1.03, 0.97, 2.0, 2.1, 2.2]:
+            store.record_run("dev", "chrome", [("t.py::test_a", "call", value, "passed")])
+        
+        results = PerfRegressionDetector(store, recent_runs=3, baseline_runs=10).analyze("dev", "chrome")
+        store.close()
+        
+        assert [result["verdict"] for result in results] == ["REGRESSION"]
@@ -0,0 +1,95 @@
+import pytest
+from utils.perf_sampling import PerfSampler, PerfSampleReport, SampleResult, bootstrap_interval, percentile, remove_outliers
+
+@pytest.mark.unit
+class TestPerfSampling:
+    """Test cases for sampled timings"""
+    
+    def test_percentile_interpolates(self):
+        """Test linear interpolation between ranks"""
+        assert percentile([], 0.5) is None
+        assert percentile([3.0, 1.0, 2.0], 0.5) == 2.0
+        assert percentile([1.0, 2.0, 3.0, 4.0], 0.75) == pytest.approx(3.25)
+    
+    def test_outliers_are_flagged(self):
+        """Test Tukey's fences on warm runs"""
+        kept, outliers = remove_outliers([1.0, 1.1, 1.05, 0.98, 9.0])
+        
+        assert outliers == [9.0]
+        assert kept == [1.0, 1.1, 1.05, 0.98]
+    
+    def test_slow_warm_run_counts_towards_p95(self):
+        """Test that an outlier stays in the tail instead of being dropped"""
+        result = SampleResult("flow", [3.0, 1.0, 1.1, 1.05, 0.98, 9.0])
+        
+        assert result.outliers == [9.0]
+        assert result.p95 > 7.0
+        with pytest.raises(AssertionError, match="p95"):
+            result.assert_percentiles(p95=2.0)
+    
+    def test_limits_compare_point_estimates(self):
+        """Test that a limit fails on the estimate even if the interval reaches below it"""
+        result = SampleResult("flow", [2.0, 1.0, 1.2, 1.4, 1.6, 1.8])
+        
+        assert result.p50_ci[0] < 1.3 < result.p50
+        with pytest.raises(AssertionError, match="p50"):
+            result.assert_percentiles(p50=1.3)
+        result.assert_percentiles(p50=1.5, p95=1.8)
+    
+    def test_cold_limit(self):
+        """Test that the cold run has its own limit"""
+        result = SampleResult("flow", [12.0, 1.0, 1.0, 1.0])
+        
+        with pytest.raises(AssertionError, match="cold run"):
+            result.assert_percentiles(cold=10.0)
+    
+    def test_bootstrap_interval_contains_estimate(self):
+        """Test that the interval brackets the percentile and is reproducible"""
+        values = [1.0, 1.2, 1.1, 1.3, 0.9, 1.05]
+        low, high = bootstrap_interval(values, 0.5)
+        
+        assert low <= percentile(values, 0.5) <= high
+        assert bootstrap_interval(values, 0.5) == (low, high)
+        assert bootstrap_interval([1.0], 0.5) is None
+
+class FakeNode:
+    """Test item holding user properties"""
+    
+    def __init__(self):
+        self.user_properties = []
+
+class FakeReport:
+    """Teardown report of a sampled test"""
+    
+    def __init__(self, user_properties):
+        self.nodeid = "tests/test_perf.py::test_flow"
+        self.when = "teardown"
+        self.user_properties = user_properties
+
+class FakeTerminal:
+    """Terminal reporter collecting the lines written"""
+    
+    def __init__(self):
+        self.lines = []
+    
+    def section(self, title):
+        self.lines.append(f"== {title}")
+    
+    def write_line(self, line):
+        self.lines.append(line)
+
+@pytest.mark.unit
+class TestPerfSampleReport:
+    """Test cases for reporting sampled flows"""
+    
+    def test_summary_goes_to_the_terminal_section(self, capsys):
+        """Test that a sample is listed in the summary section instead of printed"""
+        node = FakeNode()
+        result = PerfSampler(iterations=3, node=node).sample(lambda: None, name="noop")
+        report = PerfSampleReport()
+        report.pytest_runtest_logreport(FakeReport(node.user_properties))
+        terminal = FakeTerminal()
+        report.pytest_terminal_summary(terminal)
+        
+        assert capsys.readouterr().out == ""
+        assert terminal.lines == ["== performance samples", f"{result.summary()}  (tests/test_perf.py::test_flow)"]
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def run_tests(tmp_path, *args):
+    """Run run_tests.py with collection only, keeping history and logs out of the project"""
+    env = dict(os.environ, TEST_HISTORY_DIR=str(tmp_path / "history"))
+    return subprocess.run(
+        [sys.executable, "run_tests.py", *args, "--collect-only", "--no-html-report",
+         f"--benchmark-storage={tmp_path / 'benchmarks'}", f"--override-ini=log_file={tmp_path / 'pytest.log'}"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+
+@pytest.mark.unit
+class TestRunTests:
+    """Test cases for the runner's command line"""
+    
+    @pytest.mark.parametrize("args", [
+        ["--benchmark-autosave"],
+        ["--benchmark-compare", "--benchmark-compare-fail=median:20%"],
+    ])
+    def test_benchmark_options_reach_pytest(self, tmp_path, args):
+        """Test the documented baseline commands: unknown options are handed to pytest"""
+        result = run_tests(tmp_path, "--performance", *args)
+        
+        assert "unrecognized arguments" not in result.stderr
+        assert result.returncode == 0, result.stdout + result.stderr
+        running = next(line for line in result.stdout.splitlines() if "Running pytest with args" in line)
+        assert " ".join(args) + " --collect-only" in running
@@ -0,0 +1,122 @@
+import json
+import pytest
+from utils.sharding import DurationStore, ShardPlanner
+
+@pytest.mark.unit
+class TestShardPlanner:
+    """Test cases for duration-balanced sharding"""
+    
+    def test_parse_shard_spec(self):
+        """Test parsing and validating i/N shard specs"""
+        assert ShardPlanner.parse("2/4") == (2, 4)
+        for value in ("0/4", "5/4", "2", "a/b"):
+            with pytest.raises(ValueError):
+                ShardPlanner.parse(value)
+    
+    def test_every_test_runs_exactly_once(self, make_items):
+        """Test that the shards partition the collected tests"""
+        items = make_items(*[f"tests/test_a.py::TestA::test_{number}" for number in range(11)])
+        durations = {item.nodeid: float(number % 4 + 1) for number, item in enumerate(items)}
+        
+        shards, _ = ShardPlanner(durations).split(items, 3)
+        
+        nodeids = [item.nodeid for shard in shards for item in shard]
+        assert sorted(nodeids) == sorted(item.nodeid for item in items)
+    
+    def test_shards_are_balanced(self, make_items):
+        """Test that one long test does not share its shard with the rest"""
+        items = make_items("t.py::test_long", "t.py::test_1", "t.py::test_2", "t.py::test_3", "t.py::test_4")
+        durations = {"t.py::test_long": 40.0, "t.py::test_1": 10.0, "t.py::test_2": 10.0,
+                     "t.py::test_3": 10.0, "t.py::test_4": 10.0}
+        
+        shards, loads = ShardPlanner(durations).split(items, 2)
+        
+        assert loads == [40.0, 40.0]
+        assert [item.nodeid for item in shards[0]] == ["t.py::test_long"]
+    
+    def test_shards_keep_collection_order(self, make_items):
+        """Test that tests within a shard stay in collection order"""
+        items = make_items("t.py::test_1", "t.py::test_2", "t.py::test_3", "t.py::test_4")
+        durations = {"t.py::test_1": 1.0, "t.py::test_2": 3.0, "t.py::test_3": 2.0, "t.py::test_4": 4.0}
+        
+        shards, _ = ShardPlanner(durations).split(items, 2)
+        
+        order = [item.nodeid for item in items]
+        for shard in shards:
+            assert [item.nodeid for item in shard] == sorted((item.nodeid for item in shard), key=order.index)
+    
+    def test_plan_is_stable(self, make_items):
+        """Test that every agent computes the same plan from the same durations"""
+        specs = [f"t.py::test_{number}" for number in range(20)]
+        durations = {nodeid: 2.0 for nodeid in specs[:10]}
+        
+        plans = [
+            [[item.nodeid for item in shard] for shard in ShardPlanner(dict(durations)).split(make_items(*specs), 4)[0]]
+            for _ in range(3)
+        ]
+        
+        assert plans[0] == plans[1] == plans[2]
+    
+    def test_unknown_tests_borrow_class_and_marker_estimates(self, make_items):
+        """Test estimates for tests without history"""
+        items = make_items(
+            "t.py::TestSlow::test_known", "t.py::TestSlow::test_new",
+            ("t.py::TestOther::test_known", ["performance"]), ("t.py::TestMore::test_new", ["performance"]),
+            "t.py::TestNone::test_new"
+        )
+        durations = {"t.py::TestSlow::test_known": 30.0, "t.py::TestOther::test_known": 8.0}
+        
+        estimates = ShardPlanner(durations).estimate(items)
+        
+        assert estimates["t.py::TestSlow::test_new"] == 30.0
+        assert estimates["t.py::TestMore::test_new"] == 8.0
+        assert estimates["t.py::TestNone::test_new"] == 19.0
+    
+    def test_no_history_uses_default_duration(self, make_items):
+        """Test that tests are spread evenly when there is no history at all"""
+        items = make_items(*[f"t.py::test_{number}" for number in range(6)])
+        
+        shards, loads = ShardPlanner({}).split(items, 3)
+        
+        assert [len(shard) for shard in shards] == [2, 2, 2]
+        assert loads == [2 * ShardPlanner.DEFAULT_DURATION] * 3
+
+@pytest.mark.unit
+class TestDurationStore:
+    """Test cases for the smoothed duration history"""
+    
+    def test_record_smooths_durations(self, tmp_path):
+        """Test the exponential moving average of recorded durations"""
+        store = DurationStore(str(tmp_path / "durations.json"))
+        store.record({"t.py::test_a": 10.0})
+        store.record({"t.py::test_a": 20.0, "t.py::test_b": 1.0})
+        
+        assert store.durations == {"t.py::test_a": 13.0, "t.py::test_b": 1.0}
+    
+    def test_save_and_load(self, tmp_path):
+        """Test that durations survive a save and load"""
+        path = str(tmp_path / "history" / "durations.json")
+        store = DurationStore(path)
+        store.record({"t.py::test_a": 2.5})
+        store.save()
+        
+        assert DurationStore(path).load().durations == {"t.py::test_a": 2.5}
+        with open(path) as file:
+            assert json.load(file) == {"t.py::test_a": 2.5}
+    
+    def test_merge_folds_shard_durations_into_shared_file(self, tmp_path, monkeypatch):
+        """Test that merging sharded reports hands their durations back to the shared file"""
+        from config.settings import Config
+        from utils.report_merge import ShardReportMerger
+        
+        shared = tmp_path / "test_durations.json"
+        shared.write_text(json.dumps({"t.py::test_a": 10.0}))
+        monkeypatch.setattr(Config, "SHARD_DURATIONS_FILE", str(shared))
+        for shard, results in (("shard-1", {"t.py::test_a": 20.0}), ("shard-2", {"t.py::test_b": 4.0})):
+            (tmp_path / shard).mkdir()
+            (tmp_path / shard / "durations.json").write_text(json.dumps(results))
+        
+        ShardReportMerger([str(tmp_path / "shard-1"), str(tmp_path / "shard-2")], str(tmp_path / "merged")).merge()
+        
+        merged = json.loads((tmp_path / "merged" / "durations.json").read_text())
+        assert merged == {"t.py::test_a": 13.0, "t.py::test_b": 4.0}
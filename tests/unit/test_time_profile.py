@@ -0,0 +1,58 @@
+import itertools
+import pytest
+from utils import time_profile
+from utils.time_profile import TimeBreakdown
+
+@pytest.fixture
+def clock(monkeypatch):
+    """perf_counter advancing one second per call"""
+    ticks = itertools.count()
+    monkeypatch.setattr(time_profile.time, "perf_counter", lambda: float(next(ticks)))
+
+@pytest.mark.unit
+class TestTimeBreakdown:
+    """Test cases for the per-test time buckets"""
+    
+    def run_frames(self, timeline, frames):
+        for name, bucket in frames:
+            timeline.push(name, bucket)
+            timeline.pop()
+    
+    def test_frames_inside_a_wait(self, clock):
+        """Test that finds and sleeps inside a wait are waiting and other commands are polling"""
+        timeline = TimeBreakdown("test")
+        timeline.push("WebDriverWait.until", "poll")
+        self.run_frames(timeline, [
+            ("webdriver:findElement", "webdriver"),
+            ("webdriver:isElementDisplayed", "webdriver"),
+            ("time.sleep", "sleep"),
+            ("webdriver:findElements", "webdriver"),
+        ])
+        timeline.pop()
+        
+        buckets = timeline.to_dict()["buckets"]
+        assert buckets["wait"] == 3.0
+        assert buckets["poll"] == 6.0
+        assert buckets["webdriver"] == 0.0
+    
+    def test_frames_outside_a_wait(self, clock):
+        """Test that commands outside waits keep their own buckets"""
+        timeline = TimeBreakdown("test")
+        timeline.push("call", "python")
+        self.run_frames(timeline, [("webdriver:findElement", "webdriver"), ("time.sleep", "sleep")])
+        timeline.pop()
+        
+        profile = timeline.to_dict()
+        assert profile["buckets"]["webdriver"] == 1.0
+        assert profile["buckets"]["sleep"] == 1.0
+        assert profile["buckets"]["python"] == 3.0
+        assert profile["stacks"]["call;webdriver:findElement"] == 1.0
+    
+    def test_navigation_encloses_its_commands(self, clock):
+        """Test that everything inside navigation is navigation"""
+        timeline = TimeBreakdown("test")
+        timeline.push("BasePage.go_to_url", "navigation")
+        self.run_frames(timeline, [("webdriver:findElement", "webdriver")])
+        timeline.pop()
+        
+        assert timeline.to_dict()["buckets"]["navigation"] == 3.0
@@ -0,0 +1,53 @@
+import pytest
+from config.settings import Config
+from utils.visual import VisualCheck
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("PIL")
+
+@pytest.fixture
+def visual(tmp_path, monkeypatch):
+    """VisualCheck writing its diff images under tmp_path"""
+    monkeypatch.setattr(Config, "VISUAL_DIFF_DIR", str(tmp_path / "visual"))
+    monkeypatch.setattr(Config, "VISUAL_UPDATE", False)
+    return VisualCheck(driver=None, page_name="ExamplePage", test_name="test_example")
+
+def image(color, size=(16, 24)):
+    pixels = np.zeros(size + (3,), dtype=np.uint8)
+    pixels[:] = color
+    return pixels
+
+@pytest.mark.unit
+class TestVisualCheck:
+    """Test cases for comparing captures with baselines"""
+    
+    def test_missing_baseline_is_not_created(self, visual, tmp_path):
+        """Test that a missing baseline is reported, not silently recorded"""
+        result = visual.compare("page", image(255), str(tmp_path / "baselines"))
+        
+        assert result["passed"] is None
+        assert result["status"] == "no baseline"
+        assert not (tmp_path / "baselines").exists()
+        assert (tmp_path / "visual" / "test_example" / "page_actual.png").exists()
+    
+    def test_missing_baseline_skips(self, visual, tmp_path, monkeypatch):
+        """Test that assert_matches skips, naming the baseline, when it is missing"""
+        monkeypatch.setattr(visual, "check", lambda *args: [visual.compare("page", image(255), str(tmp_path))])
+        
+        with pytest.raises(pytest.skip.Exception, match="--update-visual-baselines"):
+            visual.assert_matches("page")
+    
+    def test_update_then_compare(self, visual, tmp_path, monkeypatch):
+        """Test that a recorded baseline matches itself and a changed image fails"""
+        directory = str(tmp_path / "baselines")
+        monkeypatch.setattr(Config, "VISUAL_UPDATE", True)
+        assert visual.compare("page", image(255), directory)["status"] == "baseline updated"
+        monkeypatch.setattr(Config, "VISUAL_UPDATE", False)
+        
+        assert visual.compare("page", image(255), directory)["status"] == "unchanged"
+        changed = image(255)
+        changed[4:8, 4:8] = 0
+        result = visual.compare("page", changed, directory)
+        assert result["passed"] is False
+        assert result["status"].startswith("16 pixels differ")
+        assert (tmp_path / "visual" / "test_example" / "page_diff.png").exists()
@@ -0,0 +1,56 @@
+import json
+import pytest
+import utils.impact
+import utils.watch
+from config.settings import Config
+from utils.watch import AffectedTestFinder
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """A small project tree with pages, utils, tests and an impact index"""
+    files = {
+        "utils/formatting.py": "",
+        "utils/reporting.py": "",
+        "utils/summary.py": "",
+        "utils/report_tool.py": "import utils.reporting\n",
+        "pages/a_page.py": "from utils.formatting import fmt\n",
+        "tests/conftest.py": "from utils.summary import summarize\n",
+        "tests/test_a.py": "from pages.a_page import APage\n",
+        "tests/test_b.py": "import pytest\n",
+    }
+    for path, source in files.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(source)
+    index_file = tmp_path / "impact_index.json"
+    index_file.write_text(json.dumps({"tests": {
+        "tests/test_a.py::test_uses_page": ["tests/test_a.py::test_uses_page", "pages/a_page.py::APage.open"],
+        "tests/test_a.py::test_no_page": ["tests/test_a.py::test_no_page"],
+    }}))
+    monkeypatch.setattr(utils.watch, "PROJECT_ROOT", str(tmp_path))
+    monkeypatch.setattr(utils.impact, "PROJECT_ROOT", str(tmp_path))
+    monkeypatch.setattr(Config, "IMPACT_INDEX_FILE", str(index_file))
+    return tmp_path
+
+@pytest.mark.unit
+class TestAffectedTestFinder:
+    """Test cases for watch mode test selection"""
+    
+    def test_page_change_is_narrowed_by_index(self, project):
+        """Test that the impact index picks the tests using a changed page"""
+        assert AffectedTestFinder().find(["pages/a_page.py"]) == ["tests/test_a.py::test_uses_page"]
+    
+    def test_unindexed_module_keeps_whole_file(self, project):
+        """Test that a change outside pages/ and tests/ keeps every test of the importing files"""
+        assert AffectedTestFinder().find(["utils/formatting.py"]) == ["tests/test_a.py"]
+    
+    def test_module_imported_by_conftest_runs_everything(self, project):
+        """Test that a module only conftest.py imports selects the full suite"""
+        assert AffectedTestFinder().find(["utils/summary.py"]) == ["tests"]
+    
+    def test_module_imported_by_run_wide_path_runs_everything(self, project):
+        """Test that a module imported through a full-run path selects the full suite"""
+        assert AffectedTestFinder().find(["utils/reporting.py"]) == ["tests"]
+    
+    def test_changed_test_file_is_selected(self, project):
+        """Test that an edited test file is rerun"""
+        assert AffectedTestFinder().find(["tests/test_b.py"]) == ["tests/test_b.py"]
@@ -0,0 +1,75 @@
+import pytest
+from utils.page_metrics import PageMetrics, PageMetricsRecorder
+from utils.perf_budgets import PerformanceBudgets
+from utils.web_vitals import WebVitalsRecorder
+
+class FakeDriver:
+    """Driver returning canned Web Vitals entries"""
+    
+    def __init__(self, session_id, current_url, entries):
+        self.session_id = session_id
+        self.current_url = current_url
+        self.entries = entries
+    
+    def execute_script(self, script, *args):
+        entries, self.entries = self.entries, []
+        return entries
+
+def vitals(url, lcp):
+    return {"url": url, "lcp": lcp, "cls": 0.0, "tbt": 0.0, "inp": None, "long_tasks": 0, "interactions": 0}
+
+@pytest.mark.unit
+class TestPageMetricsUpdate:
+    """Test cases for merging metrics read after a visit"""
+    
+    def test_merges_into_visit_of_the_url(self):
+        """Test that metrics of a visited URL go to its latest visit"""
+        metrics = PageMetrics()
+        metrics.add("LoginPage", {"url": "http://site/login", "metrics": {"ttfb": 10}})
+        
+        assert metrics.update("http://site/login", {"lcp": 900}) == "LoginPage"
+        assert metrics.visits == [{"url": "http://site/login", "metrics": {"ttfb": 10, "lcp": 900}, "page": "LoginPage"}]
+    
+    def test_unvisited_url_has_no_page(self):
+        """Test that a document reached without a visit is not charged to a page object"""
+        metrics = PageMetrics()
+        metrics.add("LoginPage", {"url": "http://site/login", "metrics": {"ttfb": 10}})
+        
+        assert metrics.update("http://site/secure", {"lcp": 4000}) is None
+        assert metrics.latest("LoginPage") == {"ttfb": 10}
+        assert metrics.visits[-1] == {"url": "http://site/secure", "metrics": {"lcp": 4000}, "page": None}
+    
+    def test_budgets_of_unattributed_visits(self):
+        """Test that page object budgets skip unattributed visits and path budgets still apply"""
+        budgets = PerformanceBudgets()
+        budgets.pages = {"LoginPage": {"lcp": 1000}}
+        budgets.paths = {"/secure": {"lcp": 2000}}
+        metrics = PageMetrics()
+        metrics.add("LoginPage", {"url": "http://site/login", "metrics": {"lcp": 500}})
+        metrics.update("http://site/secure", {"lcp": 4000})
+        
+        assert budgets.check(metrics.visits) == ["(unattributed) http://site/secure: lcp = 4000 > 2000"]
+
+@pytest.mark.unit
+class TestWebVitalsRecorder:
+    """Test cases for attributing Web Vitals to page objects"""
+    
+    def test_only_the_loaded_document_is_attributed(self):
+        """Test that vitals of a document reached from the loaded page have no page object"""
+        driver = FakeDriver("vitals-session", "http://site/login", [
+            vitals("http://site/login", 800), vitals("http://site/secure", 1200)
+        ])
+        metrics = PageMetricsRecorder.start(driver)
+        metrics.add("LoginPage", {"url": "http://site/login", "metrics": {}})
+        try:
+            WebVitalsRecorder.page_loaded(driver, "LoginPage")
+            entries = WebVitalsRecorder.flush(driver)
+        finally:
+            PageMetricsRecorder.stop(driver)
+            WebVitalsRecorder.take(driver)
+        
+        assert [(entry["url"], entry["page"]) for entry in entries] == [
+            ("http://site/login", "LoginPage"), ("http://site/secure", None)
+        ]
+        assert [visit["page"] for visit in metrics.visits] == ["LoginPage", None]
+        assert metrics.visits[0]["metrics"]["lcp"] == 800
@@ -0,0 +1,117 @@
+"""
+Browser-driven load: page object scenarios run concurrently by virtual users, one headless browser each
+"""
+import threading
+import time
+from contextlib import contextmanager
+from utils.load_results import LoadResults
+
+class VirtualUser(threading.Thread):
+    """Runs a scenario in its own browser until the run ends, pacing its iterations"""
+
+    def __init__(self, number, runner):
+        super().__init__(name=f"virtual-user-{number}", daemon=True)
+        self.number = number
+        self.runner = runner
+        self.iterations = 0
+        self.driver = None
+        self.active = False
+
+    @contextmanager
+    def step(self, name):
+        """Time a scenario step; a failing step is counted as an error and ends the iteration"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.runner.results.record(name, time.perf_counter() - start, type(e).__name__)
+            raise
+        self.runner.results.record(name, time.perf_counter() - start)
+
+    def run(self):
+        runner = self.runner
+        # Ramp up: users start evenly spread over the ramp-up period
+        if runner.stop_event.wait(self.number * runner.ramp_up / runner.users):
+            return
+        try:
+            self.driver = runner.driver_factory(runner.browser, True)
+        except Exception as e:
+            runner.results.record("browser_start", 0, type(e).__name__)
+            return
+
+        self.active = True
+        try:
+            while not runner.stop_event.is_set() and time.time() < runner.deadline:
+                started = time.perf_counter()
+                try:
+                    runner.scenario(self.driver, self.step)
+                    runner.results.record("iteration", time.perf_counter() - started)
+                except Exception as e:
+                    runner.results.record("iteration", time.perf_counter() - started, type(e).__name__)
+                    self._reset()
+                self.iterations += 1
+                # Pacing: start iterations at most every `pacing` seconds
+                runner.stop_event.wait(max(0.0, runner.pacing - (time.perf_counter() - started)))
+        finally:
+            self.active = False
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+
+    def _reset(self):
+        try:
+            self.driver.delete_all_cookies()
+        except Exception:
+            pass
+
+class BrowserLoadRunner:
+    """Runs a scenario with N virtual users for a fixed duration"""
+
+    def __init__(self, scenario, name, users, duration, ramp_up=0.0, pacing=0.0, browser="chrome",
+                 driver_factory=None, report_interval=10.0):
+        if driver_factory is None:
+            from utils.driver_factory import DriverFactory
+            driver_factory = DriverFactory.get_driver
+        self.scenario = scenario
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.pacing = pacing
+        self.browser = browser
+        self.driver_factory = driver_factory
+        self.report_interval = report_interval
+        self.results = LoadResults(name)
+        self.stop_event = threading.Event()
+        self.deadline = None
+
+    def run(self):
+        """Run until the duration is over (or Ctrl+C) and return the results"""
+        self.deadline = time.time() + self.duration
+        virtual_users = [VirtualUser(number, self) for number in range(self.users)]
+        for user in virtual_users:
+            user.start()
+
+        try:
+            while any(user.is_alive() for user in virtual_users):
+                for user in virtual_users:
+                    user.join(timeout=self.report_interval / len(virtual_users))
+                self._print_progress(virtual_users)
+        except KeyboardInterrupt:
+            print("\nStopping virtual users...")
+            self.stop_event.set()
+            for user in virtual_users:
+                user.join()
+
+        self.results.finish()
+        return self.results
+
+    def _print_progress(self, virtual_users):
+        iterations = self.results.steps.get("iteration")
+        errors = sum(self.results.errors.get("iteration", {}).values())
+        remaining = max(0, self.deadline - time.time())
+        active = sum(1 for user in virtual_users if user.active)
+        print(
+            f"[{remaining:6.0f}s left] users: {active}/{self.users}, "
+            f"iterations: {iterations.count if iterations else 0}, failed: {errors}"
+        )
@@ -0,0 +1,214 @@
+"""
+Chrome trace capture (CDP Tracing streamed to a .json.gz file) and main-thread summary
+"""
+import base64
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+from config.settings import Config
+from utils.screenshots import safe_name
+
+# Bytes requested per IO.read while copying the trace stream to disk
+READ_CHUNK = 1024 * 1024
+
+TOP_LEVEL_TASKS = {"RunTask", "ThreadControllerImpl::RunTask", "ThreadControllerImpl::DoWork"}
+
+# Trace event name -> breakdown class; self time of unlisted events counts as 'other'
+EVENT_CLASSES = {
+    "EvaluateScript": "script", "v8.compile": "script", "v8.compileModule": "script", "v8.evaluateModule": "script",
+    "v8.run": "script", "V8.Execute": "script", "FunctionCall": "script", "TimerFire": "script",
+    "EventDispatch": "script", "FireAnimationFrame": "script", "FireIdleCallback": "script",
+    "RunMicrotasks": "script", "v8.callFunction": "script", "XHRReadyStateChange": "script",
+    "UpdateLayoutTree": "style_layout", "RecalculateStyles": "style_layout", "Layout": "style_layout",
+    "ParseAuthorStyleSheet": "style_layout", "InvalidateLayout": "style_layout", "ScheduleStyleRecalculation": "style_layout",
+    "Paint": "paint", "PaintImage": "paint", "PrePaint": "paint", "UpdateLayer": "paint", "UpdateLayerTree": "paint",
+    "Layerize": "paint", "CompositeLayers": "paint", "Commit": "paint", "Decode Image": "paint",
+    "ParseHTML": "parse",
+    "MinorGC": "gc", "MajorGC": "gc", "V8.GC_SCAVENGER": "gc", "V8.GC_MARK_COMPACTOR": "gc",
+    "BlinkGC.AtomicPhase": "gc", "BlinkGC.CompleteSweep": "gc", "ThreadState::performIdleLazySweep": "gc"
+}
+
+BREAKDOWN_CLASSES = ["script", "style_layout", "paint", "parse", "gc", "other"]
+
+def build_trace_path(test_name):
+    """Path of a new trace file for a test under Config.TRACE_DIR"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return os.path.join(Config.TRACE_DIR, f"{safe_name(test_name)}_{timestamp}_{os.getpid()}.json.gz")
+
+class ChromeTracer:
+    """Records a CDP Tracing session and streams it to disk as gzipped JSON
+
+    CDP events are not available through execute_cdp_cmd, so the session runs
+    over Selenium's DevTools connection on a background thread. Chrome
+    compresses the trace and hands it over as a stream that is copied to the
+    file chunk by chunk; the trace is never held in memory.
+    """
+
+    def __init__(self, driver, output_file, categories=None, timeout=None):
+        self.driver = driver
+        self.output_file = output_file
+        self.categories = categories or Config.TRACE_CATEGORIES
+        self.timeout = timeout or Config.TRACE_TIMEOUT
+        self._started = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._error = None
+
+    def start(self):
+        """Start tracing; False if the browser can't be traced"""
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            return False
+        self._thread = threading.Thread(target=self._run, name="chrome-tracer", daemon=True)
+        self._thread.start()
+        self._started.wait(self.timeout)
+        if not self._started.is_set() or self._error is not None:
+            print(f"Chrome tracing disabled: {str(self._error) if self._error else 'timed out starting'}")
+            self._stop.set()
+            return False
+        return True
+
+    def stop(self):
+        """End tracing and wait for the trace file; returns its path, or None if it could not be written"""
+        self._stop.set()
+        self._thread.join(self.timeout)
+        if self._thread.is_alive() or self._error is not None:
+            print(f"Failed to write Chrome trace: {str(self._error) if self._error else 'timed out'}")
+            return None
+        return self.output_file
+
+    def _run(self):
+        import trio
+
+        try:
+            trio.run(self._session)
+        except Exception as e:
+            self._error = e
+        finally:
+            # Unblock start() if the session failed before tracing began
+            self._started.set()
+
+    async def _session(self):
+        import trio
+
+        async with self.driver.bidi_connection() as connection:
+            session, devtools = connection.session, connection.devtools
+            await session.execute(devtools.tracing.start(
+                trace_config=devtools.tracing.TraceConfig(included_categories=list(self.categories)),
+                transfer_mode="ReturnAsStream",
+                stream_format=devtools.tracing.StreamFormat.JSON,
+                stream_compression=devtools.tracing.StreamCompression.GZIP
+            ))
+            self._started.set()
+            await trio.to_thread.run_sync(self._stop.wait)
+
+            async with session.wait_for(devtools.tracing.TracingComplete) as complete:
+                await session.execute(devtools.tracing.end())
+            stream = complete.value.stream
+
+            os.makedirs(os.path.dirname(self.output_file) or ".", exist_ok=True)
+            with open(self.output_file, "wb") as file:
+                while True:
+                    encoded, data, eof = await session.execute(devtools.io.read(handle=stream, size=READ_CHUNK))
+                    file.write(base64.b64decode(data) if encoded else data.encode("utf-8"))
+                    if eof:
+                        break
+            await session.execute(devtools.io.close(handle=stream))
+
+def iter_trace_events(path, chunk_size=READ_CHUNK):
+    """Yield the events of a trace file one at a time ({"traceEvents": [...]} or a bare array, gzipped or not)"""
+    opener = gzip.open if path.endswith(".gz") else open
+    decoder = json.JSONDecoder()
+    with opener(path, "rt", encoding="utf-8") as file:
+        buffer = file.read(chunk_size)
+        while True:
+            key = buffer.find('"traceEvents"')
+            if key >= 0:
+                start = buffer.find("[", key)
+            else:
+                start = buffer.find("[") if buffer.lstrip().startswith("[") else -1
+            if start >= 0:
+                break
+            chunk = file.read(chunk_size)
+            if not chunk:
+                return
+            buffer += chunk
+
+        position = start + 1
+        while True:
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            try:
+                event, position = decoder.raw_decode(buffer, position)
+            except ValueError:
+                # Incomplete event at the end of the buffer: drop what was consumed and read more
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    return
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+            yield event
+
+def summarize_trace(path, top=None):
+    """Main-thread busy time, script/layout/paint breakdown and longest tasks of the traced page (times in ms)"""
+    top = top or Config.TRACE_TOP_TASKS
+
+    # First pass: find the renderer main threads and how busy each one was
+    renderer_threads = set()
+    busy = {}
+    for event in iter_trace_events(path):
+        thread = (event.get("pid"), event.get("tid"))
+        if event.get("ph") == "M" and event.get("name") == "thread_name":
+            if event.get("args", {}).get("name") == "CrRendererMain":
+                renderer_threads.add(thread)
+        elif event.get("ph") == "X" and event.get("name") in TOP_LEVEL_TASKS:
+            busy[thread] = busy.get(thread, 0) + event.get("dur", 0)
+    candidates = [thread for thread in busy if thread in renderer_threads] or list(busy)
+    if not candidates:
+        return {"main_thread_busy": 0.0, "trace_duration": 0.0, "breakdown": {}, "long_tasks": 0, "longest_tasks": []}
+    main_thread = max(candidates, key=lambda thread: busy[thread])
+
+    # Second pass: self time per event class on that thread
+    events = sorted(
+        (event["ts"], event.get("dur", 0), event.get("name", ""))
+        for event in iter_trace_events(path)
+        if event.get("ph") == "X" and (event.get("pid"), event.get("tid")) == main_thread and "ts" in event
+    )
+    breakdown = dict.fromkeys(BREAKDOWN_CLASSES, 0.0)
+    tasks = []
+    stack = []
+
+    def close(frame):
+        breakdown[EVENT_CLASSES.get(frame["name"], "other")] += max(0, frame["self"]) / 1000.0
+
+    for ts, dur, name in events:
+        while stack and stack[-1]["end"] <= ts:
+            close(stack.pop())
+        if stack:
+            stack[-1]["self"] -= dur
+            if len(stack) == 1 and stack[0]["task"] is not None and dur > stack[0]["task"]["child_dur"]:
+                stack[0]["task"].update(child=name, child_dur=dur)
+        task = None
+        if not stack and name in TOP_LEVEL_TASKS:
+            task = {"start": ts, "duration": dur, "child": None, "child_dur": 0}
+            tasks.append(task)
+        stack.append({"name": name, "end": ts + dur, "self": dur, "task": task})
+    while stack:
+        close(stack.pop())
+
+    origin = events[0][0] if events else 0
+    longest = sorted(tasks, key=lambda task: -task["duration"])[:top]
+    return {
+        "main_thread_busy": sum(task["duration"] for task in tasks) / 1000.0,
+        "trace_duration": (max(ts + dur for ts, dur, _ in events) - origin) / 1000.0 if events else 0.0,
+        "breakdown": {name: round(value, 1) for name, value in breakdown.items()},
+        "long_tasks": sum(1 for task in tasks if task["duration"] > 50000),
+        "longest_tasks": [
+            {"start": (task["start"] - origin) / 1000.0, "duration": task["duration"] / 1000.0, "mostly": task["child"]}
+            for task in longest
+        ]
+    }
@@ -1,15 +1,16 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.firefox import GeckoDriverManager
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
 from config.settings import Config
 import os
 
+# Browser-specific selenium services and webdriver_manager (which pulls in
+# requests) are imported only when a driver is built, keeping collection and
+# xdist worker startup fast.
+
 class DriverFactory:
+    # Active emulation profile per driver session
+    _throttling = {}
+    
     @staticmethod
-    def get_driver(browser_name=None, headless=None):
+    def get_driver(browser_name=None, headless=None, throttle=None):
         browser = browser_name or Config.DEFAULT_BROWSER
         is_headless = headless if headless is not None else Config.HEADLESS
         
@@ -17,14 +18,82 @@ class DriverFactory:
         os.makedirs(Config.SCREENSHOT_DIR, exist_ok=True)
         
         if browser.lower() == "chrome":
-            return DriverFactory._get_chrome_driver(is_headless)
+            driver = DriverFactory._get_chrome_driver(is_headless)
         elif browser.lower() == "firefox":
-            return DriverFactory._get_firefox_driver(is_headless)
+            driver = DriverFactory._get_firefox_driver(is_headless)
         else:
             raise Exception(f"Unsupported browser: {browser}. Supported browsers: chrome, firefox")
+        
+        if throttle:
+            DriverFactory.apply_throttling(driver, throttle)
+        return driver
+    
+    @staticmethod
+    def restart_browser(driver):
+        """Replace the browser behind a driver with a fresh one, keeping the driver object"""
+        from selenium.webdriver.remote.command import Command
+        
+        throttle = DriverFactory._throttling.pop(driver.session_id, None)
+        try:
+            # Ends the browser session but keeps the driver service running
+            driver.execute(Command.QUIT)
+        except Exception as e:
+            print(f"Failed to quit browser session: {str(e)}")
+        driver.start_session(driver.factory_capabilities)
+        
+        driver.implicitly_wait(Config.DEFAULT_TIMEOUT)
+        driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(Config.SCRIPT_TIMEOUT)
+        if throttle:
+            DriverFactory.apply_throttling(driver, throttle)
+        return driver
+    
+    @staticmethod
+    def parse_throttle_profile(profile):
+        """Merge named profiles such as '3G+4x-cpu' into one set of emulation settings"""
+        settings = {}
+        for name in profile.split("+"):
+            name = name.strip()
+            if name not in Config.THROTTLE_PROFILES:
+                raise ValueError(f"Unknown throttle profile '{name}'. Available: {', '.join(Config.THROTTLE_PROFILES)}")
+            settings.update(Config.THROTTLE_PROFILES[name])
+        return settings
+    
+    @staticmethod
+    def apply_throttling(driver, profile):
+        """Emulate a slow network and/or CPU over CDP (Chrome); None restores full speed"""
+        settings = DriverFactory.parse_throttle_profile(profile) if profile else {}
+        if not hasattr(driver, "execute_cdp_cmd"):
+            if profile:
+                print(f"Throttling is only supported on Chrome, ignoring '{profile}'")
+            return False
+        
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.emulateNetworkConditions", {
+            "offline": False,
+            "latency": settings.get("latency", 0),
+            "downloadThroughput": settings.get("download", -1),
+            "uploadThroughput": settings.get("upload", -1)
+        })
+        driver.execute_cdp_cmd("Emulation.setCPUThrottlingRate", {"rate": settings.get("cpu", 1)})
+        
+        if profile:
+            DriverFactory._throttling[driver.session_id] = profile
+        else:
+            DriverFactory._throttling.pop(driver.session_id, None)
+        return True
+    
+    @staticmethod
+    def get_throttling(driver):
+        """Get the emulation profile active on a driver, if any"""
+        return DriverFactory._throttling.get(getattr(driver, "session_id", None))
     
     @staticmethod
     def _get_chrome_driver(headless):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service as ChromeService
+        from webdriver_manager.chrome import ChromeDriverManager
+        
         options = webdriver.ChromeOptions()
         
         # Basic Chrome options
@@ -63,9 +132,14 @@ class DriverFactory:
         options.add_experimental_option('excludeSwitches', ['enable-logging'])
         options.add_experimental_option('useAutomationExtension', False)
         
+        # CDP events and console messages for the flight recorder
+        if Config.FLIGHT_RECORDER:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL", "browser": "ALL"})
+        
         # Create driver
         service = ChromeService(ChromeDriverManager().install())
         driver = webdriver.Chrome(service=service, options=options)
+        driver.factory_capabilities = options.to_capabilities()
         
         # Set timeouts
         driver.implicitly_wait(Config.DEFAULT_TIMEOUT)
@@ -76,6 +150,10 @@ class DriverFactory:
     
     @staticmethod
     def _get_firefox_driver(headless):
+        from selenium import webdriver
+        from selenium.webdriver.firefox.service import Service as FirefoxService
+        from webdriver_manager.firefox import GeckoDriverManager
+        
         options = webdriver.FirefoxOptions()
         
         # Basic Firefox options
@@ -97,6 +175,7 @@ class DriverFactory:
         # Create driver
         service = FirefoxService(GeckoDriverManager().install())
         driver = webdriver.Firefox(service=service, options=options)
+        driver.factory_capabilities = options.to_capabilities()
         
         # Set timeouts
         driver.implicitly_wait(Config.DEFAULT_TIMEOUT)
@@ -0,0 +1,60 @@
+"""
+Pool of warm WebDriver instances kept alive between test sessions
+
+This module holds no project imports so the runner daemon can keep it loaded
+while every other project module is re-imported for each run.
+"""
+
+class DriverPool:
+    """Keeps one driver per (browser, headless) alive when keep_alive is set"""
+
+    keep_alive = False
+    recycled = 0
+    _drivers = {}
+
+    @classmethod
+    def acquire(cls, browser, headless, factory):
+        """Get a warm driver for the browser, or build one with factory"""
+        key = (browser.lower(), headless)
+        driver = cls._drivers.pop(key, None)
+        if driver is not None and cls._reset(driver):
+            return driver
+        return factory(browser, headless)
+
+    @classmethod
+    def release(cls, driver, browser, headless):
+        """Return a driver to the pool, or quit it when the pool is disabled"""
+        if cls.keep_alive:
+            cls._drivers[(browser.lower(), headless)] = driver
+        else:
+            driver.quit()
+
+    @classmethod
+    def recycle(cls, driver, restart):
+        """Swap a bloated browser for a fresh one in place using restart(driver)"""
+        cls.recycled += 1
+        return restart(driver)
+
+    @classmethod
+    def quit_all(cls):
+        """Quit every pooled driver"""
+        for driver in cls._drivers.values():
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Failed to quit pooled driver: {str(e)}")
+        cls._drivers.clear()
+
+    @staticmethod
+    def _reset(driver):
+        """Clear state left by the previous session; False if the browser is gone"""
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            return False
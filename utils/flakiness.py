@@ -0,0 +1,130 @@
+"""
+Flaky test detection: pass/fail history per test, flake scores, targeted reruns and quarantine
+"""
+import os
+import sqlite3
+import time
+import pytest
+from config.settings import Config
+
+class FlakinessStore:
+    """SQLite store of test outcomes across runs"""
+
+    def __init__(self, path=None):
+        self.path = path or Config.FLAKINESS_DB
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, nodeid TEXT NOT NULL, "
+            "outcome TEXT NOT NULL, recorded_at REAL NOT NULL)"
+        )
+        self.connection.execute("CREATE INDEX IF NOT EXISTS results_nodeid ON results (nodeid, id)")
+
+    def record(self, results):
+        """Store the final outcome ('passed', 'failed' or 'flaky') of each test in a run"""
+        now = time.time()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO results (nodeid, outcome, recorded_at) VALUES (?, ?, ?)",
+                [(nodeid, outcome, now) for nodeid, outcome in results.items()]
+            )
+
+    def get_history(self, window=None):
+        """Get the most recent outcomes of every test, oldest first"""
+        window = window or Config.FLAKINESS_WINDOW
+        rows = self.connection.execute(
+            "SELECT nodeid, outcome FROM ("
+            " SELECT nodeid, outcome, id, ROW_NUMBER() OVER (PARTITION BY nodeid ORDER BY id DESC) AS age"
+            " FROM results) WHERE age <= ? ORDER BY id",
+            (window,)
+        )
+        history = {}
+        for nodeid, outcome in rows:
+            history.setdefault(nodeid, []).append(outcome)
+        return history
+
+    def get_scores(self):
+        """Get the flake score of every test with enough history"""
+        return {
+            nodeid: flake_score(outcomes)
+            for nodeid, outcomes in self.get_history().items()
+            if len(outcomes) >= Config.FLAKINESS_MIN_RUNS
+        }
+
+    def close(self):
+        self.connection.close()
+
+def flake_score(outcomes):
+    """Share of runs that contradicted the previous run or only passed on rerun
+
+    A test that always passes or always fails scores 0; a test that flips
+    on every run scores close to 1.
+    """
+    if not outcomes:
+        return 0.0
+    flaky_runs = sum(1 for outcome in outcomes if outcome == "flaky")
+    flips = sum(
+        1 for previous, current in zip(outcomes, outcomes[1:])
+        if "flaky" not in (previous, current) and previous != current
+    )
+    return min(1.0, (flaky_runs + flips) / len(outcomes))
+
+class FlakinessTracker:
+    """Pytest plugin that reruns only historically flaky tests and splits off quarantined ones"""
+
+    def __init__(self, store, reruns=0, lane="main", record=True):
+        self.store = store
+        self.reruns = reruns
+        self.lane = lane
+        self.record = record
+        self.scores = store.get_scores()
+        self.results = {}
+        self.rerun_nodeids = set()
+
+    def is_flaky(self, nodeid):
+        return self.scores.get(nodeid, 0.0) >= Config.FLAKINESS_RERUN_THRESHOLD
+
+    def is_quarantined(self, nodeid):
+        return self.scores.get(nodeid, 0.0) >= Config.FLAKINESS_QUARANTINE_THRESHOLD
+
+    @pytest.hookimpl(trylast=True)
+    def pytest_collection_modifyitems(self, config, items):
+        if self.lane != "all":
+            want_quarantined = self.lane == "quarantine"
+            selected = [item for item in items if self.is_quarantined(item.nodeid) == want_quarantined]
+            deselected = [item for item in items if item not in selected]
+            if deselected:
+                config.hook.pytest_deselected(items=deselected)
+                items[:] = selected
+
+        if self.reruns > 0:
+            for item in items:
+                if self.is_flaky(item.nodeid):
+                    item.add_marker(pytest.mark.flaky(reruns=self.reruns))
+
+    def pytest_runtest_logreport(self, report):
+        if report.outcome == "rerun":
+            self.rerun_nodeids.add(report.nodeid)
+        elif report.when == "call" or (report.when == "setup" and report.failed):
+            if report.passed and report.nodeid in self.rerun_nodeids:
+                self.results[report.nodeid] = "flaky"
+            elif not report.skipped:
+                self.results[report.nodeid] = report.outcome
+
+    def pytest_terminal_summary(self, terminalreporter):
+        flaky = sorted(
+            (score, nodeid) for nodeid, score in self.scores.items()
+            if score >= Config.FLAKINESS_RERUN_THRESHOLD
+        )
+        if not flaky:
+            return
+        terminalreporter.section("flaky tests")
+        for score, nodeid in reversed(flaky):
+            lane = "quarantine" if self.is_quarantined(nodeid) else "rerun"
+            terminalreporter.write_line(f"{score:5.2f}  {lane:<10}  {nodeid}")
+
+    def pytest_sessionfinish(self, session):
+        if self.record and self.results:
+            self.store.record(self.results)
+        self.store.close()
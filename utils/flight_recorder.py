@@ -0,0 +1,186 @@
+"""
+In-memory flight recorder: rolling screencast frames, console messages and network events per driver
+
+Chrome only. The driver must be created with performance and browser logging
+enabled (DriverFactory does this when Config.FLIGHT_RECORDER is set); CDP
+events, including Page.screencastFrame, are drained from the performance log.
+Everything stays in bounded ring buffers until a test fails.
+"""
+import base64
+import html
+import json
+import os
+import threading
+import time
+from collections import deque
+from config.settings import Config
+from utils.screenshots import safe_name
+
+NETWORK_EVENTS = {
+    "Network.requestWillBeSent", "Network.responseReceived",
+    "Network.loadingFinished", "Network.loadingFailed"
+}
+
+REPLAY_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Replay: {title}</title></head>
+<body style="font-family:sans-serif">
+<h3>{title}</h3>
+<img id="frame" style="border:1px solid #ccc;max-width:100%"><p id="caption"></p>
+<script>
+var frames = {frames};
+var index = 0;
+function show() {{
+    if (!frames.length) return;
+    document.getElementById('frame').src = frames[index].file;
+    document.getElementById('caption').textContent = (index + 1) + '/' + frames.length + '  t=' + frames[index].t.toFixed(2) + 's';
+    index = (index + 1) % frames.length;
+}}
+show();
+setInterval(show, 250);
+</script>
+<p>Console: <a href="console.jsonl">console.jsonl</a> | Network: <a href="network.jsonl">network.jsonl</a></p>
+</body></html>
+"""
+
+class FlightRecorder:
+    """Keeps the last few seconds of browser activity in memory"""
+
+    def __init__(self, driver, seconds=None, max_bytes=None, max_events=None, interval=None):
+        self.driver = driver
+        self.seconds = seconds or Config.FLIGHT_RECORDER_SECONDS
+        self.max_bytes = max_bytes or Config.FLIGHT_RECORDER_MAX_BYTES
+        self.interval = interval or Config.FLIGHT_RECORDER_INTERVAL
+        max_events = max_events or Config.FLIGHT_RECORDER_MAX_EVENTS
+
+        self.frames = deque()
+        self.frame_bytes = 0
+        self.console = deque(maxlen=max_events)
+        self.network = deque(maxlen=max_events)
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start the screencast and the polling thread; False if the browser can't record"""
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            return False
+        try:
+            self.driver.execute_cdp_cmd("Page.startScreencast", {
+                "format": "jpeg",
+                "quality": Config.FLIGHT_RECORDER_QUALITY,
+                "maxWidth": Config.FLIGHT_RECORDER_WIDTH,
+                "maxHeight": Config.FLIGHT_RECORDER_HEIGHT,
+                "everyNthFrame": 2
+            })
+        except Exception as e:
+            print(f"Flight recorder disabled: {str(e)}")
+            return False
+
+        self._thread = threading.Thread(target=self._run, name="flight-recorder", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop polling and the screencast"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        try:
+            self.driver.execute_cdp_cmd("Page.stopScreencast", {})
+        except Exception:
+            pass
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                # The browser may be busy (alerts, navigation); try again next tick
+                pass
+
+    def poll(self):
+        """Drain browser logs into the ring buffers"""
+        with self._lock:
+            now = time.time()
+            for entry in self.driver.get_log("performance"):
+                message = json.loads(entry["message"])["message"]
+                method = message.get("method")
+                params = message.get("params", {})
+                if method == "Page.screencastFrame":
+                    self._add_frame(params, entry["timestamp"] / 1000.0)
+                elif method in NETWORK_EVENTS:
+                    self.network.append(self._compact_network_event(method, params, entry["timestamp"] / 1000.0))
+
+            for entry in self.driver.get_log("browser"):
+                self.console.append({
+                    "t": entry["timestamp"] / 1000.0,
+                    "level": entry.get("level"),
+                    "message": entry.get("message")
+                })
+
+            self._trim(now)
+
+    def _add_frame(self, params, timestamp):
+        try:
+            self.driver.execute_cdp_cmd("Page.screencastFrameAck", {"sessionId": params["sessionId"]})
+        except Exception:
+            pass
+        data = params.get("data", "")
+        self.frames.append((timestamp, data))
+        self.frame_bytes += len(data)
+
+    @staticmethod
+    def _compact_network_event(method, params, timestamp):
+        event = {"t": timestamp, "event": method.split(".", 1)[1], "id": params.get("requestId")}
+        if "request" in params:
+            event.update(url=params["request"].get("url"), method=params["request"].get("method"))
+        if "response" in params:
+            event.update(url=params["response"].get("url"), status=params["response"].get("status"))
+        if "encodedDataLength" in params:
+            event["bytes"] = params["encodedDataLength"]
+        if "errorText" in params:
+            event["error"] = params["errorText"]
+        return event
+
+    def _trim(self, now):
+        """Drop frames older than the window or beyond the memory cap"""
+        cutoff = now - self.seconds
+        while self.frames and (self.frames[0][0] < cutoff or self.frame_bytes > self.max_bytes):
+            _, data = self.frames.popleft()
+            self.frame_bytes -= len(data)
+        while self.console and self.console[0]["t"] < cutoff:
+            self.console.popleft()
+        while self.network and self.network[0]["t"] < cutoff:
+            self.network.popleft()
+
+    def dump(self, test_name):
+        """Write the buffered frames, console and network events for a failed test"""
+        try:
+            self.poll()
+        except Exception:
+            pass
+
+        directory = os.path.join(Config.FLIGHT_RECORDER_DIR, safe_name(test_name))
+        os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            frames = list(self.frames)
+            console = list(self.console)
+            network = list(self.network)
+
+        start = frames[0][0] if frames else time.time()
+        frame_index = []
+        for number, (timestamp, data) in enumerate(frames):
+            filename = f"frame_{number:04d}.jpg"
+            with open(os.path.join(directory, filename), "wb") as file:
+                file.write(base64.b64decode(data))
+            frame_index.append({"file": filename, "t": timestamp - start})
+
+        for filename, events in (("console.jsonl", console), ("network.jsonl", network)):
+            with open(os.path.join(directory, filename), "w") as file:
+                for event in events:
+                    file.write(json.dumps(event) + "\n")
+
+        with open(os.path.join(directory, "replay.html"), "w") as file:
+            file.write(REPLAY_TEMPLATE.format(title=html.escape(test_name), frames=json.dumps(frame_index)))
+        return directory
@@ -4,50 +4,52 @@ Helper utilities for test automation framework
 import os
 import time
 import json
-from datetime import datetime
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import Select
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
 from config.settings import Config
+from utils.screenshots import ScreenshotPipeline, build_screenshot_path, crop_element_images, element_geometry, pillow_available
+
+# WebDriverWait, expected_conditions, ActionChains and Select are imported
+# where they are used so importing this module stays cheap during collection.
 
 class WaitHelpers:
     """Helper class for explicit waits"""
     
     def __init__(self, driver, timeout=None):
+        from selenium.webdriver.support import expected_conditions
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        self.conditions = expected_conditions
         self.driver = driver
         self.timeout = timeout or Config.DEFAULT_TIMEOUT
         self.wait = WebDriverWait(driver, self.timeout)
     
     def wait_for_element_visible(self, locator):
         """Wait for element to be visible"""
-        return self.wait.until(EC.visibility_of_element_located(locator))
+        return self.wait.until(self.conditions.visibility_of_element_located(locator))
     
     def wait_for_element_clickable(self, locator):
         """Wait for element to be clickable"""
-        return self.wait.until(EC.element_to_be_clickable(locator))
+        return self.wait.until(self.conditions.element_to_be_clickable(locator))
     
     def wait_for_element_present(self, locator):
         """Wait for element to be present in DOM"""
-        return self.wait.until(EC.presence_of_element_located(locator))
+        return self.wait.until(self.conditions.presence_of_element_located(locator))
     
     def wait_for_text_in_element(self, locator, text):
         """Wait for specific text to appear in element"""
-        return self.wait.until(EC.text_to_be_present_in_element(locator, text))
+        return self.wait.until(self.conditions.text_to_be_present_in_element(locator, text))
     
     def wait_for_url_contains(self, url_part):
         """Wait for URL to contain specific text"""
-        return self.wait.until(EC.url_contains(url_part))
+        return self.wait.until(self.conditions.url_contains(url_part))
     
     def wait_for_alert_present(self):
         """Wait for alert to be present"""
-        return self.wait.until(EC.alert_is_present())
+        return self.wait.until(self.conditions.alert_is_present())
     
     def wait_for_element_to_disappear(self, locator):
         """Wait for element to disappear from DOM"""
-        return self.wait.until_not(EC.presence_of_element_located(locator))
+        return self.wait.until_not(self.conditions.presence_of_element_located(locator))
 
 class ScreenshotHelper:
     """Helper class for taking screenshots"""
@@ -57,46 +59,90 @@ class ScreenshotHelper:
         """Take screenshot and save to file"""
         if not Config.SCREENSHOT_ON_FAILURE:
             return None
-            
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        if filename:
-            screenshot_name = f"{filename}_{timestamp}.png"
-        else:
-            screenshot_name = f"screenshot_{timestamp}.png"
         
-        screenshot_path = os.path.join(Config.SCREENSHOT_DIR, screenshot_name)
+        screenshot_path = build_screenshot_path(filename or "screenshot", "png")
         
         try:
+            os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
             driver.save_screenshot(screenshot_path)
             return screenshot_path
         except Exception as e:
             print(f"Failed to take screenshot: {str(e)}")
             return None
     
+    @staticmethod
+    def take_screenshot_async(driver, filename=None, test_name=None, image_format=None, quality=None, clip=None):
+        """Capture screenshot now and write it in the background; returns the target path"""
+        if not Config.SCREENSHOT_ON_FAILURE:
+            return None
+        
+        try:
+            return ScreenshotPipeline.capture(
+                driver, filename or "screenshot", test_name=test_name,
+                image_format=image_format, quality=quality, clip=clip
+            )
+        except Exception as e:
+            print(f"Failed to take screenshot: {str(e)}")
+            return None
+    
     @staticmethod
     def take_element_screenshot(driver, element, filename=None):
         """Take screenshot of specific element"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        if filename:
-            screenshot_name = f"{filename}_element_{timestamp}.png"
-        else:
-            screenshot_name = f"element_screenshot_{timestamp}.png"
-        
-        screenshot_path = os.path.join(Config.SCREENSHOT_DIR, screenshot_name)
+        screenshot_path = build_screenshot_path(f"{filename or 'element_screenshot'}_element", "png")
         
         try:
+            os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
             element.screenshot(screenshot_path)
             return screenshot_path
         except Exception as e:
             print(f"Failed to take element screenshot: {str(e)}")
             return None
+    
+    @staticmethod
+    def take_element_screenshots(driver, elements, filename=None):
+        """Take screenshots of several elements from one capture; returns a path (or None) per element"""
+        if not pillow_available():
+            return [
+                ScreenshotHelper.take_element_screenshot(driver, element, f"{filename or 'element_screenshot'}_{index + 1}")
+                for index, element in enumerate(elements)
+            ]
+        
+        try:
+            geometry = element_geometry(driver, [elements])
+            crops = crop_element_images(driver, geometry["rects"][0], geometry, elements)
+        except Exception as e:
+            print(f"Failed to take element screenshots: {str(e)}")
+            return [None] * len(elements)
+        
+        paths = []
+        for index, crop in enumerate(crops):
+            if crop is None:
+                paths.append(None)
+                continue
+            screenshot_path = build_screenshot_path(f"{filename or 'element_screenshot'}_{index + 1}_element", "png")
+            try:
+                os.makedirs(os.path.dirname(screenshot_path), exist_ok=True)
+                crop.save(screenshot_path, "PNG")
+                paths.append(screenshot_path)
+            except Exception as e:
+                print(f"Failed to save element screenshot: {str(e)}")
+                paths.append(None)
+        return paths
 
 class ActionHelper:
     """Helper class for complex actions"""
     
     def __init__(self, driver):
         self.driver = driver
-        self.actions = ActionChains(driver)
+        self._actions = None
+    
+    @property
+    def actions(self):
+        """ActionChains for the driver, created on first use"""
+        if self._actions is None:
+            from selenium.webdriver.common.action_chains import ActionChains
+            self._actions = ActionChains(self.driver)
+        return self._actions
     
     def hover_over_element(self, element):
         """Hover over an element"""
@@ -156,30 +202,35 @@ class SelectHelper:
     @staticmethod
     def select_by_text(element, text):
         """Select dropdown option by visible text"""
+        from selenium.webdriver.support.ui import Select
         select = Select(element)
         select.select_by_visible_text(text)
     
     @staticmethod
     def select_by_value(element, value):
         """Select dropdown option by value"""
+        from selenium.webdriver.support.ui import Select
         select = Select(element)
         select.select_by_value(value)
     
     @staticmethod
     def select_by_index(element, index):
         """Select dropdown option by index"""
+        from selenium.webdriver.support.ui import Select
         select = Select(element)
         select.select_by_index(index)
     
     @staticmethod
     def get_selected_option_text(element):
         """Get currently selected option text"""
+        from selenium.webdriver.support.ui import Select
         select = Select(element)
         return select.first_selected_option.text
     
     @staticmethod
     def get_all_options(element):
         """Get all available options"""
+        from selenium.webdriver.support.ui import Select
         select = Select(element)
         return [option.text for option in select.options]
 
@@ -0,0 +1,220 @@
+"""
+Browserless HTTP load: the protocol-level steps behind our page flows, replayed by asyncio virtual users
+"""
+import asyncio
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+from config.settings import Config
+from utils.load_results import LoadResults
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+DOWNLOAD_LINK = re.compile(r'href="/?(download/[^"]+)"')
+
+class HttpStepError(Exception):
+    """A response that does not match what the flow expects"""
+
+class HttpClient:
+    """One virtual user's view of the site: a cookie jar on the shared connection pool"""
+
+    def __init__(self, session, base_url):
+        self.session = session
+        self.base_url = base_url.rstrip("/")
+
+    async def get(self, path, expect_text=None):
+        async with self.session.get(self.base_url + path) as response:
+            return await self._read(response, expect_text)
+
+    async def post(self, path, data, expect_text=None):
+        async with self.session.post(self.base_url + path, data=data) as response:
+            return await self._read(response, expect_text)
+
+    @staticmethod
+    async def _read(response, expect_text):
+        body = await response.read()
+        if response.status != 200:
+            raise HttpStepError(f"HTTP {response.status}")
+        if expect_text is not None and expect_text.encode("utf-8") not in body:
+            raise HttpStepError(f"Missing '{expect_text}'")
+        return body
+
+async def login_flow(client, step):
+    """FormAuthenticationPage.login -> SecureAreaPage -> logout"""
+    async with step("GET /login"):
+        await client.get("/login", expect_text='id="username"')
+    async with step("POST /authenticate"):
+        await client.post("/authenticate", {
+            "username": Config.FORM_AUTH_USERNAME,
+            "password": Config.FORM_AUTH_PASSWORD
+        }, expect_text="You logged into a secure area!")
+    async with step("GET /secure"):
+        await client.get("/secure", expect_text="Secure Area")
+    async with step("GET /logout"):
+        await client.get("/logout", expect_text="You logged out of the secure area!")
+
+async def download_flow(client, step):
+    """FileDownloadPage: list the files, then download one of them"""
+    async with step("GET /download"):
+        listing = await client.get("/download")
+    links = DOWNLOAD_LINK.findall(listing.decode("utf-8", "replace"))
+    if not links:
+        raise HttpStepError("No download links")
+    async with step("GET /download/<file>"):
+        await client.get("/" + random.choice(links))
+
+async def upload_flow(client, step):
+    """FileUploadPage: open the form and upload a small file"""
+    async with step("GET /upload"):
+        await client.get("/upload", expect_text='name="file"')
+    form = aiohttp.FormData()
+    form.add_field("file", b"load test upload\n" * 64, filename="load_test.txt", content_type="text/plain")
+    async with step("POST /upload"):
+        await client.post("/upload", form, expect_text="load_test.txt")
+
+HTTP_SCENARIOS = {
+    "login": login_flow,
+    "download": download_flow,
+    "upload": upload_flow,
+}
+
+class HttpLoadRunner:
+    """Runs an HTTP flow with asyncio virtual users, closed or open loop
+
+    Closed loop: `users` virtual users repeat the flow back to back (paced).
+    Open loop: new flows arrive at `arrival_rate` per second (Poisson), no
+    matter how slowly earlier ones complete; iteration latency is measured
+    from the scheduled arrival so queueing is not hidden (no coordinated
+    omission). Arrivals beyond `max_in_flight` are counted as dropped.
+    """
+
+    def __init__(self, scenario, name, base_url, users=10, duration=60.0, ramp_up=0.0, pacing=0.0,
+                 arrival_rate=None, max_in_flight=10000, connection_limit=0, timeout=30.0, report_interval=10.0):
+        if aiohttp is None:
+            raise RuntimeError("HTTP load needs aiohttp: pip install aiohttp")
+        self.scenario = scenario
+        self.base_url = base_url
+        self.users = users
+        self.duration = duration
+        self.ramp_up = ramp_up
+        self.pacing = pacing
+        self.arrival_rate = arrival_rate
+        self.max_in_flight = max_in_flight
+        self.connection_limit = connection_limit
+        self.timeout = timeout
+        self.report_interval = report_interval
+        self.results = LoadResults(name)
+        self.in_flight = 0
+        self.deadline = None
+
+    def run(self):
+        """Run for the configured duration and return the results"""
+        try:
+            asyncio.run(self._run())
+        except KeyboardInterrupt:
+            print("\nStopped")
+        self.results.finish()
+        return self.results
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        self.deadline = loop.time() + self.duration
+        connector = aiohttp.TCPConnector(limit=self.connection_limit, ttl_dns_cache=300)
+        progress = asyncio.create_task(self._report_progress())
+        try:
+            if self.arrival_rate:
+                await self._open_loop(connector)
+            else:
+                await asyncio.gather(*(self._virtual_user(number, connector) for number in range(self.users)))
+        finally:
+            progress.cancel()
+            await connector.close()
+
+    def _new_session(self, connector):
+        # unsafe=True keeps cookies for IP address hosts such as the local stand-in server
+        return aiohttp.ClientSession(
+            connector=connector, connector_owner=False,
+            cookie_jar=aiohttp.CookieJar(unsafe=True),
+            timeout=aiohttp.ClientTimeout(total=self.timeout)
+        )
+
+    @asynccontextmanager
+    async def _step(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.results.record(name, time.perf_counter() - start, self._error_name(e))
+            raise
+        self.results.record(name, time.perf_counter() - start)
+
+    @staticmethod
+    def _error_name(error):
+        return str(error) if isinstance(error, HttpStepError) else type(error).__name__
+
+    async def _iteration(self, session, started):
+        try:
+            await self.scenario(HttpClient(session, self.base_url), self._step)
+            self.results.record("iteration", time.perf_counter() - started)
+            return True
+        except Exception as e:
+            self.results.record("iteration", time.perf_counter() - started, self._error_name(e))
+            return False
+
+    async def _virtual_user(self, number, connector):
+        loop = asyncio.get_running_loop()
+        await asyncio.sleep(number * self.ramp_up / self.users)
+        async with self._new_session(connector) as session:
+            while loop.time() < self.deadline:
+                started = time.perf_counter()
+                if not await self._iteration(session, started):
+                    session.cookie_jar.clear()
+                await asyncio.sleep(max(0.0, self.pacing - (time.perf_counter() - started)))
+
+    async def _open_loop(self, connector):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        scheduled = time.perf_counter()
+        tasks = set()
+        while loop.time() < self.deadline:
+            # The arrival rate ramps up linearly over the ramp-up period
+            elapsed = loop.time() - start
+            rate = self.arrival_rate * min(1.0, elapsed / self.ramp_up) if self.ramp_up else self.arrival_rate
+            # Start at one arrival per second at least, or the first gap could outlast the ramp-up
+            scheduled += random.expovariate(max(rate, min(self.arrival_rate, 1.0)))
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            if self.in_flight >= self.max_in_flight:
+                self.results.record("iteration", 0, "Dropped")
+                continue
+            task = asyncio.create_task(self._arrival(connector, scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.wait(tasks, timeout=self.timeout)
+
+    async def _arrival(self, connector, scheduled):
+        self.in_flight += 1
+        try:
+            async with self._new_session(connector) as session:
+                await self._iteration(session, scheduled)
+        finally:
+            self.in_flight -= 1
+
+    async def _report_progress(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.report_interval)
+            iterations = self.results.steps.get("iteration")
+            errors = sum(self.results.errors.get("iteration", {}).values())
+            print(
+                f"[{max(0, self.deadline - loop.time()):6.0f}s left] "
+                f"iterations: {iterations.count if iterations else 0}, failed: {errors}, in flight: {self.in_flight}"
+            )
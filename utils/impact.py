@@ -0,0 +1,236 @@
+"""
+Test impact analysis: record which page objects each test touches and select tests affected by a git diff
+"""
+import ast
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+from datetime import datetime
+import pytest
+from config.settings import Config
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def relative_path(path):
+    """Get a project-relative path with forward slashes"""
+    return os.path.relpath(os.path.abspath(path), PROJECT_ROOT).replace(os.sep, "/")
+
+def test_symbol(nodeid):
+    """Convert a pytest node id into the symbol of its test function"""
+    nodeid = nodeid.split("[", 1)[0]
+    path, _, rest = nodeid.partition("::")
+    return f"{path}::{rest.replace('::', '.')}" if rest else path
+
+def is_affected_by(symbol, changed_symbol):
+    """Check if a recorded symbol lies inside a changed symbol"""
+    if symbol == changed_symbol:
+        return True
+    return symbol.startswith(changed_symbol + "::") or symbol.startswith(changed_symbol + ".")
+
+class ImpactTracer:
+    """Profiles calls into page objects and records classes, methods and locators used"""
+
+    def __init__(self, pages_dir="pages"):
+        self.pages_dir = os.path.join(PROJECT_ROOT, pages_dir) + os.sep
+        self.symbols = set()
+        self._class_files = {}
+        self._class_locators = {}
+
+    def start(self):
+        """Start recording"""
+        self.symbols = set()
+        sys.setprofile(self._profile)
+
+    def stop(self):
+        """Stop recording and return the recorded symbols"""
+        sys.setprofile(None)
+        return sorted(self.symbols)
+
+    def _profile(self, frame, event, arg):
+        if event != "call" or not frame.f_code.co_filename.startswith(self.pages_dir):
+            return
+
+        page = frame.f_locals.get("self")
+        if page is None:
+            return
+
+        page_class = type(page)
+        method_name = frame.f_code.co_name
+        owner = self._get_owner(page_class, frame.f_code)
+
+        self.symbols.add(f"{self._get_class_file(page_class)}::{page_class.__name__}")
+        self.symbols.add(f"{self._get_class_file(owner)}::{owner.__name__}.{method_name}")
+
+        for name, value in frame.f_locals.items():
+            if name.endswith("locator") and isinstance(value, tuple):
+                locator_name = self._get_locators(page_class).get(value)
+                if locator_name:
+                    self.symbols.add(f"{self._get_class_file(page_class)}::{page_class.__name__}.{locator_name}")
+
+    def _get_owner(self, page_class, code):
+        """Find the class in the MRO that defines the running method"""
+        for klass in page_class.__mro__:
+            function = klass.__dict__.get(code.co_name)
+            if getattr(function, "__code__", None) is code:
+                return klass
+        return page_class
+
+    def _get_class_file(self, klass):
+        if klass not in self._class_files:
+            module = sys.modules.get(klass.__module__)
+            self._class_files[klass] = relative_path(getattr(module, "__file__", klass.__module__))
+        return self._class_files[klass]
+
+    def _get_locators(self, klass):
+        """Map locator tuples to the class attribute names holding them"""
+        if klass not in self._class_locators:
+            locators = {}
+            for klass_in_mro in reversed(klass.__mro__):
+                for name, value in vars(klass_in_mro).items():
+                    if name.isupper() and isinstance(value, tuple) and len(value) == 2:
+                        locators[value] = name
+            self._class_locators[klass] = locators
+        return self._class_locators[klass]
+
+class ImpactIndex:
+    """Dependency index mapping test node ids to the symbols they touched"""
+
+    def __init__(self, path=None):
+        self.path = path or Config.IMPACT_INDEX_FILE
+        self.tests = {}
+
+    def load(self):
+        """Load the index from disk if it exists"""
+        if os.path.exists(self.path):
+            with open(self.path, "r") as file:
+                self.tests = json.load(file).get("tests", {})
+        return self
+
+    def update(self, tests):
+        """Add or replace entries for the given tests"""
+        self.tests.update(tests)
+
+    def save(self):
+        """Write the index to disk"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "git_sha": get_git_sha(),
+            "tests": self.tests
+        }
+        with open(self.path, "w") as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+
+    def fragment_path(self, worker_id):
+        """Get the path an xdist worker writes its part of the index to"""
+        base, ext = os.path.splitext(self.path)
+        return f"{base}.{worker_id}{ext}"
+
+    def merge_fragments(self):
+        """Fold worker fragments into the index and remove them"""
+        base, ext = os.path.splitext(self.path)
+        for fragment in glob.glob(f"{base}.*{ext}"):
+            with open(fragment, "r") as file:
+                self.update(json.load(file))
+            os.remove(fragment)
+
+class ImpactSelector:
+    """Selects the tests affected by the changes since a git revision"""
+
+    HUNK_PATTERN = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+    def __init__(self, index, since):
+        self.index = index
+        self.since = since
+
+    def get_changed_lines(self):
+        """Get changed line numbers per file, relative to the working tree"""
+        try:
+            output = subprocess.run(
+                ["git", "diff", "-U0", "--no-color", self.since, "--"],
+                cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+            ).stdout
+        except subprocess.CalledProcessError as e:
+            raise pytest.UsageError(f"Cannot select tests changed since '{self.since}': {e.stderr.strip()}")
+
+        changed = {}
+        current = None
+        for line in output.splitlines():
+            if line.startswith("--- a/"):
+                current = line[6:]
+            elif line.startswith("+++ "):
+                current = line[6:] if line.startswith("+++ b/") else current
+                changed.setdefault(current, set())
+            elif current is not None:
+                match = self.HUNK_PATTERN.match(line)
+                if match:
+                    start = int(match.group(1))
+                    count = int(match.group(2)) if match.group(2) is not None else 1
+                    changed[current].update(range(start, start + max(count, 1)))
+
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.split()
+        for path in untracked:
+            changed.setdefault(path, set())
+        return changed
+
+    @staticmethod
+    def get_changed_symbols(path, lines):
+        """Map changed lines of a Python file to class, method and attribute symbols"""
+        full_path = os.path.join(PROJECT_ROOT, path)
+        if not lines or not os.path.exists(full_path):
+            # Deleted or new file: treat the whole module as changed
+            return {path}
+
+        with open(full_path, "r") as file:
+            tree = ast.parse(file.read())
+
+        symbols = set()
+        for line in lines:
+            symbols.add(ImpactSelector._get_symbol_at_line(tree, path, line))
+        return symbols
+
+    @staticmethod
+    def _get_symbol_at_line(tree, path, line):
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef) or not node.lineno <= line <= node.end_lineno:
+                continue
+            for member in node.body:
+                if not member.lineno <= line <= member.end_lineno:
+                    continue
+                if isinstance(member, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    return f"{path}::{node.name}.{member.name}"
+                if isinstance(member, ast.Assign) and isinstance(member.targets[0], ast.Name):
+                    return f"{path}::{node.name}.{member.targets[0].id}"
+            return f"{path}::{node.name}"
+        return path
+
+    def select(self):
+        """Get the affected node ids, or None when the full suite has to run"""
+        changed_symbols = set()
+        for path, lines in self.get_changed_lines().items():
+            if any(path == prefix or path.startswith(prefix) for prefix in Config.IMPACT_FULL_RUN_PATHS):
+                return None
+            if path.endswith(".py") and path.startswith(("pages/", "tests/")):
+                changed_symbols.update(self.get_changed_symbols(path, lines))
+
+        affected = set()
+        for nodeid, symbols in self.index.tests.items():
+            if any(is_affected_by(symbol, changed) for symbol in symbols for changed in changed_symbols):
+                affected.add(nodeid)
+        return affected
+
+def get_git_sha():
+    """Get the current git commit SHA, if available"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,65 @@
+"""
+Import-time profiling of test collection (python -X importtime, summarized)
+"""
+import re
+import subprocess
+import sys
+import time
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+class ImportTimeProfiler:
+    """Runs pytest --collect-only under -X importtime and summarizes where the time goes"""
+
+    def __init__(self, pytest_args, top=15):
+        self.pytest_args = [arg for arg in pytest_args if arg not in ("-v", "-s")]
+        self.top = top
+
+    def run(self):
+        """Collect tests in a fresh interpreter and return the parsed profile"""
+        command = [sys.executable, "-X", "importtime", "-m", "pytest", "--collect-only", "-q"] + self.pytest_args
+        started = time.perf_counter()
+        result = subprocess.run(command, capture_output=True, text=True)
+        wall_time = time.perf_counter() - started
+
+        imports = []
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME_LINE.match(line)
+            if match:
+                self_us, cumulative_us, indent, module = match.groups()
+                imports.append({
+                    "module": module,
+                    "self": int(self_us) / 1e6,
+                    "cumulative": int(cumulative_us) / 1e6,
+                    "depth": len(indent) // 2
+                })
+        return {"wall_time": wall_time, "imports": imports, "exit_code": result.returncode, "stdout": result.stdout}
+
+    def summarize(self, profile):
+        """Build a text report: total time, heaviest packages and heaviest single modules"""
+        imports = profile["imports"]
+        total_import = sum(entry["self"] for entry in imports)
+
+        by_package = {}
+        for entry in imports:
+            package = entry["module"].split(".")[0]
+            by_package[package] = by_package.get(package, 0.0) + entry["self"]
+
+        lines = [
+            f"Collection wall time: {profile['wall_time'] * 1000:.0f} ms "
+            f"(imports: {total_import * 1000:.0f} ms, {len(imports)} modules)",
+            "",
+            f"Top {self.top} packages by import time:"
+        ]
+        for package, seconds in sorted(by_package.items(), key=lambda item: -item[1])[:self.top]:
+            lines.append(f"  {seconds * 1000:8.1f} ms  {package}")
+
+        lines.extend(["", f"Top {self.top} first-level imports by cumulative time:"])
+        top_level = [entry for entry in imports if entry["depth"] == 0]
+        for entry in sorted(top_level, key=lambda entry: -entry["cumulative"])[:self.top]:
+            lines.append(f"  {entry['cumulative'] * 1000:8.1f} ms  {entry['module']}")
+
+        collected = [line for line in profile["stdout"].splitlines() if line.strip()]
+        if collected:
+            lines.extend(["", collected[-1]])
+        return "\n".join(lines)
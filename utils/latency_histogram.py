@@ -0,0 +1,99 @@
+"""
+HDR-style latency histogram: fixed relative precision over a wide range, cheap to record and merge
+"""
+
+class LatencyHistogram:
+    """Log-linear histogram of latencies, recorded in microseconds
+
+    Like HdrHistogram, each power-of-two range is split into SUB_BUCKETS
+    linear buckets, so any recorded value is off by less than 1/SUB_BUCKETS
+    (under 1%) no matter whether it is 200us or 2 minutes. Memory only grows
+    with the number of distinct buckets hit.
+    """
+
+    SUB_BUCKET_BITS = 7
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    PERCENTILES = (50, 90, 95, 99, 99.9)
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def _bucket(cls, value):
+        shift = max(0, value.bit_length() - cls.SUB_BUCKET_BITS - 1)
+        return shift, value >> shift
+
+    @staticmethod
+    def _bucket_value(shift, sub_bucket):
+        """Midpoint of a bucket's range"""
+        return ((sub_bucket << shift) + ((sub_bucket + 1) << shift) - 1) // 2
+
+    def record(self, seconds, count=1):
+        """Record a latency given in seconds"""
+        value = max(0, int(seconds * 1e6))
+        bucket = self._bucket(value)
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """Add the values of another histogram"""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    def percentile(self, percent):
+        """Latency in seconds at or below which percent of the values fall"""
+        if not self.count:
+            return None
+        threshold = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for shift, sub_bucket in sorted(self.counts, key=lambda bucket: bucket[1] << bucket[0]):
+            seen += self.counts[(shift, sub_bucket)]
+            if seen >= threshold:
+                value = min(self._bucket_value(shift, sub_bucket), self.max)
+                return max(value, self.min) / 1e6
+        return self.max / 1e6
+
+    def mean(self):
+        return self.total / self.count / 1e6 if self.count else None
+
+    def summary(self):
+        """Count, min, mean, max and the standard percentiles, in seconds"""
+        summary = {
+            "count": self.count,
+            "min": self.min / 1e6 if self.count else None,
+            "mean": self.mean(),
+            "max": self.max / 1e6 if self.count else None
+        }
+        for percent in self.PERCENTILES:
+            summary[f"p{percent:g}"] = self.percentile(percent)
+        return summary
+
+    def to_dict(self):
+        """Serializable form that keeps every bucket, so histograms can be merged later"""
+        return {
+            "buckets": [[shift, sub_bucket, count] for (shift, sub_bucket), count in sorted(self.counts.items())],
+            "count": self.count, "total": self.total, "min": self.min, "max": self.max
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.counts = {(shift, sub_bucket): count for shift, sub_bucket, count in data["buckets"]}
+        histogram.count = data["count"]
+        histogram.total = data["total"]
+        histogram.min = data["min"]
+        histogram.max = data["max"]
+        return histogram
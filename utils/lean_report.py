@@ -0,0 +1,232 @@
+"""
+Lean HTML report built from the JSONL result stream: small index, paginated data, external artifacts
+"""
+import base64
+import hashlib
+import html
+import json
+import mimetypes
+import os
+from datetime import datetime
+from config.settings import Config
+from utils.result_stream import read_results
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+OUTCOME_ORDER = {"error": 0, "failed": 1, "rerun": 2, "skipped": 3, "passed": 4}
+
+# Data pages are JS files rather than JSON so the report also works when opened from file://
+INDEX_TEMPLATE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Test Report</title>
+<style>
+body {{ font-family: sans-serif; margin: 20px; }}
+table {{ border-collapse: collapse; width: 100%; }}
+td, th {{ border: 1px solid #ddd; padding: 4px 8px; text-align: left; vertical-align: top; }}
+.passed {{ color: #2e7d32; }} .failed, .error {{ color: #c62828; }} .skipped, .rerun {{ color: #f9a825; }}
+pre {{ white-space: pre-wrap; max-height: 300px; overflow: auto; margin: 4px 0; }}
+img {{ border: 1px solid #ccc; margin: 2px; }}
+</style></head>
+<body>
+<h1>Test Report</h1>
+<p>Generated: {generated}</p>
+<p>{summary}</p>
+<p>Page <select id="page"></select> <span id="range"></span></p>
+<table><thead><tr><th>Outcome</th><th>Test</th><th>Worker</th><th>Markers</th><th>Duration (s)</th><th>Details</th></tr></thead>
+<tbody id="rows"></tbody></table>
+<script>
+var pageCount = {page_count};
+var select = document.getElementById('page');
+for (var number = 1; number <= pageCount; number++) {{
+    var option = document.createElement('option');
+    option.value = number;
+    option.textContent = number + ' / ' + pageCount;
+    select.appendChild(option);
+}}
+select.onchange = function () {{ load(parseInt(select.value, 10)); }};
+
+function load(number) {{
+    var script = document.createElement('script');
+    script.src = 'data/page-' + ('000' + number).slice(-4) + '.js';
+    document.body.appendChild(script);
+}}
+
+function cell(row, content) {{
+    var td = document.createElement('td');
+    if (typeof content === 'string') td.textContent = content; else if (content) td.appendChild(content);
+    row.appendChild(td);
+    return td;
+}}
+
+function details(test) {{
+    var box = document.createElement('div');
+    if (test.message) {{
+        var pre = document.createElement('pre');
+        pre.textContent = test.message;
+        box.appendChild(pre);
+    }}
+    test.artifacts.forEach(function (artifact) {{
+        var link = document.createElement('a');
+        link.href = artifact.path;
+        link.target = '_blank';
+        if (artifact.thumbnail) {{
+            var img = document.createElement('img');
+            img.loading = 'lazy';
+            img.src = artifact.thumbnail;
+            img.width = {thumbnail_width};
+            link.appendChild(img);
+        }} else {{
+            link.textContent = artifact.path.split('/').pop();
+        }}
+        box.appendChild(link);
+        box.appendChild(document.createTextNode(' '));
+    }});
+    return box;
+}}
+
+window.reportPage = function (page) {{
+    var rows = document.getElementById('rows');
+    rows.innerHTML = '';
+    document.getElementById('range').textContent = 'tests ' + (page.offset + 1) + '-' + (page.offset + page.tests.length);
+    page.tests.forEach(function (test) {{
+        var row = document.createElement('tr');
+        cell(row, test.outcome.toUpperCase()).className = test.outcome;
+        cell(row, test.nodeid);
+        cell(row, test.worker);
+        cell(row, test.markers.join(', '));
+        cell(row, test.duration.toFixed(2));
+        cell(row, details(test));
+        rows.appendChild(row);
+    }});
+}};
+
+if (pageCount) load(1);
+</script></body></html>
+"""
+
+class LeanReportBuilder:
+    """Builds the lean report from the streamed results (failures first, paginated)"""
+
+    def __init__(self, output_dir=None, stream_dir=None, page_size=None):
+        self.output_dir = output_dir or Config.LEAN_REPORT_DIR
+        self.stream_dir = stream_dir or Config.RESULTS_STREAM_DIR
+        self.page_size = page_size or Config.LEAN_REPORT_PAGE_SIZE
+
+    def collect(self):
+        """Fold the per-phase records into one entry per test"""
+        tests = {}
+        for record in read_results(self.stream_dir):
+            test = tests.setdefault(record["nodeid"], {
+                "nodeid": record["nodeid"], "outcome": "passed", "duration": 0.0,
+                "worker": record["worker"], "markers": record["markers"], "artifacts": [], "message": ""
+            })
+            test["duration"] += record["duration"]
+            test["worker"] = record["worker"]
+            for artifact in record["artifacts"]:
+                if artifact not in test["artifacts"]:
+                    test["artifacts"].append(artifact)
+
+            if record["when"] == "setup":
+                # A rerun starts over from setup
+                test["outcome"] = "passed"
+                test["message"] = ""
+            if record["outcome"] == "failed":
+                test["outcome"] = "failed" if record["when"] == "call" else "error"
+                test["message"] = record.get("message", "")
+            elif record["outcome"] == "skipped" and test["outcome"] == "passed":
+                test["outcome"] = "skipped"
+            elif record["outcome"] == "rerun":
+                test["outcome"] = "rerun"
+        return sorted(tests.values(), key=lambda test: OUTCOME_ORDER.get(test["outcome"], 5))
+
+    def build(self):
+        """Write index.html and data/page-NNNN.js; returns the totals"""
+        tests = self.collect()
+        data_dir = os.path.join(self.output_dir, "data")
+        os.makedirs(data_dir, exist_ok=True)
+        for filename in os.listdir(data_dir):
+            os.remove(os.path.join(data_dir, filename))
+
+        totals = {}
+        for test in tests:
+            totals[test["outcome"]] = totals.get(test["outcome"], 0) + 1
+
+        page_count = 0
+        for offset in range(0, len(tests), self.page_size):
+            page_count += 1
+            page = {"offset": offset, "tests": [self._render(test) for test in tests[offset:offset + self.page_size]]}
+            with open(os.path.join(data_dir, f"page-{page_count:04d}.js"), "w", encoding="utf-8") as file:
+                file.write(f"window.reportPage({json.dumps(page)});\n")
+
+        summary = f"{len(tests)} tests: " + ", ".join(
+            f"{count} {outcome}" for outcome, count in sorted(totals.items(), key=lambda item: OUTCOME_ORDER.get(item[0], 5))
+        )
+        with open(os.path.join(self.output_dir, "index.html"), "w", encoding="utf-8") as file:
+            file.write(INDEX_TEMPLATE.format(
+                generated=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                summary=html.escape(summary),
+                page_count=page_count,
+                thumbnail_width=Config.LEAN_REPORT_THUMBNAIL_WIDTH
+            ))
+        return dict(totals, tests=len(tests))
+
+    def _render(self, test):
+        artifacts = []
+        for path in test["artifacts"]:
+            artifact = {"path": os.path.relpath(path, self.output_dir).replace(os.sep, "/")}
+            if path.lower().endswith(IMAGE_EXTENSIONS):
+                artifact["thumbnail"] = self._thumbnail(path) or artifact["path"]
+            artifacts.append(artifact)
+        return dict(test, artifacts=artifacts, duration=round(test["duration"], 3))
+
+    def _thumbnail(self, path):
+        """Write a small JPEG preview of an image artifact; None without Pillow"""
+        if Image is None or not os.path.exists(path):
+            return None
+        name = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16] + ".jpg"
+        thumbnail_path = os.path.join(self.output_dir, "thumbs", name)
+        if not os.path.exists(thumbnail_path):
+            os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+            try:
+                with Image.open(path) as image:
+                    width = Config.LEAN_REPORT_THUMBNAIL_WIDTH
+                    image.thumbnail((width, width * 4))
+                    image.convert("RGB").save(thumbnail_path, "JPEG", quality=70)
+            except Exception as e:
+                print(f"Failed to create thumbnail for {path}: {str(e)}")
+                return None
+        return f"thumbs/{name}"
+
+    def export_test(self, nodeid, output_file):
+        """Write one test's result with its images inlined, for sharing a single failure"""
+        test = next((test for test in self.collect() if test["nodeid"] == nodeid), None)
+        if test is None:
+            raise ValueError(f"No streamed results for {nodeid}")
+
+        parts = [
+            f"<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>{html.escape(nodeid)}</title></head>",
+            "<body style=\"font-family:sans-serif\">",
+            f"<h2>{html.escape(test['outcome'].upper())}: {html.escape(nodeid)}</h2>",
+            f"<p>Worker: {html.escape(test['worker'])} | Markers: {html.escape(', '.join(test['markers']))}"
+            f" | Duration: {test['duration']:.2f}s</p>",
+            f"<pre style=\"white-space:pre-wrap\">{html.escape(test['message'])}</pre>"
+        ]
+        for path in test["artifacts"]:
+            if path.lower().endswith(IMAGE_EXTENSIONS) and os.path.exists(path):
+                mime_type = mimetypes.guess_type(path)[0] or "image/png"
+                with open(path, "rb") as file:
+                    encoded = base64.b64encode(file.read()).decode("ascii")
+                parts.append(f"<p>{html.escape(os.path.basename(path))}<br>"
+                             f"<img style=\"max-width:100%\" src=\"data:{mime_type};base64,{encoded}\"></p>")
+            else:
+                parts.append(f"<p>Artifact: {html.escape(path)}</p>")
+        parts.append("</body></html>")
+
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        with open(output_file, "w", encoding="utf-8") as file:
+            file.write("\n".join(parts))
+        return output_file
@@ -0,0 +1,97 @@
+"""
+Per-step latency and error bookkeeping shared by the load modes
+"""
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from config.settings import Config
+from utils.latency_histogram import LatencyHistogram
+
+DURATION_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$")
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}
+
+def parse_duration(value):
+    """Parse '300ms', '30s', '5m', '1h' or a plain number of seconds"""
+    match = DURATION_PATTERN.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+class LoadResults:
+    """Latency histograms and error counts per step, safe to record from many threads"""
+
+    def __init__(self, name):
+        self.name = name
+        self.steps = {}
+        self.errors = {}
+        self.started = time.time()
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def record(self, step, seconds, error=None):
+        """Record one execution of a step; failed executions count as errors, not latencies"""
+        with self._lock:
+            histogram = self.steps.setdefault(step, LatencyHistogram())
+            step_errors = self.errors.setdefault(step, {})
+            if error is None:
+                histogram.record(seconds)
+            else:
+                step_errors[error] = step_errors.get(error, 0) + 1
+
+    def merge(self, other):
+        with self._lock:
+            for step, histogram in other.steps.items():
+                self.steps.setdefault(step, LatencyHistogram()).merge(histogram)
+            for step, errors in other.errors.items():
+                step_errors = self.errors.setdefault(step, {})
+                for error, count in errors.items():
+                    step_errors[error] = step_errors.get(error, 0) + count
+        return self
+
+    def finish(self):
+        self.finished = time.time()
+
+    def summary(self):
+        """Per-step counts, throughput, error rate and latency percentiles"""
+        elapsed = (self.finished or time.time()) - self.started
+        steps = {}
+        for step, histogram in self.steps.items():
+            errors = sum(self.errors.get(step, {}).values())
+            total = histogram.count + errors
+            steps[step] = dict(
+                histogram.summary(),
+                errors=errors,
+                error_rate=errors / total if total else 0.0,
+                throughput=histogram.count / elapsed if elapsed else 0.0,
+                error_types=self.errors.get(step, {})
+            )
+        return {"name": self.name, "elapsed": elapsed, "steps": steps}
+
+    def format_table(self):
+        """Plain text table of the summary"""
+        summary = self.summary()
+        lines = [
+            f"{'step':<24} {'ok':>7} {'err%':>6} {'rps':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"
+        ]
+        for step, stats in summary["steps"].items():
+            def ms(value):
+                return f"{value * 1000:7.0f}ms" if value is not None else f"{'-':>9}"
+            lines.append(
+                f"{step:<24} {stats['count']:>7} {stats['error_rate'] * 100:>5.1f}% {stats['throughput']:>7.1f}"
+                f"{ms(stats['p50'])}{ms(stats['p95'])}{ms(stats['p99'])}{ms(stats['max'])}"
+            )
+        return "\n".join(lines)
+
+    def save(self, directory=None, extra=None):
+        """Write the summary and the raw histograms to a JSON report; returns its path"""
+        directory = directory or Config.LOAD_REPORT_DIR
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        report = dict(self.summary(), **(extra or {}))
+        report["histograms"] = {step: histogram.to_dict() for step, histogram in self.steps.items()}
+        with open(path, "w") as file:
+            json.dump(report, file, indent=1)
+        return path
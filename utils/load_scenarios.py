@@ -0,0 +1,37 @@
+"""
+Load scenarios: page object flows timed step by step
+"""
+from pages.authentication_pages import FormAuthenticationPage, SecureAreaPage
+from pages.dynamic_content_pages import DynamicLoadingExample1Page
+
+def login_scenario(driver, step):
+    """Open the login page, log in, land on the secure area and log out"""
+    login_page = FormAuthenticationPage(driver)
+    with step("open_login"):
+        login_page.navigate_to_form_auth()
+    
+    with step("login"):
+        login_page.login()
+        if not login_page.is_login_successful():
+            raise AssertionError("Login failed")
+    
+    secure_page = SecureAreaPage(driver)
+    with step("logout"):
+        secure_page.click_logout()
+        if "logged out" not in login_page.get_flash_message():
+            raise AssertionError("Logout failed")
+
+def dynamic_loading_scenario(driver, step):
+    """Open dynamic loading example 1 and wait for the delayed content"""
+    loading_page = DynamicLoadingExample1Page(driver)
+    with step("open_page"):
+        loading_page.navigate_to_example_1()
+    
+    with step("load_content"):
+        loading_page.click_start()
+        loading_page.wait_for_loading_to_complete(timeout=15)
+
+SCENARIOS = {
+    "login": login_scenario,
+    "dynamic_loading": dynamic_loading_scenario,
+}
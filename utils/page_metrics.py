@@ -0,0 +1,158 @@
+"""
+Browser-side page performance metrics: Navigation, Paint and Resource Timing plus long tasks
+"""
+
+# Everything is read in one round trip. Long tasks are only reported to a
+# PerformanceObserver, so the first call installs one (buffered where the
+# browser keeps long task entries) and later calls read what it has seen.
+PERFORMANCE_METRICS_SCRIPT = """
+if (!window.__pageMetricsLongTasks) {
+    window.__pageMetricsLongTasks = [];
+    try {
+        new PerformanceObserver(function (list) {
+            list.getEntries().forEach(function (entry) {
+                window.__pageMetricsLongTasks.push({start: entry.startTime, duration: entry.duration});
+            });
+        }).observe({type: 'longtask', buffered: true});
+    } catch (e) {}
+}
+var nav = performance.getEntriesByType('navigation')[0];
+var paints = {};
+performance.getEntriesByType('paint').forEach(function (entry) { paints[entry.name] = entry.startTime; });
+var resources = performance.getEntriesByType('resource');
+var slowest = resources.slice().sort(function (a, b) { return b.duration - a.duration; }).slice(0, 5);
+var longTasks = window.__pageMetricsLongTasks;
+return {
+    url: location.href,
+    navigation: nav ? {
+        type: nav.type,
+        ttfb: nav.responseStart - nav.startTime,
+        response_end: nav.responseEnd - nav.startTime,
+        dom_interactive: nav.domInteractive - nav.startTime,
+        dom_content_loaded: nav.domContentLoadedEventEnd - nav.startTime,
+        load_event: nav.loadEventEnd - nav.startTime,
+        transfer_size: nav.transferSize
+    } : null,
+    first_paint: paints['first-paint'] === undefined ? null : paints['first-paint'],
+    first_contentful_paint: paints['first-contentful-paint'] === undefined ? null : paints['first-contentful-paint'],
+    resources: {
+        count: resources.length,
+        transfer_size: resources.reduce(function (sum, entry) { return sum + (entry.transferSize || 0); }, 0),
+        slowest: slowest.map(function (entry) {
+            return {name: entry.name, type: entry.initiatorType, duration: entry.duration, transfer_size: entry.transferSize};
+        })
+    },
+    js_heap: performance.memory ? performance.memory.usedJSHeapSize : null,
+    long_tasks: {
+        count: longTasks.length,
+        total: longTasks.reduce(function (sum, task) { return sum + task.duration; }, 0),
+        longest: longTasks.reduce(function (max, task) { return Math.max(max, task.duration); }, 0)
+    }
+};
+"""
+
+def collect_page_metrics(driver):
+    """Read the metrics of the current page (times in ms from navigation start, sizes in bytes)"""
+    metrics = driver.execute_script(PERFORMANCE_METRICS_SCRIPT)
+    flat = dict(metrics.get("navigation") or {})
+    flat.update(
+        first_paint=metrics.get("first_paint"),
+        first_contentful_paint=metrics.get("first_contentful_paint"),
+        resource_count=metrics["resources"]["count"],
+        resource_transfer_size=metrics["resources"]["transfer_size"],
+        long_task_count=metrics["long_tasks"]["count"],
+        long_task_total=metrics["long_tasks"]["total"],
+        longest_long_task=metrics["long_tasks"]["longest"],
+        js_heap=metrics.get("js_heap")
+    )
+    return {"url": metrics["url"], "metrics": flat, "slowest_resources": metrics["resources"]["slowest"]}
+
+def visit_violations(visit, budgets):
+    """List the metrics of one visit that exceed their budget"""
+    violations = []
+    for metric, limit in budgets.items():
+        value = visit["metrics"].get(metric)
+        if value is not None and value > limit:
+            shown = f"{value:.0f}" if abs(value) >= 10 else f"{value:.3g}"
+            violations.append(f"{visit['page'] or '(unattributed)'} {visit['url']}: {metric} = {shown} > {limit}")
+    return violations
+
+class PageMetrics:
+    """Metrics of every page a test visited, with budget assertions"""
+
+    def __init__(self):
+        self.visits = []
+
+    def add(self, page_name, visit):
+        self.visits.append(dict(visit, page=page_name))
+
+    def update(self, url, metrics):
+        """Add metrics read later to the latest visit of the URL and return its page object class
+
+        A document no visit loaded (a form submission or link followed inside a
+        page object) is recorded under its URL without a page object class, so
+        it is not taken for a visit of the page object that was left.
+        """
+        for visit in reversed(self.visits):
+            if visit["url"] == url:
+                visit["metrics"].update(metrics)
+                return visit["page"]
+        self.visits.append({"url": url, "metrics": dict(metrics), "page": None})
+        return None
+
+    def latest(self, page_name=None):
+        """Get the metrics of the most recent visit (to a page object class, if given)"""
+        visits = [visit for visit in self.visits if page_name is None or visit["page"] == page_name]
+        return visits[-1]["metrics"] if visits else None
+
+    def get_violations(self, url_contains=None, page=None, **budgets):
+        """List the visits exceeding any budget, e.g. first_contentful_paint=1500"""
+        violations = []
+        for visit in self.visits:
+            if url_contains and url_contains not in visit["url"]:
+                continue
+            if page and visit["page"] != page:
+                continue
+            violations.extend(visit_violations(visit, budgets))
+        return violations
+
+    def assert_budget(self, url_contains=None, page=None, **budgets):
+        """Fail if any matching visit exceeds a budget"""
+        assert self.visits, "No page metrics were collected"
+        violations = self.get_violations(url_contains, page, **budgets)
+        assert not violations, "Performance budget exceeded:\n" + "\n".join(violations)
+
+class PageMetricsRecorder:
+    """Collects metrics after each go_to_url for drivers with an active page_metrics fixture"""
+
+    _active = {}
+
+    @staticmethod
+    def start(driver):
+        metrics = PageMetrics()
+        PageMetricsRecorder._active[driver.session_id] = metrics
+        return metrics
+
+    @staticmethod
+    def get(driver):
+        return PageMetricsRecorder._active.get(getattr(driver, "session_id", None))
+
+    @staticmethod
+    def stop(driver):
+        return PageMetricsRecorder._active.pop(driver.session_id, None)
+
+    @staticmethod
+    def is_active(driver):
+        return getattr(driver, "session_id", None) in PageMetricsRecorder._active
+
+    @staticmethod
+    def record(driver, page_name, visit):
+        metrics = PageMetricsRecorder._active.get(getattr(driver, "session_id", None))
+        if metrics is not None:
+            metrics.add(page_name, visit)
+
+    @staticmethod
+    def update(driver, url, metrics):
+        metrics_of_driver = PageMetricsRecorder._active.get(getattr(driver, "session_id", None))
+        if metrics_of_driver is not None:
+            metrics_of_driver.update(url, metrics)
@@ -0,0 +1,122 @@
+"""
+Page state tracking and URL-locality ordering for page reuse
+"""
+import hashlib
+import inspect
+
+# Captures the parts of the page a test can observe or change: URL, DOM size,
+# form control values, scroll position and focus.
+FINGERPRINT_SCRIPT = """
+var controls = document.querySelectorAll('input, select, textarea');
+var values = [];
+for (var i = 0; i < controls.length; i++) {
+    var el = controls[i];
+    values.push(el.type === 'checkbox' || el.type === 'radio' ? el.checked : el.value);
+}
+return [
+    location.href,
+    document.readyState,
+    document.getElementsByTagName('*').length,
+    values.join('|'),
+    window.scrollX + ',' + window.scrollY,
+    document.activeElement ? document.activeElement.tagName : ''
+].join('#');
+"""
+
+class PageStateTracker:
+    """Remembers which URL each driver has cleanly loaded and whether it was touched since"""
+
+    _states = {}
+    _reused = {}
+
+    @staticmethod
+    def fingerprint(driver):
+        """Get a hash of the current page state"""
+        try:
+            state = driver.execute_script(FINGERPRINT_SCRIPT)
+        except Exception:
+            return None
+        return hashlib.sha1(str(state).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def record_clean_load(driver, url):
+        """Record that the driver has just loaded a fresh copy of url"""
+        PageStateTracker._states[driver.session_id] = {
+            "url": url,
+            "fingerprint": PageStateTracker.fingerprint(driver),
+            "dirty": False
+        }
+
+    @staticmethod
+    def mark_dirty(driver):
+        """Record that the current page may have been changed"""
+        state = PageStateTracker._states.get(getattr(driver, "session_id", None))
+        if state:
+            state["dirty"] = True
+
+    @staticmethod
+    def forget(driver):
+        """Drop any recorded state for the driver"""
+        PageStateTracker._states.pop(getattr(driver, "session_id", None), None)
+
+    @staticmethod
+    def record_reuse(driver, page_name):
+        """Record that a go_to_url of page_name kept the current copy instead of loading it"""
+        PageStateTracker._reused.setdefault(driver.session_id, []).append(page_name)
+
+    @staticmethod
+    def take_reused(driver):
+        """Get and forget the page names reused since the last call"""
+        return PageStateTracker._reused.pop(getattr(driver, "session_id", None), [])
+
+    @staticmethod
+    def is_clean_copy(driver, url):
+        """Check if the driver is still on an untouched copy of url"""
+        state = PageStateTracker._states.get(driver.session_id)
+        if not state or state["dirty"] or state["url"] != url or state["fingerprint"] is None:
+            return False
+        return PageStateTracker.fingerprint(driver) == state["fingerprint"]
+
+class PageLocalityGrouper:
+    """Reorders collected tests so tests on the same page run back to back"""
+
+    @staticmethod
+    def get_page_classes(item):
+        """Get the reusable page object classes a test function refers to"""
+        function = getattr(item, "function", None)
+        module = getattr(item, "module", None)
+        if function is None or module is None:
+            return []
+
+        page_classes = []
+        for name in function.__code__.co_names:
+            candidate = getattr(module, name, None)
+            if inspect.isclass(candidate) and getattr(candidate, "MUTATING_METHODS", None) is not None:
+                page_classes.append(candidate)
+        return page_classes
+
+    @staticmethod
+    def is_read_only(item, page_classes):
+        """Check if a test calls none of the mutating methods its pages declare"""
+        called = set(item.function.__code__.co_names)
+        return not any(called & set(page_class.MUTATING_METHODS) for page_class in page_classes)
+
+    @staticmethod
+    def group_items(items):
+        """Group tests by target page, read-only tests first within each group"""
+        groups = {}
+        for index, item in enumerate(items):
+            page_classes = PageLocalityGrouper.get_page_classes(item)
+            if len(page_classes) == 1:
+                key = page_classes[0].__name__
+                read_only = PageLocalityGrouper.is_read_only(item, page_classes)
+            else:
+                # Tests spanning several pages (or none) keep their own slot
+                key = index
+                read_only = False
+            groups.setdefault(key, []).append((not read_only, index, item))
+
+        ordered = []
+        for group in groups.values():
+            ordered.extend(item for _, _, item in sorted(group, key=lambda entry: entry[:2]))
+        items[:] = ordered
@@ -0,0 +1,140 @@
+"""
+Declarative performance budgets per page object class or URL path, enforced on every page visit
+"""
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+from config.settings import Config
+from utils.page_metrics import PageMetricsRecorder, visit_violations
+
+class PerformanceBudgets:
+    """Limits from the budgets file: 'default', then the longest matching 'paths' prefix, then 'pages' by class name"""
+
+    def __init__(self, path=None):
+        self.path = path or Config.PERF_BUDGETS_FILE
+        self.default = {}
+        self.paths = {}
+        self.pages = {}
+
+    def load(self):
+        """Load the budgets file if it exists"""
+        if os.path.exists(self.path):
+            with open(self.path, "r") as file:
+                budgets = json.load(file)
+            self.default = budgets.get("default", {})
+            self.paths = budgets.get("paths", {})
+            self.pages = budgets.get("pages", {})
+        return self
+
+    def __bool__(self):
+        return bool(self.default or self.paths or self.pages)
+
+    def metrics(self):
+        """Every metric some budget limits"""
+        limits = [self.default] + list(self.paths.values()) + list(self.pages.values())
+        return {metric for budget in limits for metric in budget}
+
+    def for_visit(self, page_name, url):
+        """Get the limits that apply to a visit of a page object at a URL"""
+        limits = dict(self.default)
+        path = urlsplit(url).path or "/"
+        matching = [prefix for prefix in self.paths if path == prefix or path.startswith(prefix.rstrip("/") + "/")]
+        if matching:
+            limits.update(self.paths[max(matching, key=len)])
+        limits.update(self.pages.get(page_name, {}))
+        return limits
+
+    def check(self, visits):
+        """List the budget violations of the given page_metrics visits"""
+        violations = []
+        for visit in visits:
+            violations.extend(visit_violations(visit, self.for_visit(visit["page"], visit["url"])))
+        return violations
+
+class CommandCounter:
+    """Counts the WebDriver commands of each page visit
+
+    Only commands sent between start_visit and finish_visit, from the thread
+    that started the visit, are counted: background threads (screenshot
+    writer, flight recorder) and fixture teardowns are not the page's cost.
+    """
+
+    _visits = {}
+    _original = None
+
+    @staticmethod
+    def install():
+        from selenium.webdriver.remote.webdriver import WebDriver
+
+        if CommandCounter._original is not None:
+            return
+        original = CommandCounter._original = WebDriver.execute
+
+        def execute(driver, driver_command, params=None):
+            visit = CommandCounter._visits.get(driver.session_id)
+            if visit is not None and visit["thread"] == threading.get_ident():
+                visit["count"] += 1
+            return original(driver, driver_command, params)
+
+        WebDriver.execute = execute
+
+    @staticmethod
+    def uninstall():
+        from selenium.webdriver.remote.webdriver import WebDriver
+
+        if CommandCounter._original is not None:
+            WebDriver.execute = CommandCounter._original
+            CommandCounter._original = None
+
+    @staticmethod
+    def start_visit(driver):
+        """Start counting the commands of the page object's visit that was just recorded"""
+        metrics = PageMetricsRecorder.get(driver)
+        if metrics is not None and metrics.visits:
+            CommandCounter._visits[driver.session_id] = {
+                "visit": metrics.visits[-1], "thread": threading.get_ident(), "count": 0
+            }
+
+    @staticmethod
+    def finish_visit(driver):
+        """Charge the commands counted since start_visit to that visit"""
+        counted = CommandCounter._visits.pop(getattr(driver, "session_id", None), None)
+        if counted is not None:
+            counted["visit"]["metrics"].setdefault("webdriver_commands", counted["count"])
+
+class BudgetReport:
+    """Pytest plugin aggregating budget violations from every test into one section (controller)"""
+
+    def __init__(self, unchecked=()):
+        self.checked = 0
+        self.reused = 0
+        self.violations = []
+        self.unchecked = list(unchecked)
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for key, value in report.user_properties:
+            if key == "performance_budgets":
+                self.checked += value["checked"]
+                self.violations.extend((report.nodeid, violation) for violation in value["violations"])
+            elif key == "reused_pages":
+                self.reused += len(value)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.checked and not self.reused:
+            return
+        terminalreporter.section("performance budgets")
+        terminalreporter.write_line(f"{self.checked} page visits checked, {len(self.violations)} budget violations")
+        if self.reused:
+            terminalreporter.write_line(f"Not checked: {self.reused} reused page visits (no page load to measure)")
+        if self.unchecked:
+            terminalreporter.write_line(f"Not checked without --web-vitals: {', '.join(self.unchecked)}")
+        by_page = {}
+        for nodeid, violation in self.violations:
+            by_page.setdefault(violation.split(" ", 1)[0], []).append((nodeid, violation))
+        for page_name, violations in sorted(by_page.items()):
+            terminalreporter.write_line(f"{page_name}: {len(violations)}")
+            for nodeid, violation in violations:
+                terminalreporter.write_line(f"  {violation.split(' ', 1)[1]}  ({nodeid})")
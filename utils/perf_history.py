@@ -0,0 +1,222 @@
+"""
+Historical performance timings and statistical regression detection
+"""
+import math
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from statistics import median
+from config.settings import Config
+from utils.impact import get_git_sha
+
+class PerfHistoryStore:
+    """SQLite store of timings per run, keyed by environment, browser and git SHA"""
+
+    def __init__(self, path=None):
+        self.path = path or Config.PERF_HISTORY_DB
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, started_at REAL NOT NULL,"
+            " environment TEXT NOT NULL, browser TEXT NOT NULL, git_sha TEXT);"
+            "CREATE TABLE IF NOT EXISTS measurements ("
+            " run_id INTEGER NOT NULL REFERENCES runs (id), nodeid TEXT NOT NULL,"
+            " name TEXT NOT NULL, value REAL NOT NULL, outcome TEXT);"
+            "CREATE INDEX IF NOT EXISTS measurements_run ON measurements (run_id);"
+            "CREATE INDEX IF NOT EXISTS runs_key ON runs (environment, browser, id);"
+        )
+        # Databases created before outcomes were stored
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(measurements)")]
+        if "outcome" not in columns:
+            self.connection.execute("ALTER TABLE measurements ADD COLUMN outcome TEXT")
+
+    def record_run(self, environment, browser, measurements, git_sha=None, started_at=None):
+        """Store one run's measurements: a list of (nodeid, name, seconds, outcome)"""
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (started_at, environment, browser, git_sha) VALUES (?, ?, ?, ?)",
+                (started_at or time.time(), environment, browser, git_sha)
+            )
+            self.connection.executemany(
+                "INSERT INTO measurements (run_id, nodeid, name, value, outcome) VALUES (?, ?, ?, ?, ?)",
+                [(cursor.lastrowid, nodeid, name, value, outcome) for nodeid, name, value, outcome in measurements]
+            )
+        return cursor.lastrowid
+
+    def get_runs(self, environment, browser, limit):
+        """Get the ids and git SHAs of the latest runs for an environment and browser, oldest first"""
+        rows = self.connection.execute(
+            "SELECT id, git_sha FROM runs WHERE environment = ? AND browser = ? ORDER BY id DESC LIMIT ?",
+            (environment, browser, limit)
+        ).fetchall()
+        return list(reversed(rows))
+
+    def get_series(self, run_ids):
+        """Get {(nodeid, name): {run_id: value}} for the given runs
+
+        A measurement taken several times in one run is reduced to its median.
+        """
+        if not run_ids:
+            return {}
+        placeholders = ", ".join("?" * len(run_ids))
+        rows = self.connection.execute(
+            f"SELECT run_id, nodeid, name, value FROM measurements WHERE run_id IN ({placeholders})",
+            list(run_ids)
+        )
+        samples = {}
+        for run_id, nodeid, name, value in rows:
+            samples.setdefault((nodeid, name), {}).setdefault(run_id, []).append(value)
+        return {
+            key: {run_id: median(values) for run_id, values in runs.items()}
+            for key, runs in samples.items()
+        }
+
+    def close(self):
+        self.connection.close()
+
+def mann_whitney_u(recent, baseline):
+    """One-sided Mann-Whitney U test that recent values are larger than the baseline
+
+    Uses the normal approximation with tie and continuity correction, which is
+    adequate for the handful-of-runs sample sizes used here. Returns (U, p).
+    """
+    n1, n2 = len(recent), len(baseline)
+    if not n1 or not n2:
+        return 0.0, 1.0
+
+    combined = sorted([(value, 0) for value in recent] + [(value, 1) for value in baseline])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    start = 0
+    while start < len(combined):
+        end = start
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        for position in range(start, end + 1):
+            ranks[position] = (start + end) / 2.0 + 1
+        tied = end - start + 1
+        tie_term += tied ** 3 - tied
+        start = end + 1
+
+    rank_sum = sum(rank for rank, (_, group) in zip(ranks, combined) if group == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2.0
+    mean = n1 * n2 / 2.0
+    n = n1 + n2
+    variance = n1 * n2 / 12.0 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - mean - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+class PerfRegressionDetector:
+    """Compares the latest runs with the runs before them, per test measurement"""
+
+    def __init__(self, store, recent_runs=None, baseline_runs=None, alpha=None, min_change=None):
+        self.store = store
+        self.recent_runs = recent_runs or Config.PERF_RECENT_RUNS
+        self.baseline_runs = baseline_runs or Config.PERF_BASELINE_RUNS
+        self.alpha = alpha if alpha is not None else Config.PERF_ALPHA
+        self.min_change = min_change if min_change is not None else Config.PERF_MIN_CHANGE
+
+    def analyze(self, environment, browser):
+        """Get one result per measurement with medians, relative change, p-value and verdict"""
+        runs = self.store.get_runs(environment, browser, self.recent_runs + self.baseline_runs)
+        recent_ids = [run_id for run_id, _ in runs[-self.recent_runs:]]
+        baseline_ids = [run_id for run_id, _ in runs[:-self.recent_runs]]
+
+        results = []
+        for (nodeid, name), values in sorted(self.store.get_series(recent_ids + baseline_ids).items()):
+            recent = [values[run_id] for run_id in recent_ids if run_id in values]
+            baseline = [values[run_id] for run_id in baseline_ids if run_id in values]
+            result = {"nodeid": nodeid, "name": name, "recent": len(recent), "baseline": len(baseline)}
+            if len(recent) < 1 or len(baseline) < Config.PERF_MIN_BASELINE:
+                results.append(dict(result, verdict="insufficient history"))
+                continue
+
+            recent_median, baseline_median = median(recent), median(baseline)
+            change = (recent_median - baseline_median) / baseline_median if baseline_median else 0.0
+            _, p_slower = mann_whitney_u(recent, baseline)
+            _, p_faster = mann_whitney_u(baseline, recent)
+            if p_slower < self.alpha and change >= self.min_change:
+                verdict = "REGRESSION"
+            elif p_faster < self.alpha and -change >= self.min_change:
+                verdict = "improved"
+            else:
+                verdict = "ok"
+            results.append(dict(
+                result, recent_median=recent_median, baseline_median=baseline_median,
+                change=change, p_value=min(p_slower, p_faster), verdict=verdict
+            ))
+        return results
+
+class PerfHistoryRecorder:
+    """Pytest plugin storing the timings of performance tests at the end of each run (controller only)
+
+    Records the call duration of every 'performance' test, each named
+    measurement a test reports through the perf_timer fixture, and the Web
+    Vitals of each page object (stored under "page:<class>", LCP/TBT/INP in
+    seconds, CLS unitless). Timings are kept whatever the test's outcome, with
+    the outcome alongside: slow runs that fail a hard limit are exactly the
+    ones the history has to see.
+    """
+
+    def __init__(self, store, environment, browser):
+        self.store = store
+        self.environment = environment
+        self.browser = browser
+        self.started_at = time.time()
+        self.measurements = []
+        self.outcomes = {}
+
+    def pytest_runtest_logreport(self, report):
+        # Timings under network/CPU emulation or Chrome tracing form their own series
+        throttle = next((value for key, value in report.user_properties if key == "throttle"), None)
+        suffix = f"@{throttle}" if throttle else ""
+        if any(key == "chrome_trace" for key, _ in report.user_properties):
+            suffix += "@trace"
+        if report.when == "teardown":
+            outcome = self.outcomes.pop(report.nodeid, report.outcome)
+            for key, value in report.user_properties:
+                if key == "page_vitals" and value["page"] is not None:
+                    self.measurements.extend(
+                        (
+                            f"page:{value['page']}", vital + suffix,
+                            value[vital] if vital == "cls" else value[vital] / 1000.0, outcome
+                        )
+                        for vital in ("lcp", "cls", "tbt", "inp") if value.get(vital) is not None
+                    )
+            return
+        if report.when != "call" or report.skipped:
+            return
+        self.outcomes[report.nodeid] = report.outcome
+        measurements = [value for key, value in report.user_properties if key == "perf_measurement"]
+        if "performance" in report.keywords:
+            measurements.append(("call", report.duration))
+        self.measurements.extend((report.nodeid, name + suffix, value, report.outcome) for name, value in measurements)
+
+    def pytest_sessionfinish(self, session):
+        if self.measurements:
+            self.store.record_run(self.environment, self.browser, self.measurements, get_git_sha(), self.started_at)
+        self.store.close()
+
+class PerfTimer:
+    """Named timings for one test, reported to the performance history"""
+
+    def __init__(self, node):
+        self.node = node
+
+    def record(self, name, seconds):
+        self.node.user_properties.append(("perf_measurement", (name, seconds)))
+        return seconds
+
+    @contextmanager
+    def measure(self, name):
+        """Time the body of a with block; the result's 'seconds' is set on exit"""
+        result = {"seconds": None}
+        start = time.perf_counter()
+        try:
+            yield result
+        finally:
+            result["seconds"] = self.record(name, time.perf_counter() - start)
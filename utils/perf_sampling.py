@@ -0,0 +1,142 @@
+"""
+Repeated sampling of timed page flows: cold/warm split, outlier flagging, percentiles with confidence intervals
+"""
+import random
+import time
+from config.settings import Config
+
+def percentile(values, fraction):
+    """Linearly interpolated percentile of values (fraction in 0..1)"""
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+def remove_outliers(values):
+    """Split values into (kept, outliers) with Tukey's fences (1.5 x IQR)"""
+    if len(values) < 4:
+        return list(values), []
+    q1, q3 = percentile(values, 0.25), percentile(values, 0.75)
+    spread = 1.5 * (q3 - q1)
+    kept = [value for value in values if q1 - spread <= value <= q3 + spread]
+    return kept, [value for value in values if value not in kept]
+
+def bootstrap_interval(values, fraction, confidence=0.95, resamples=1000, seed=0):
+    """Bootstrap confidence interval of a percentile"""
+    if len(values) < 2:
+        return None
+    rng = random.Random(seed)
+    estimates = sorted(
+        percentile([rng.choice(values) for _ in values], fraction)
+        for _ in range(resamples)
+    )
+    tail = (1 - confidence) / 2
+    return estimates[int(tail * (resamples - 1))], estimates[int((1 - tail) * (resamples - 1))]
+
+class SampleResult:
+    """Timings of one sampled flow, in seconds
+
+    Percentiles cover every warm run: a slow run is the tail p95 is meant to
+    catch, so outliers are only reported, never dropped.
+    """
+
+    def __init__(self, name, timings):
+        self.name = name
+        self.cold = timings[0]
+        self.warm = timings[1:]
+        _, self.outliers = remove_outliers(self.warm)
+        self.p50 = percentile(self.warm, 0.5)
+        self.p95 = percentile(self.warm, 0.95)
+        self.p50_ci = bootstrap_interval(self.warm, 0.5)
+        self.p95_ci = bootstrap_interval(self.warm, 0.95)
+
+    def summary(self):
+        def interval(bounds):
+            return f" [{bounds[0]:.3f}, {bounds[1]:.3f}]" if bounds else ""
+        return (
+            f"{self.name}: cold {self.cold:.3f}s, warm p50 {self.p50:.3f}s{interval(self.p50_ci)}, "
+            f"p95 {self.p95:.3f}s{interval(self.p95_ci)} "
+            f"({len(self.warm)} runs{self._outlier_note()})"
+        )
+
+    def _outlier_note(self):
+        if not self.outliers:
+            return ""
+        return ", outliers " + ", ".join(f"{value:.3f}s" for value in self.outliers)
+
+    def assert_percentiles(self, p50=None, p95=None, cold=None):
+        """Fail when a percentile's point estimate exceeds its limit (the intervals are for reporting)"""
+        assert self.warm, f"{self.name}: no warm samples"
+        failures = []
+        for label, value, limit in (("p50", self.p50, p50), ("p95", self.p95, p95)):
+            if limit is not None and value > limit:
+                failures.append(f"{label} {value:.3f}s > {limit}s")
+        if cold is not None and self.cold > cold:
+            failures.append(f"cold run {self.cold:.3f}s > {cold}s")
+        assert not failures, f"{self.summary()}: " + ", ".join(failures)
+
+class PerfSampler:
+    """Runs a flow once cold and then K warm times, optionally through pytest-benchmark"""
+
+    def __init__(self, iterations=None, benchmark=None, perf_timer=None, node=None):
+        self.iterations = iterations or Config.PERF_SAMPLE_ITERATIONS
+        self.benchmark = benchmark
+        self.perf_timer = perf_timer
+        self.node = node
+
+    def sample(self, flow, name="flow", setup=None):
+        """Time flow() 1 + iterations times, calling the untimed setup() before each run"""
+        timings = []
+
+        def timed():
+            start = time.perf_counter()
+            flow()
+            timings.append(time.perf_counter() - start)
+
+        def prepare():
+            if setup is not None:
+                setup()
+
+        if self.benchmark is not None:
+            # The cold run is pytest-benchmark's warmup round, so saved baselines hold warm runs only
+            self.benchmark.pedantic(timed, setup=prepare, rounds=self.iterations, warmup_rounds=1, iterations=1)
+        # pytest-benchmark runs the flow only once when disabled (e.g. under xdist)
+        while len(timings) < self.iterations + 1:
+            prepare()
+            timed()
+
+        result = SampleResult(name, timings)
+        if self.node is not None:
+            self.node.user_properties.append(("perf_sample", result.summary()))
+        if self.benchmark is not None:
+            self.benchmark.extra_info.update(
+                cold=result.cold, p50=result.p50, p95=result.p95, outliers=len(result.outliers)
+            )
+        if self.perf_timer is not None:
+            self.perf_timer.record(f"{name}.cold", result.cold)
+            self.perf_timer.record(f"{name}.p50", result.p50)
+            self.perf_timer.record(f"{name}.p95", result.p95)
+        return result
+
+class PerfSampleReport:
+    """Pytest plugin listing every sampled flow's summary in one section (controller)"""
+
+    def __init__(self):
+        self.samples = []
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for key, value in report.user_properties:
+            if key == "perf_sample":
+                self.samples.append((report.nodeid, value))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.samples:
+            return
+        terminalreporter.section("performance samples")
+        for nodeid, summary in self.samples:
+            terminalreporter.write_line(f"{summary}  ({nodeid})")
@@ -0,0 +1,182 @@
+"""
+Streaming merge of sharded test run outputs (JUnit, JSON, HTML summary, screenshots)
+"""
+import html
+import json
+import os
+import shutil
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from xml.sax.saxutils import quoteattr
+from config.settings import Config
+from utils.sharding import DurationStore
+
+class ShardReportMerger:
+    """Merges the report directories written by sharded runs into one report"""
+
+    JUNIT_FILE = "junit.xml"
+    JSON_FILE = "report.json"
+    HTML_FILE = "test_report.html"
+    SCREENSHOT_DIR = "screenshots"
+    DURATIONS_FILE = "durations.json"
+
+    def __init__(self, shard_dirs, output_dir):
+        self.shard_dirs = shard_dirs
+        self.output_dir = output_dir
+        self.totals = {"tests": 0, "passed": 0, "failed": 0, "error": 0, "skipped": 0, "duration": 0.0}
+
+    def merge(self):
+        """Merge every shard and return the totals"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._merge_junit_and_html()
+        self._merge_json()
+        self._merge_screenshots()
+        self._merge_durations()
+        return self.totals
+
+    def _shard_name(self, shard_dir):
+        """Unique name for a shard, e.g. 'shard-1-reports' for shard-1/reports"""
+        return os.path.normpath(shard_dir).replace(os.sep, "-").lstrip(".-")
+
+    def _merge_junit_and_html(self):
+        """Stream test cases from every shard's JUnit file into the merged JUnit and HTML files"""
+        junit_path = os.path.join(self.output_dir, self.JUNIT_FILE)
+        html_path = os.path.join(self.output_dir, self.HTML_FILE)
+
+        with open(junit_path, "w", encoding="utf-8") as junit, open(html_path, "w", encoding="utf-8") as report:
+            junit.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites>\n')
+            report.write(self._html_header())
+
+            for shard_dir in self.shard_dirs:
+                source = os.path.join(shard_dir, self.JUNIT_FILE)
+                if not os.path.exists(source):
+                    print(f"Skipping {shard_dir}: no {self.JUNIT_FILE}")
+                    continue
+                self._stream_junit(source, self._shard_name(shard_dir), junit, report)
+
+            junit.write("</testsuites>\n")
+            report.write(self._html_footer())
+
+    def _stream_junit(self, source, shard_name, junit, report):
+        for event, element in ET.iterparse(source, events=("start", "end")):
+            if element.tag == "testsuite" and event == "start":
+                attributes = dict(element.attrib, name=f"{element.get('name', 'pytest')}.{shard_name}")
+                rendered = " ".join(f"{key}={quoteattr(value)}" for key, value in attributes.items())
+                junit.write(f"<testsuite {rendered}>\n")
+            elif element.tag == "testsuite" and event == "end":
+                junit.write("</testsuite>\n")
+                element.clear()
+            elif element.tag == "testcase" and event == "end":
+                junit.write(ET.tostring(element, encoding="unicode"))
+                report.write(self._html_row(element, shard_name))
+                element.clear()
+
+    def _html_row(self, testcase, shard_name):
+        outcome = "passed"
+        message = ""
+        for tag in ("failure", "error", "skipped"):
+            child = testcase.find(tag)
+            if child is not None:
+                outcome = "failed" if tag == "failure" else tag
+                message = child.get("message", "")
+                break
+
+        duration = float(testcase.get("time", 0) or 0)
+        self.totals["tests"] += 1
+        self.totals[outcome] += 1
+        self.totals["duration"] += duration
+
+        name = f"{testcase.get('classname', '')}::{testcase.get('name', '')}"
+        return (
+            f'<tr class="{outcome}"><td>{html.escape(name)}</td><td>{outcome}</td>'
+            f"<td>{duration:.2f}s</td><td>{html.escape(shard_name)}</td>"
+            f"<td>{html.escape(message[:300])}</td></tr>\n"
+        )
+
+    def _html_header(self):
+        return (
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Merged Test Report</title>"
+            "<style>body{font-family:sans-serif}td,th{padding:4px 8px;border-bottom:1px solid #ddd}"
+            "tr.failed,tr.error{background:#fdd}tr.skipped{background:#ffd}</style></head><body>\n"
+            f"<h1>Merged Test Report</h1><p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>\n"
+            f"<p>Shard reports: {self._shard_links()}</p>\n"
+            "<table><tr><th>Test</th><th>Outcome</th><th>Duration</th><th>Shard</th><th>Message</th></tr>\n"
+        )
+
+    def _html_footer(self):
+        totals = self.totals
+        return (
+            "</table>\n"
+            f"<p>Total: {totals['tests']}, passed: {totals['passed']}, failed: {totals['failed']}, "
+            f"errors: {totals['error']}, skipped: {totals['skipped']}, "
+            f"test time: {totals['duration']:.1f}s</p>\n</body></html>\n"
+        )
+
+    def _shard_links(self):
+        links = []
+        for shard_dir in self.shard_dirs:
+            shard_report = os.path.join(shard_dir, self.HTML_FILE)
+            if os.path.exists(shard_report):
+                href = os.path.relpath(shard_report, self.output_dir)
+                links.append(f'<a href="{html.escape(href)}">{html.escape(self._shard_name(shard_dir))}</a>')
+        return ", ".join(links) or "none"
+
+    def _merge_json(self):
+        """Concatenate the tests of every shard's JSON report, one shard in memory at a time"""
+        json_path = os.path.join(self.output_dir, self.JSON_FILE)
+        summary = {}
+        with open(json_path, "w", encoding="utf-8") as output:
+            output.write('{"tests": [')
+            first = True
+            for shard_dir in self.shard_dirs:
+                source = os.path.join(shard_dir, self.JSON_FILE)
+                if not os.path.exists(source):
+                    continue
+                with open(source, "r", encoding="utf-8") as file:
+                    shard = json.load(file)
+                for test in shard.get("tests", []):
+                    test["shard"] = self._shard_name(shard_dir)
+                    output.write(("" if first else ",") + "\n" + json.dumps(test))
+                    first = False
+                for key, value in shard.get("summary", {}).items():
+                    if isinstance(value, (int, float)):
+                        summary[key] = summary.get(key, 0) + value
+                del shard
+            output.write('\n], "summary": ' + json.dumps(summary) + "}\n")
+
+    def _merge_screenshots(self):
+        """Link (or copy) shard screenshots into per-shard folders of the merged report"""
+        for shard_dir in self.shard_dirs:
+            source_dir = os.path.join(shard_dir, self.SCREENSHOT_DIR)
+            if not os.path.isdir(source_dir):
+                continue
+            target_dir = os.path.join(self.output_dir, self.SCREENSHOT_DIR, self._shard_name(shard_dir))
+            for root, _, files in os.walk(source_dir):
+                destination_root = os.path.join(target_dir, os.path.relpath(root, source_dir))
+                os.makedirs(destination_root, exist_ok=True)
+                for filename in files:
+                    source = os.path.join(root, filename)
+                    destination = os.path.join(destination_root, filename)
+                    if os.path.exists(destination):
+                        continue
+                    try:
+                        os.link(source, destination)
+                    except OSError:
+                        shutil.copy2(source, destination)
+
+    def _merge_durations(self):
+        """Fold the shards' durations into the shared durations file and write the result next to the merged report"""
+        results = {}
+        for shard_dir in self.shard_dirs:
+            source = os.path.join(shard_dir, self.DURATIONS_FILE)
+            if os.path.exists(source):
+                with open(source, "r", encoding="utf-8") as file:
+                    results.update(json.load(file))
+        if not results:
+            return None
+
+        store = DurationStore(Config.SHARD_DURATIONS_FILE).load()
+        store.record(results)
+        store.path = os.path.join(self.output_dir, self.DURATIONS_FILE)
+        store.save()
+        return store.path
@@ -0,0 +1,157 @@
+"""
+Per-test browser resource probe: JS heap, DOM nodes, listeners, windows and process RSS/CPU, with leak reporting
+"""
+import os
+
+PAGE_RESOURCES_SCRIPT = """
+return {
+    js_heap: performance.memory ? performance.memory.usedJSHeapSize : null,
+    dom_nodes: document.getElementsByTagName('*').length
+};
+"""
+
+CDP_METRICS = {
+    "JSHeapUsedSize": "js_heap",
+    "Nodes": "dom_nodes",
+    "JSEventListeners": "listeners",
+    "Documents": "documents"
+}
+
+def read_process_tree(root_pid):
+    """Get {pid: (ppid, rss_bytes, cpu_seconds)} for root_pid and its descendants from /proc (Linux)"""
+    if not os.path.isdir("/proc"):
+        return {}
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    ticks = os.sysconf("SC_CLK_TCK")
+    processes = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r") as file:
+                stat = file.read()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields after it are space separated
+        fields = stat[stat.rindex(")") + 2:].split()
+        processes[int(entry)] = (
+            int(fields[1]),
+            int(fields[21]) * page_size,
+            (int(fields[11]) + int(fields[12])) / ticks
+        )
+
+    tree = {}
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        if pid in processes and pid not in tree:
+            tree[pid] = processes[pid]
+            pending.extend(child for child, (ppid, _, _) in processes.items() if ppid == pid)
+    return tree
+
+class ResourceProbe:
+    """Samples the resource usage of one driver's browser"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self._cdp_enabled = False
+
+    def sample(self, collect_garbage=True):
+        """Take a sample; collect_garbage forces a GC first so the heap shows what is really retained"""
+        sample = {}
+        if hasattr(self.driver, "execute_cdp_cmd"):
+            try:
+                if not self._cdp_enabled:
+                    self.driver.execute_cdp_cmd("Performance.enable", {})
+                    self._cdp_enabled = True
+                if collect_garbage:
+                    self.driver.execute_cdp_cmd("HeapProfiler.collectGarbage", {})
+                metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+                for metric in metrics:
+                    if metric["name"] in CDP_METRICS:
+                        sample[CDP_METRICS[metric["name"]]] = metric["value"]
+            except Exception:
+                self._cdp_enabled = False
+        if "js_heap" not in sample:
+            try:
+                sample.update(self.driver.execute_script(PAGE_RESOURCES_SCRIPT))
+            except Exception:
+                pass
+        try:
+            sample["windows"] = len(self.driver.window_handles)
+        except Exception:
+            pass
+        sample.update(self._sample_processes())
+        return sample
+
+    def _sample_processes(self):
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        if process is None:
+            return {}
+        tree = read_process_tree(process.pid)
+        if not tree:
+            return {}
+        driver_rss, driver_cpu = tree[process.pid][1:] if process.pid in tree else (0, 0.0)
+        return {
+            "driver_rss": driver_rss,
+            "browser_rss": sum(rss for pid, (_, rss, _) in tree.items() if pid != process.pid),
+            "browser_cpu": sum(cpu for pid, (_, _, cpu) in tree.items() if pid != process.pid),
+            "browser_processes": len(tree) - 1
+        }
+
+    @staticmethod
+    def delta(before, after):
+        """Change of every numeric value between two samples"""
+        return {
+            key: after[key] - before[key]
+            for key in after
+            if key in before and isinstance(after[key], (int, float)) and isinstance(before[key], (int, float))
+        }
+
+def find_leaks(delta, thresholds):
+    """Names of the values whose growth over a test exceeds its threshold"""
+    return [key for key, limit in thresholds.items() if delta.get(key, 0) > limit]
+
+def find_overuse(sample, limits):
+    """Names of the values above their absolute limit (the browser should be recycled)"""
+    return [key for key, limit in limits.items() if sample.get(key) is not None and sample[key] > limit]
+
+class ResourceReport:
+    """Pytest plugin summarizing per-test resource deltas, leaks and browser recycles (controller)"""
+
+    def __init__(self, top=10):
+        self.top = top
+        self.tests = []
+        self.recycles = []
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for key, value in report.user_properties:
+            if key == "resources":
+                self.tests.append((report.nodeid, value))
+            elif key == "browser_recycled":
+                self.recycles.append((report.nodeid, value))
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.tests:
+            return
+        terminalreporter.section("browser resources")
+        leaking = [(nodeid, data) for nodeid, data in self.tests if data.get("leaks")]
+        terminalreporter.write_line(f"{len(self.tests)} tests probed, {len(leaking)} left state behind")
+        for nodeid, data in leaking[:self.top]:
+            terminalreporter.write_line(f"  LEAK {', '.join(data['leaks'])}: {nodeid}")
+
+        ranked = sorted(self.tests, key=lambda test: -test[1]["delta"].get("js_heap", 0))[:self.top]
+        terminalreporter.write_line(f"Top {len(ranked)} tests by retained JS heap:")
+        for nodeid, data in ranked:
+            delta = data["delta"]
+            terminalreporter.write_line(
+                f"  {delta.get('js_heap', 0) / 1048576:+8.1f} MB heap {delta.get('dom_nodes', 0):+7.0f} nodes "
+                f"{delta.get('listeners', 0):+6.0f} listeners {delta.get('browser_rss', 0) / 1048576:+8.1f} MB RSS  {nodeid}"
+            )
+        last = self.tests[-1][1]["after"]
+        if "browser_rss" in last:
+            terminalreporter.write_line(f"Browser RSS at end: {last['browser_rss'] / 1048576:.0f} MB")
+        for nodeid, reason in self.recycles:
+            terminalreporter.write_line(f"Browser recycled after {nodeid}: {reason}")
@@ -0,0 +1,271 @@
+"""
+Resource waterfall per page visit (Resource Timing) and slow-asset analysis per page object
+"""
+import gzip
+import json
+import os
+from statistics import median
+from urllib.parse import urlsplit
+from config.settings import Config
+
+# Column order of the compact entries: one list per resource instead of one dict
+WATERFALL_FIELDS = ["name", "type", "start", "duration", "transfer", "encoded", "decoded", "blocking", "protocol"]
+
+# The Resource Timing buffer holds 250 entries by default; raise it before any page script runs
+RESOURCE_BUFFER_SCRIPT = f"try {{ performance.setResourceTimingBufferSize({Config.WATERFALL_BUFFER_SIZE}); }} catch (e) {{}}"
+
+RESOURCE_WATERFALL_SCRIPT = """
+var nav = performance.getEntriesByType('navigation')[0];
+function ms(value) { return Math.round(value * 10) / 10; }
+return {
+    url: location.href,
+    dom_interactive: nav ? ms(nav.domInteractive) : null,
+    load_event: nav ? ms(nav.loadEventEnd) : null,
+    entries: performance.getEntriesByType('resource').map(function (entry) {
+        return [
+            entry.name, entry.initiatorType, ms(entry.startTime), ms(entry.duration),
+            entry.transferSize || 0, entry.encodedBodySize || 0, entry.decodedBodySize || 0,
+            entry.renderBlockingStatus || null, entry.nextHopProtocol || null
+        ];
+    })
+};
+"""
+
+def resource_key(url):
+    """The resource URL without query string or fragment, so cache busters don't split series"""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+def site_of(url):
+    """Approximate registrable domain: the last two host labels"""
+    host = urlsplit(url).hostname or ""
+    return ".".join(host.split(".")[-2:])
+
+def summarize_visit(visit):
+    """Per-visit figures: totals, blocking resources, cache hits and third-party share"""
+    entries = [dict(zip(WATERFALL_FIELDS, entry)) for entry in visit["entries"]]
+    page_site = site_of(visit["url"])
+    dom_interactive = visit.get("dom_interactive")
+
+    def is_blocking(entry):
+        if entry["blocking"] is not None:
+            return entry["blocking"] == "blocking"
+        # Browsers without renderBlockingStatus: scripts and stylesheets requested before the DOM was interactive
+        return entry["type"] in ("script", "link") and dom_interactive is not None and entry["start"] < dom_interactive
+
+    # Cross-origin resources without Timing-Allow-Origin report no sizes; leave them out of the cache ratio
+    sized = [entry for entry in entries if entry["decoded"]]
+    cached = [entry for entry in sized if entry["transfer"] < entry["encoded"] or entry["transfer"] == 0]
+    third_party = [entry for entry in entries if site_of(entry["name"]) != page_site]
+    return {
+        "page": visit["page"],
+        "url": visit["url"],
+        "load_event": visit.get("load_event"),
+        "count": len(entries),
+        "transfer": sum(entry["transfer"] for entry in entries),
+        "blocking": [entry for entry in entries if is_blocking(entry)],
+        "cache_hit_ratio": len(cached) / len(sized) if sized else None,
+        "third_party_count": len(third_party),
+        "third_party_transfer": sum(entry["transfer"] for entry in third_party),
+        "entries": entries
+    }
+
+class ResourceBaseline:
+    """Per page object and resource durations from previous runs, smoothed with an exponential moving average"""
+
+    SMOOTHING = 0.3
+
+    def __init__(self, path=None):
+        self.path = path or Config.WATERFALL_BASELINE_FILE
+        self.durations = {}
+
+    def load(self):
+        """Load stored durations if the file exists"""
+        if os.path.exists(self.path):
+            with open(self.path, "r") as file:
+                self.durations = json.load(file)
+        return self
+
+    def get(self, page_name, key):
+        return self.durations.get(page_name, {}).get(key)
+
+    def record(self, medians):
+        """Fold {page: {resource: median duration}} of a run into the stored averages"""
+        for page_name, resources in medians.items():
+            stored = self.durations.setdefault(page_name, {})
+            for key, duration in resources.items():
+                previous = stored.get(key)
+                stored[key] = round(duration if previous is None else previous + self.SMOOTHING * (duration - previous), 1)
+
+    def save(self):
+        """Write the durations to disk"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w") as file:
+            json.dump(self.durations, file, indent=1, sort_keys=True)
+
+class WaterfallAnalyzer:
+    """Slowest, largest and slowed-down resources, blocking scripts, cache and third-party share per page object"""
+
+    def __init__(self, visits, baseline=None, top=None):
+        self.summaries = [summarize_visit(visit) for visit in visits]
+        self.baseline = baseline
+        self.top = top or Config.WATERFALL_TOP
+
+    def resource_medians(self):
+        """Get {page: {resource: median duration (ms)}} over this run's visits"""
+        durations = {}
+        for summary in self.summaries:
+            for entry in summary["entries"]:
+                durations.setdefault(summary["page"], {}).setdefault(resource_key(entry["name"]), []).append(entry["duration"])
+        return {page: {key: median(values) for key, values in resources.items()} for page, resources in durations.items()}
+
+    def analyze(self):
+        """Get one summary per page object class"""
+        medians = self.resource_medians()
+        pages = {}
+        for summary in self.summaries:
+            pages.setdefault(summary["page"], []).append(summary)
+
+        results = []
+        for page_name, summaries in sorted(pages.items()):
+            sizes = {}
+            blocking = set()
+            for summary in summaries:
+                for entry in summary["entries"]:
+                    key = resource_key(entry["name"])
+                    sizes[key] = max(sizes.get(key, 0), entry["transfer"], entry["decoded"])
+                blocking.update(resource_key(entry["name"]) for entry in summary["blocking"] if entry["type"] == "script")
+            ratios = [summary["cache_hit_ratio"] for summary in summaries if summary["cache_hit_ratio"] is not None]
+            total_transfer = sum(summary["transfer"] for summary in summaries)
+            total_count = sum(summary["count"] for summary in summaries)
+            loads = [summary["load_event"] for summary in summaries if summary["load_event"]]
+
+            slowed = []
+            if self.baseline is not None:
+                for key, duration in medians.get(page_name, {}).items():
+                    previous = self.baseline.get(page_name, key)
+                    if previous is not None and duration - previous > Config.WATERFALL_SLOWDOWN_MS:
+                        slowed.append((key, previous, duration))
+                slowed.sort(key=lambda item: item[1] - item[2])
+
+            results.append({
+                "page": page_name,
+                "visits": len(summaries),
+                "load_event": median(loads) if loads else None,
+                "resources": total_count / len(summaries),
+                "transfer": total_transfer / len(summaries),
+                "slowest": sorted(medians.get(page_name, {}).items(), key=lambda item: -item[1])[:self.top],
+                "largest": sorted(sizes.items(), key=lambda item: -item[1])[:self.top],
+                "blocking_scripts": sorted(blocking),
+                "cache_hit_ratio": sum(ratios) / len(ratios) if ratios else None,
+                "third_party_share": sum(summary["third_party_count"] for summary in summaries) / total_count if total_count else 0.0,
+                "third_party_transfer_share": (
+                    sum(summary["third_party_transfer"] for summary in summaries) / total_transfer if total_transfer else 0.0
+                ),
+                "slowed": slowed[:self.top]
+            })
+        return results
+
+    @staticmethod
+    def format(results):
+        """Build a text report from analyze() results"""
+        lines = []
+        for result in results:
+            load = f"{result['load_event']:.0f} ms load" if result["load_event"] else "load n/a"
+            cache = f"{result['cache_hit_ratio']:.0%}" if result["cache_hit_ratio"] is not None else "n/a"
+            lines.append(
+                f"{result['page']}: {result['visits']} visit(s), {load}, {result['resources']:.0f} resources, "
+                f"{result['transfer'] / 1024:.0f} KB, cache hits {cache}, third-party {result['third_party_share']:.0%} "
+                f"of requests / {result['third_party_transfer_share']:.0%} of bytes"
+            )
+            for key, previous, duration in result["slowed"]:
+                lines.append(f"  SLOWER {previous:8.0f} -> {duration:8.0f} ms  {key}")
+            for key, duration in result["slowest"]:
+                lines.append(f"  slow   {duration:8.0f} ms  {key}")
+            for key, size in result["largest"]:
+                lines.append(f"  large  {size / 1024:8.0f} KB  {key}")
+            for key in result["blocking_scripts"]:
+                lines.append(f"  render-blocking script  {key}")
+        return lines
+
+class WaterfallRecorder:
+    """Captures the resource waterfall after each go_to_url and keeps it until the test reports it"""
+
+    _prepared = set()
+    _pending = {}
+
+    @staticmethod
+    def prepare(driver):
+        """Raise the Resource Timing buffer size for documents loaded from now on (CDP only)"""
+        session = driver.session_id
+        if session in WaterfallRecorder._prepared or not hasattr(driver, "execute_cdp_cmd"):
+            return
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": RESOURCE_BUFFER_SCRIPT})
+            WaterfallRecorder._prepared.add(session)
+        except Exception as e:
+            print(f"Failed to raise the resource timing buffer: {str(e)}")
+
+    @staticmethod
+    def capture(driver, page_name):
+        """Read the current page's resource timings"""
+        try:
+            visit = driver.execute_script(RESOURCE_WATERFALL_SCRIPT)
+        except Exception as e:
+            print(f"Failed to capture resource waterfall: {str(e)}")
+            return None
+        visit["page"] = page_name
+        WaterfallRecorder._pending.setdefault(driver.session_id, []).append(visit)
+        return visit
+
+    @staticmethod
+    def take(driver):
+        """Get and forget every visit captured since the last call"""
+        return WaterfallRecorder._pending.pop(getattr(driver, "session_id", None), [])
+
+class WaterfallReport:
+    """Pytest plugin storing the run's waterfalls and summarizing them per page object (controller)"""
+
+    def __init__(self, output_dir=None, baseline=None):
+        self.output_dir = output_dir or Config.WATERFALL_DIR
+        self.baseline = baseline or ResourceBaseline()
+        self.visits = []
+        self.reused = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        self.visits.extend(
+            dict(value, nodeid=report.nodeid) for key, value in report.user_properties if key == "waterfall"
+        )
+        for key, value in report.user_properties:
+            if key == "reused_pages":
+                for page_name in value:
+                    self.reused[page_name] = self.reused.get(page_name, 0) + 1
+
+    def save(self):
+        """Write every visit, compact entries included, to waterfalls.json.gz"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        output_file = os.path.join(self.output_dir, "waterfalls.json.gz")
+        with gzip.open(output_file, "wt", encoding="utf-8") as file:
+            json.dump({"fields": WATERFALL_FIELDS, "visits": self.visits}, file, separators=(",", ":"))
+        return output_file
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.visits and not self.reused:
+            return
+        terminalreporter.section("resource waterfall")
+        analyzer = WaterfallAnalyzer(self.visits, self.baseline.load())
+        for line in analyzer.format(analyzer.analyze()):
+            terminalreporter.write_line(line)
+        if self.reused:
+            reused = ", ".join(f"{page_name} x{count}" for page_name, count in sorted(self.reused.items()))
+            terminalreporter.write_line(f"Reused without a new waterfall: {reused}")
+        if not self.visits:
+            return
+        try:
+            terminalreporter.write_line(f"Waterfalls: {self.save()}")
+            self.baseline.record(analyzer.resource_medians())
+            self.baseline.save()
+        except Exception as e:
+            terminalreporter.write_line(f"Failed to save waterfalls: {str(e)}")
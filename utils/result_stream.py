@@ -0,0 +1,179 @@
+"""
+Streaming JSONL test results and a small live progress server
+"""
+import heapq
+import glob
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from config.settings import Config
+from utils.screenshots import get_worker_id
+
+def read_results(stream_dir=None):
+    """Yield the records of every worker stream, merged in time order"""
+    stream_dir = stream_dir or Config.RESULTS_STREAM_DIR
+
+    def read_stream(path):
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                # A worker may be mid-write on its last line
+                if line.endswith("\n"):
+                    yield json.loads(line)
+
+    streams = [read_stream(path) for path in sorted(glob.glob(os.path.join(stream_dir, "*.jsonl")))]
+    return heapq.merge(*streams, key=lambda record: record["ts"])
+
+def clear_results(stream_dir=None):
+    """Remove the streams of a previous run"""
+    for path in glob.glob(os.path.join(stream_dir or Config.RESULTS_STREAM_DIR, "*.jsonl")):
+        os.remove(path)
+
+class ResultStreamWriter:
+    """Pytest plugin appending one JSON line per test phase to this process's stream file
+
+    Every xdist worker owns its file, so writers never interleave; readers merge
+    the files by timestamp.
+    """
+
+    def __init__(self, stream_dir=None):
+        self.stream_dir = stream_dir or Config.RESULTS_STREAM_DIR
+        self.worker = get_worker_id()
+        self.path = os.path.join(self.stream_dir, f"{self.worker}.jsonl")
+        self.file = None
+
+    def write(self, record):
+        if self.file is None:
+            os.makedirs(self.stream_dir, exist_ok=True)
+            # Line buffered append: each record reaches the file as soon as it is written
+            self.file = open(self.path, "a", buffering=1, encoding="utf-8")
+        self.file.write(json.dumps(record) + "\n")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        report = outcome.get_result()
+        record = {
+            "ts": time.time(),
+            "nodeid": report.nodeid,
+            "when": report.when,
+            "outcome": report.outcome,
+            "duration": round(report.duration, 4),
+            "worker": self.worker,
+            "markers": sorted({marker.name for marker in item.iter_markers()}),
+            "artifacts": [value for key, value in item.user_properties if key == "artifact"]
+        }
+        if report.failed:
+            record["message"] = str(getattr(report, "longreprtext", ""))[-2000:]
+        self.write(record)
+
+    def pytest_sessionfinish(self, session):
+        if self.file is not None:
+            self.file.close()
+
+class ProgressServer:
+    """Pytest plugin serving live run progress over HTTP on localhost (main process only)"""
+
+    def __init__(self, port, recent=50):
+        self.port = port
+        self.started = time.time()
+        self.total = None
+        self.counts = {"passed": 0, "failed": 0, "skipped": 0, "error": 0}
+        self.recent = deque(maxlen=recent)
+        self.finished = False
+        self._lock = threading.Lock()
+        self._server = None
+
+    def pytest_sessionstart(self, session):
+        progress = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/progress"):
+                    self._send(json.dumps(progress.snapshot()), "application/json")
+                elif self.path.startswith("/results.jsonl"):
+                    lines = "".join(json.dumps(record) + "\n" for record in read_results())
+                    self._send(lines, "application/x-ndjson")
+                elif self.path == "/":
+                    self._send(PROGRESS_PAGE, "text/html")
+                else:
+                    self.send_error(404)
+
+            def _send(self, body, content_type):
+                data = body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="progress-server", daemon=True).start()
+        print(f"\nLive progress: http://127.0.0.1:{self._server.server_address[1]}/")
+
+    def pytest_collection_finish(self, session):
+        self.total = len(session.items)
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_xdist_node_collection_finished(self, node, ids):
+        self.total = len(ids)
+
+    def pytest_runtest_logreport(self, report):
+        if report.when == "call" or report.failed or report.skipped:
+            outcome = "error" if report.failed and report.when != "call" else report.outcome
+            if outcome in self.counts:
+                with self._lock:
+                    self.counts[outcome] += 1
+                    self.recent.append({"nodeid": report.nodeid, "outcome": outcome, "duration": round(report.duration, 3)})
+
+    def pytest_sessionfinish(self, session):
+        self.finished = True
+
+    def pytest_unconfigure(self, config):
+        if self._server is not None:
+            self._server.shutdown()
+            # Release the port: the runner daemon runs the next session in this process
+            self._server.server_close()
+            self._server = None
+
+    def snapshot(self):
+        with self._lock:
+            done = sum(self.counts.values())
+            return {
+                "total": self.total,
+                "done": done,
+                "counts": dict(self.counts),
+                "elapsed": round(time.time() - self.started, 1),
+                "finished": self.finished,
+                "recent": list(self.recent)
+            }
+
+PROGRESS_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Test Progress</title></head>
+<body style="font-family:sans-serif">
+<h2>Test Progress</h2><pre id="summary">loading...</pre><ol id="recent" reversed></ol>
+<script>
+function refresh() {
+    fetch('/progress').then(function (response) { return response.json(); }).then(function (data) {
+        document.getElementById('summary').textContent =
+            data.done + '/' + (data.total === null ? '?' : data.total) + ' done in ' + data.elapsed + 's  ' +
+            JSON.stringify(data.counts) + (data.finished ? '  (finished)' : '');
+        var list = document.getElementById('recent');
+        list.innerHTML = '';
+        data.recent.slice().reverse().forEach(function (result) {
+            var row = document.createElement('li');
+            row.textContent = result.outcome.toUpperCase() + '  ' + result.nodeid + '  ' + result.duration + 's';
+            list.appendChild(row);
+        });
+    });
+}
+refresh();
+setInterval(refresh, 2000);
+</script></body></html>
+"""
@@ -0,0 +1,197 @@
+"""
+Persistent test runner daemon with a warm interpreter and warm browsers
+
+The daemon imports selenium, pytest and its plugins once, keeps drivers alive
+in DriverPool between runs, and executes pytest.main for each selection a
+client sends over a local socket. Project modules (pages, tests, utils,
+config) are dropped from sys.modules before every run, so edits are picked
+up without restarting the daemon.
+"""
+import io
+import os
+import secrets
+import subprocess
+import sys
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from config.settings import Config
+
+# Heavy third-party modules imported once when the daemon starts
+PRELOAD_MODULES = [
+    "pytest", "selenium.webdriver", "selenium.webdriver.support.ui",
+    "selenium.webdriver.common.action_chains", "webdriver_manager.chrome",
+    "webdriver_manager.firefox", "pytest_html", "xdist", "pytest_rerunfailures", "pytest_metadata"
+]
+
+# Modules holding state that has to survive between runs
+PERSISTENT_MODULES = {"utils.driver_pool", "utils.runner_daemon", "__main__"}
+
+def get_address():
+    return ("127.0.0.1", Config.DAEMON_PORT)
+
+def get_key_path():
+    return os.path.join(PROJECT_ROOT, Config.HISTORY_DIR, "daemon.key")
+
+class ConnectionWriter(io.TextIOBase):
+    """File-like object that streams writes to the client until it disconnects"""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.connected = True
+
+    def write(self, text):
+        if text and self.connected:
+            try:
+                self.connection.send(("output", text))
+            except (OSError, EOFError):
+                # The client went away (e.g. Ctrl+C in watch mode): let the run finish quietly
+                self.connected = False
+        return len(text)
+
+    def isatty(self):
+        return False
+
+class RunnerDaemon:
+    """Serves pytest runs from a long-lived interpreter"""
+
+    def __init__(self):
+        self.running = True
+
+    def serve(self):
+        """Preload heavy imports and handle client requests until stopped"""
+        self._preload()
+
+        authkey = secrets.token_bytes(32)
+        key_path = get_key_path()
+        os.makedirs(os.path.dirname(key_path), exist_ok=True)
+        with open(key_path, "wb") as file:
+            file.write(authkey)
+        os.chmod(key_path, 0o600)
+
+        from utils.driver_pool import DriverPool
+        DriverPool.keep_alive = True
+
+        print(f"Runner daemon listening on {get_address()[0]}:{get_address()[1]} (pid {os.getpid()})")
+        try:
+            with Listener(get_address(), authkey=authkey) as listener:
+                while self.running:
+                    try:
+                        with listener.accept() as connection:
+                            self._handle(connection)
+                    except (OSError, EOFError, AuthenticationError) as e:
+                        # A client that disconnects or fails to authenticate must not stop the daemon
+                        print(f"Client connection lost: {str(e)}")
+        finally:
+            DriverPool.quit_all()
+            if os.path.exists(key_path):
+                os.remove(key_path)
+
+    def _preload(self):
+        """Import everything that is expensive but does not change between runs"""
+        started = time.perf_counter()
+        for module in PRELOAD_MODULES:
+            try:
+                __import__(module)
+            except ImportError as e:
+                print(f"Could not preload {module}: {str(e)}")
+        print(f"Preloaded imports in {time.perf_counter() - started:.2f}s")
+
+    def _handle(self, connection):
+        command, payload = connection.recv()
+        if command == "run":
+            connection.send(("exit", self._run(payload, connection)))
+        elif command == "status":
+            from utils.driver_pool import DriverPool
+            connection.send(("status", {"pid": os.getpid(), "warm_drivers": list(DriverPool._drivers)}))
+        elif command == "stop":
+            self.running = False
+            connection.send(("stopped", os.getpid()))
+
+    def _run(self, pytest_args, connection):
+        """Run pytest with the given arguments, streaming output to the client"""
+        import pytest
+        from contextlib import redirect_stdout, redirect_stderr
+
+        self._purge_project_modules()
+        writer = ConnectionWriter(connection)
+        os.chdir(PROJECT_ROOT)
+        with redirect_stdout(writer), redirect_stderr(writer):
+            try:
+                return int(pytest.main(list(pytest_args)))
+            except Exception as e:
+                print(f"Runner daemon error: {str(e)}")
+                return 3
+
+    @staticmethod
+    def _purge_project_modules():
+        """Drop project modules so the next run imports the current source"""
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None) or ""
+            if name not in PERSISTENT_MODULES and os.path.abspath(path).startswith(PROJECT_ROOT + os.sep):
+                del sys.modules[name]
+
+class DaemonClient:
+    """Talks to a running runner daemon"""
+
+    def _connect(self):
+        with open(get_key_path(), "rb") as file:
+            authkey = file.read()
+        return Client(get_address(), authkey=authkey)
+
+    def is_running(self):
+        try:
+            return self.status() is not None
+        except (OSError, EOFError, AuthenticationError):
+            return False
+
+    def run(self, pytest_args, output=None):
+        """Run pytest in the daemon and stream its output; returns the exit code"""
+        output = output or sys.stdout
+        with self._connect() as connection:
+            connection.send(("run", list(pytest_args)))
+            while True:
+                kind, value = connection.recv()
+                if kind == "output":
+                    output.write(value)
+                    output.flush()
+                else:
+                    return value
+
+    def status(self):
+        with self._connect() as connection:
+            connection.send(("status", None))
+            return connection.recv()[1]
+
+    def stop(self):
+        with self._connect() as connection:
+            connection.send(("stop", None))
+            return connection.recv()[1]
+
+def start_daemon():
+    """Start the daemon in the background and wait until it accepts connections"""
+    log_path = os.path.join(PROJECT_ROOT, Config.HISTORY_DIR, "daemon.log")
+    os.makedirs(os.path.dirname(log_path), exist_ok=True)
+    with open(log_path, "a") as log:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "utils.runner_daemon"],
+            cwd=PROJECT_ROOT, stdout=log, stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL, start_new_session=True
+        )
+
+    client = DaemonClient()
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Runner daemon exited with code {process.returncode}, see {log_path}")
+        if os.path.exists(get_key_path()) and client.is_running():
+            return process.pid
+        time.sleep(0.2)
+    raise RuntimeError(f"Runner daemon did not start within 60 seconds, see {log_path}")
+
+if __name__ == "__main__":
+    RunnerDaemon().serve()
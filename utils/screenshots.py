@@ -0,0 +1,245 @@
+"""
+Screenshot pipeline: fast capture, then compression, deduplication and disk writes on a background thread
+"""
+import atexit
+import base64
+import functools
+import hashlib
+import importlib.util
+import io
+import itertools
+import os
+import queue
+import re
+import shutil
+import threading
+from datetime import datetime
+from config.settings import Config
+
+_counter = itertools.count()
+
+# Viewport and document geometry plus the bounding boxes of groups of elements, in one round trip
+ELEMENT_GEOMETRY_SCRIPT = """
+var root = document.documentElement;
+return {
+    dpr: window.devicePixelRatio || 1,
+    scroll_x: window.scrollX,
+    scroll_y: window.scrollY,
+    width: window.innerWidth,
+    height: window.innerHeight,
+    page_width: Math.max(root.scrollWidth, document.body ? document.body.scrollWidth : 0),
+    page_height: Math.max(root.scrollHeight, document.body ? document.body.scrollHeight : 0),
+    rects: arguments[0].map(function (elements) {
+        return elements.map(function (element) {
+            var rect = element.getBoundingClientRect();
+            return [rect.left, rect.top, rect.width, rect.height];
+        });
+    })
+};
+"""
+
+# Pillow is imported on first use, not when this module is: page objects and
+# conftest import it through utils.helpers during collection.
+@functools.lru_cache(maxsize=None)
+def pillow_available():
+    """Check if Pillow is installed, without importing it"""
+    return importlib.util.find_spec("PIL") is not None
+
+def load_image_module():
+    """Import and return PIL.Image (None without Pillow)"""
+    if not pillow_available():
+        return None
+    from PIL import Image
+    return Image
+
+def get_worker_id():
+    """Get the xdist worker id ('main' outside xdist)"""
+    return os.getenv("PYTEST_XDIST_WORKER", "main")
+
+def safe_name(value):
+    """Make a string safe to use in file names"""
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", value).strip("_") or "screenshot"
+
+def build_screenshot_path(name, extension, test_name=None):
+    """Build a collision-free path: <dir>/<worker>/<test>/<name>_<timestamp>_<pid>-<seq>.<ext>"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    directory = os.path.join(Config.SCREENSHOT_DIR, safe_name(get_worker_id()))
+    if test_name:
+        directory = os.path.join(directory, safe_name(test_name))
+    filename = f"{safe_name(name)}_{timestamp}_{os.getpid()}-{next(_counter)}.{extension}"
+    return os.path.join(directory, filename)
+
+def capture_screenshot_bytes(driver, image_format="png", quality=None, clip=None, full_page=False):
+    """Capture a screenshot as bytes, over CDP when the driver supports it
+
+    Returns (bytes, format); the format falls back to png when CDP is unavailable.
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        params = {"format": image_format, "captureBeyondViewport": full_page}
+        if quality is not None and image_format in ("jpeg", "webp"):
+            params["quality"] = quality
+        if clip:
+            params["clip"] = dict({"scale": 1}, **clip)
+        try:
+            data = driver.execute_cdp_cmd("Page.captureScreenshot", params)["data"]
+            return base64.b64decode(data), image_format
+        except Exception:
+            pass
+    return driver.get_screenshot_as_png(), "png"
+
+def element_geometry(driver, groups):
+    """Get the viewport geometry and the [left, top, width, height] viewport rects of groups of elements"""
+    return driver.execute_script(ELEMENT_GEOMETRY_SCRIPT, [list(elements) for elements in groups])
+
+def crop_element_images(driver, rects, geometry, elements=None):
+    """Crop viewport rects (CSS pixels, as from element_geometry) out of a single capture
+
+    The viewport is captured when every rect is visible; otherwise CDP captures
+    the part of the page spanning all of them. Rects are scaled by the device
+    pixel ratio. Returns one Pillow image per rect, None for empty ones.
+    """
+    Image = load_image_module()
+    dpr = geometry["dpr"]
+    boxes = [
+        (left, top, left + width, top + height) if width > 0 and height > 0 else None
+        for left, top, width, height in rects
+    ]
+    visible = [box for box in boxes if box is not None]
+    if not visible:
+        return [None] * len(boxes)
+
+    in_viewport = all(
+        x0 >= 0 and y0 >= 0 and x1 <= geometry["width"] and y1 <= geometry["height"] for x0, y0, x1, y1 in visible
+    )
+    if in_viewport:
+        data, _ = capture_screenshot_bytes(driver, "png")
+        origin = (0, 0)
+    elif hasattr(driver, "execute_cdp_cmd"):
+        # Clip in document coordinates: the union of the rects, wherever the page is scrolled
+        x0 = max(0, min(box[0] for box in visible) + geometry["scroll_x"])
+        y0 = max(0, min(box[1] for box in visible) + geometry["scroll_y"])
+        x1 = min(geometry.get("page_width") or float("inf"), max(box[2] for box in visible) + geometry["scroll_x"])
+        y1 = min(geometry.get("page_height") or float("inf"), max(box[3] for box in visible) + geometry["scroll_y"])
+        clip = {"x": x0, "y": y0, "width": max(1, x1 - x0), "height": max(1, y1 - y0)}
+        data, _ = capture_screenshot_bytes(driver, "png", clip=clip, full_page=True)
+        origin = (x0 - geometry["scroll_x"], y0 - geometry["scroll_y"])
+    elif elements is not None:
+        # No CDP and not all on screen: fall back to one element screenshot each
+        return [
+            Image.open(io.BytesIO(element.screenshot_as_png)) if box is not None else None
+            for box, element in zip(boxes, elements)
+        ]
+    else:
+        data, _ = capture_screenshot_bytes(driver, "png")
+        origin = (0, 0)
+
+    capture = Image.open(io.BytesIO(data))
+    capture.load()
+    origin_x, origin_y = origin
+    crops = []
+    for box in boxes:
+        if box is None:
+            crops.append(None)
+            continue
+        x0 = max(0, int(round((box[0] - origin_x) * dpr)))
+        y0 = max(0, int(round((box[1] - origin_y) * dpr)))
+        x1 = min(capture.width, int(round((box[2] - origin_x) * dpr)))
+        y1 = min(capture.height, int(round((box[3] - origin_y) * dpr)))
+        crops.append(capture.crop((x0, y0, x1, y1)) if x1 > x0 and y1 > y0 else None)
+    return crops
+
+class ScreenshotWriter:
+    """Background thread that compresses, deduplicates and writes screenshots"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._written = {}
+        self._thread = threading.Thread(target=self._run, name="screenshot-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, data, source_format, path, target_format):
+        """Queue bytes to be written to path"""
+        self._queue.put((data, source_format, path, target_format))
+
+    def flush(self):
+        """Wait until every queued screenshot is on disk"""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._write(*job)
+            except Exception as e:
+                print(f"Failed to write screenshot {job[2]}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, data, source_format, path, target_format):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        digest = (hashlib.sha1(data).hexdigest(), target_format)
+        existing = self._written.get(digest)
+        if existing and os.path.exists(existing):
+            # Identical frame: link to the stored copy instead of writing it again
+            try:
+                os.link(existing, path)
+            except OSError:
+                shutil.copyfile(existing, path)
+            return
+
+        with open(path, "wb") as file:
+            file.write(self._encode(data, source_format, target_format))
+        self._written[digest] = path
+
+    @staticmethod
+    def _encode(data, source_format, target_format):
+        if not pillow_available() or not Config.SCREENSHOT_COMPRESS:
+            return data
+        if source_format == target_format and target_format != "png":
+            # CDP already encoded jpeg/webp at the requested quality
+            return data
+
+        image = load_image_module().open(io.BytesIO(data))
+        output = io.BytesIO()
+        if target_format == "webp":
+            image.save(output, "WEBP", quality=Config.SCREENSHOT_QUALITY, method=4)
+        elif target_format == "jpeg":
+            image.convert("RGB").save(output, "JPEG", quality=Config.SCREENSHOT_QUALITY, optimize=True)
+        else:
+            image.save(output, "PNG", optimize=True)
+        return output.getvalue()
+
+class ScreenshotPipeline:
+    """Captures on the calling thread and hands the bytes to the shared writer"""
+
+    _writer = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_writer(cls):
+        with cls._lock:
+            if cls._writer is None:
+                cls._writer = ScreenshotWriter()
+                atexit.register(cls._writer.flush)
+            return cls._writer
+
+    @classmethod
+    def capture(cls, driver, name, test_name=None, image_format=None, quality=None, clip=None, full_page=False):
+        """Capture a screenshot and return the path it will be written to"""
+        image_format = image_format or Config.SCREENSHOT_FORMAT
+        quality = quality if quality is not None else Config.SCREENSHOT_QUALITY
+        data, source_format = capture_screenshot_bytes(driver, image_format, quality, clip, full_page)
+
+        # Without Pillow a png capture can only be stored as png
+        target_format = image_format if pillow_available() or source_format == image_format else source_format
+        extension = "jpg" if target_format == "jpeg" else target_format
+        path = build_screenshot_path(name, extension, test_name)
+        cls.get_writer().submit(data, source_format, path, target_format)
+        return path
+
+    @classmethod
+    def flush(cls):
+        """Wait for pending screenshot writes"""
+        if cls._writer is not None:
+            cls._writer.flush()
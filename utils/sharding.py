@@ -0,0 +1,128 @@
+"""
+Historical test durations and balanced sharding across CI nodes
+"""
+import json
+import os
+import statistics
+from config.settings import Config
+
+class DurationStore:
+    """Per-test durations from previous runs, smoothed with an exponential moving average"""
+
+    SMOOTHING = 0.3
+
+    def __init__(self, path=None):
+        self.path = path or Config.DURATIONS_FILE
+        self.durations = {}
+
+    def load(self):
+        """Load stored durations if the file exists"""
+        if os.path.exists(self.path):
+            with open(self.path, "r") as file:
+                self.durations = json.load(file)
+        return self
+
+    def record(self, results):
+        """Fold the durations of a run into the stored averages"""
+        for nodeid, duration in results.items():
+            previous = self.durations.get(nodeid)
+            if previous is None:
+                self.durations[nodeid] = round(duration, 3)
+            else:
+                self.durations[nodeid] = round(previous + self.SMOOTHING * (duration - previous), 3)
+
+    def save(self):
+        """Write the durations to disk"""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "w") as file:
+            json.dump(self.durations, file, indent=1, sort_keys=True)
+
+class DurationRecorder:
+    """Pytest plugin that adds setup, call and teardown time per test to the duration store
+
+    With a report file, the run's own durations are also written there so a
+    sharded run can hand them back to the shared durations file.
+    """
+
+    def __init__(self, store, report_file=None):
+        self.store = store
+        self.report_file = report_file
+        self.results = {}
+
+    def pytest_runtest_logreport(self, report):
+        self.results[report.nodeid] = self.results.get(report.nodeid, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        if self.results:
+            self.store.load()
+            self.store.record(self.results)
+            self.store.save()
+        if self.results and self.report_file:
+            os.makedirs(os.path.dirname(self.report_file) or ".", exist_ok=True)
+            results = {nodeid: round(duration, 3) for nodeid, duration in self.results.items()}
+            with open(self.report_file, "w") as file:
+                json.dump(results, file, indent=1, sort_keys=True)
+
+class ShardPlanner:
+    """Splits tests into N shards of similar total duration"""
+
+    DEFAULT_DURATION = 5.0
+
+    def __init__(self, durations):
+        self.durations = durations
+
+    @staticmethod
+    def parse(value):
+        """Parse an 'i/N' shard spec into a 1-based index and a total"""
+        try:
+            index, total = (int(part) for part in value.split("/"))
+        except ValueError:
+            raise ValueError(f"Invalid shard '{value}', expected i/N (e.g. 1/4)")
+        if total < 1 or not 1 <= index <= total:
+            raise ValueError(f"Invalid shard '{value}', index must be between 1 and {total}")
+        return index, total
+
+    def estimate(self, items):
+        """Estimate the duration of each item, falling back to class and marker averages"""
+        known = [self.durations[item.nodeid] for item in items if item.nodeid in self.durations]
+        fallback = statistics.median(known) if known else self.DEFAULT_DURATION
+
+        by_group = {}
+        for item in items:
+            if item.nodeid in self.durations:
+                for group in self._get_groups(item):
+                    by_group.setdefault(group, []).append(self.durations[item.nodeid])
+
+        estimates = {}
+        for item in items:
+            if item.nodeid in self.durations:
+                estimates[item.nodeid] = self.durations[item.nodeid]
+                continue
+            estimates[item.nodeid] = fallback
+            for group in self._get_groups(item):
+                if group in by_group:
+                    estimates[item.nodeid] = statistics.mean(by_group[group])
+                    break
+        return estimates
+
+    @staticmethod
+    def _get_groups(item):
+        """Groups to borrow an estimate from, most specific first"""
+        groups = [("class", item.nodeid.rsplit("::", 1)[0])]
+        groups.extend(("marker", marker.name) for marker in item.iter_markers())
+        return groups
+
+    def split(self, items, total):
+        """Assign items to shards, longest first onto the least loaded shard"""
+        estimates = self.estimate(items)
+        loads = [0.0] * total
+        shards = [[] for _ in range(total)]
+
+        for item in sorted(items, key=lambda item: -estimates[item.nodeid]):
+            target = loads.index(min(loads))
+            shards[target].append(item)
+            loads[target] += estimates[item.nodeid]
+
+        # Keep the collection order within each shard
+        order = {item.nodeid: position for position, item in enumerate(items)}
+        return [sorted(shard, key=lambda item: order[item.nodeid]) for shard in shards], loads
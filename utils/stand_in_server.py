@@ -0,0 +1,136 @@
+"""
+Local stand-in for the protocol-level endpoints behind our page flows (login, secure area, downloads, uploads)
+"""
+import html
+import re
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+from config.settings import Config
+
+DOWNLOAD_FILES = {
+    "sample.txt": b"sample download\n",
+    "data.csv": b"id,name\n1,alpha\n2,beta\n",
+    "image.png": bytes(2048)
+}
+
+SESSION_COOKIE = "rack.session"
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Mimics the-internet's /login, /authenticate, /secure, /logout, /download and /upload"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle's algorithm the body
+    # waits for the client's delayed ACK (~40ms) on every keep-alive response
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/login":
+            flash = "You logged out of the secure area!" if "logged_out" in self.path else ""
+            self._page("Login Page", f'<div id="flash">{flash}</div>'
+                       '<form id="login" action="/authenticate" method="post">'
+                       '<input id="username" name="username"><input id="password" name="password" type="password">'
+                       '<button class="radius" type="submit">Login</button></form>')
+        elif path == "/secure":
+            if self._session_user() is None:
+                self._redirect("/login")
+            else:
+                self._page("Secure Area", '<div id="flash">You logged into a secure area!</div>'
+                           '<a class="button secondary radius" href="/logout">Logout</a>')
+        elif path == "/logout":
+            self.server.sessions.pop(self._session_token(), None)
+            self._redirect("/login?logged_out", cookie=f"{SESSION_COOKIE}=; Max-Age=0; Path=/")
+        elif path == "/download":
+            links = "".join(f'<a href="download/{name}">{name}</a>' for name in DOWNLOAD_FILES)
+            self._page("File Downloader", f'<div class="example">{links}</div>')
+        elif path.startswith("/download/") and path[len("/download/"):] in DOWNLOAD_FILES:
+            self._send(200, DOWNLOAD_FILES[path[len("/download/"):]], "application/octet-stream")
+        elif path == "/upload":
+            self._page("File Uploader", '<form action="/upload" method="post" enctype="multipart/form-data">'
+                       '<input id="file-upload" type="file" name="file"><input id="file-submit" type="submit"></form>')
+        else:
+            self._send(404, b"Not Found", "text/plain")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path == "/authenticate":
+            form = parse_qs(body.decode("utf-8", "replace"))
+            username = form.get("username", [""])[0]
+            password = form.get("password", [""])[0]
+            if (username, password) == (Config.FORM_AUTH_USERNAME, Config.FORM_AUTH_PASSWORD):
+                token = secrets.token_hex(16)
+                self.server.sessions[token] = username
+                self._redirect("/secure", cookie=f"{SESSION_COOKIE}={token}; Path=/; HttpOnly")
+            else:
+                self._redirect("/login")
+        elif self.path == "/upload":
+            match = re.search(rb'name="file"; filename="([^"]*)"', body)
+            if not match:
+                self._send(500, b"Internal Server Error", "text/plain")
+                return
+            filename = html.escape(match.group(1).decode("utf-8", "replace"))
+            self._page("File Uploaded!", f'<div id="uploaded-files">{filename}</div>')
+        else:
+            self._send(404, b"Not Found", "text/plain")
+
+    def _session_token(self):
+        match = re.search(rf"{re.escape(SESSION_COOKIE)}=([0-9a-f]+)", self.headers.get("Cookie", ""))
+        return match.group(1) if match else None
+
+    def _session_user(self):
+        return self.server.sessions.get(self._session_token())
+
+    def _page(self, title, content):
+        body = f"<!DOCTYPE html><html><head><title>The Internet</title></head><body><h2>{title}</h2>{content}</body></html>"
+        self._send(200, body.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _redirect(self, location, cookie=None):
+        self.send_response(302)
+        self.send_header("Location", location)
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+class StandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+class StandInServer:
+    """Runs the stand-in on a background thread; use as a context manager"""
+
+    def __init__(self, port=0):
+        self.server = StandInHTTPServer(("127.0.0.1", port), StandInHandler)
+        self.server.sessions = {}
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name="stand-in-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
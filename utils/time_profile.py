@@ -0,0 +1,247 @@
+"""
+Per-test wall time breakdown: fixture setup, navigation, explicit waits, WebDriver commands, sleeps and Python
+"""
+import functools
+import os
+import threading
+import time
+import pytest
+from config.settings import Config
+
+BUCKETS = ["setup", "navigation", "wait", "poll", "webdriver", "sleep", "python", "teardown"]
+
+NAVIGATION_COMMANDS = {"get", "refresh", "goBack", "goForward"}
+
+# With an implicit wait set these block in the browser until the element shows up
+FIND_COMMANDS = {"findElement", "findElements", "findChildElement", "findChildElements"}
+FIND_NAMES = {f"webdriver:{command}" for command in FIND_COMMANDS}
+
+# Everything inside these frames is charged to the frame's own bucket
+ENCLOSING_BUCKETS = {"setup", "teardown", "navigation"}
+
+class _Frame:
+    __slots__ = ("path", "bucket", "started", "children")
+
+    def __init__(self, path, bucket):
+        self.path = path
+        self.bucket = bucket
+        self.started = time.perf_counter()
+        self.children = 0.0
+
+class TimeBreakdown:
+    """Exclusive time per bucket and per call stack for one test"""
+
+    def __init__(self, nodeid):
+        self.nodeid = nodeid
+        self.stack = []
+        self.buckets = dict.fromkeys(BUCKETS, 0.0)
+        self.stacks = {}
+
+    def push(self, name, bucket):
+        parent = self.stack[-1] if self.stack else None
+        if parent is not None:
+            if parent.bucket in ENCLOSING_BUCKETS:
+                bucket = parent.bucket
+            elif parent.bucket in ("wait", "poll"):
+                # Inside an explicit wait the sleeps between polls and the finds (which
+                # block for the implicit wait) are waiting; the rest of evaluating the
+                # condition (other WebDriver calls, Python) is poll overhead
+                bucket = "wait" if bucket == "sleep" or name in FIND_NAMES else "poll"
+        path = f"{parent.path};{name}" if parent is not None else name
+        self.stack.append(_Frame(path, bucket))
+
+    def pop(self):
+        frame = self.stack.pop()
+        elapsed = time.perf_counter() - frame.started
+        exclusive = max(0.0, elapsed - frame.children)
+        self.buckets[frame.bucket] += exclusive
+        self.stacks[frame.path] = self.stacks.get(frame.path, 0.0) + exclusive
+        if self.stack:
+            self.stack[-1].children += elapsed
+
+    def to_dict(self):
+        return {
+            "wall": sum(self.buckets.values()),
+            "buckets": self.buckets,
+            "stacks": self.stacks
+        }
+
+class WallTimeProfiler:
+    """Pytest plugin that instruments the framework and attributes each test's wall time to buckets
+
+    Explicit waits (WaitHelpers, WebDriverWait) are split into the time spent
+    sleeping between polls or blocked in element lookups by the implicit wait
+    ('wait') and the time spent evaluating the condition ('poll'). Only the
+    thread running the test is profiled.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._patches = []
+
+    def _timeline(self):
+        return getattr(self._local, "timeline", None)
+
+    def frame(self, name, bucket, function, *args, **kwargs):
+        """Run function(*args, **kwargs) inside a profiled frame"""
+        timeline = self._timeline()
+        if timeline is None:
+            return function(*args, **kwargs)
+        timeline.push(name, bucket)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            timeline.pop()
+
+    def _patch(self, owner, attribute, make_wrapper):
+        original = getattr(owner, attribute)
+        wrapper = functools.wraps(original)(make_wrapper(original))
+        setattr(owner, attribute, wrapper)
+        self._patches.append((owner, attribute, original))
+
+    def install(self):
+        """Wrap the WebDriver, wait, sleep and navigation entry points"""
+        from selenium.webdriver.remote.webdriver import WebDriver
+        from selenium.webdriver.support.ui import WebDriverWait
+        from pages.base_page import BasePage
+        from utils.helpers import WaitHelpers
+
+        profiler = self
+
+        def command(original):
+            def execute(driver, driver_command, params=None):
+                bucket = "navigation" if driver_command in NAVIGATION_COMMANDS else "webdriver"
+                return profiler.frame(f"webdriver:{driver_command}", bucket, original, driver, driver_command, params)
+            return execute
+
+        def named(name, bucket):
+            def make_wrapper(original):
+                def wrapper(*args, **kwargs):
+                    return profiler.frame(name, bucket, original, *args, **kwargs)
+                return wrapper
+            return make_wrapper
+
+        self._patch(WebDriver, "execute", command)
+        self._patch(BasePage, "go_to_url", named("BasePage.go_to_url", "navigation"))
+        for name in [name for name in vars(WaitHelpers) if name.startswith("wait_for_")]:
+            self._patch(WaitHelpers, name, named(f"WaitHelpers.{name}", "poll"))
+        self._patch(WebDriverWait, "until", named("WebDriverWait.until", "poll"))
+        self._patch(WebDriverWait, "until_not", named("WebDriverWait.until_not", "poll"))
+        self._patch(time, "sleep", named("time.sleep", "sleep"))
+
+    def uninstall(self):
+        while self._patches:
+            owner, attribute, original = self._patches.pop()
+            setattr(owner, attribute, original)
+
+    def pytest_configure(self, config):
+        self.install()
+
+    def pytest_unconfigure(self, config):
+        self.uninstall()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(self, item):
+        self._local.timeline = TimeBreakdown(item.nodeid)
+        yield from self._phase("setup", "setup")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        yield from self._phase("call", "python")
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(self, item):
+        yield from self._phase("teardown", "teardown")
+
+    def _phase(self, name, bucket):
+        timeline = self._timeline()
+        if timeline is None:
+            yield
+            return
+        timeline.push(name, bucket)
+        try:
+            yield
+        finally:
+            timeline.pop()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_fixture_setup(self, fixturedef, request):
+        timeline = self._timeline()
+        if timeline is None:
+            yield
+            return
+        timeline.push(f"fixture:{fixturedef.argname}", "setup")
+        try:
+            yield
+        finally:
+            timeline.pop()
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        timeline = self._timeline()
+        if call.when == "teardown" and timeline is not None:
+            item.user_properties.append(("time_profile", timeline.to_dict()))
+            self._local.timeline = None
+        yield
+
+class WallTimeReport:
+    """Pytest plugin printing per-test and aggregate time breakdowns and exporting folded stacks (controller)"""
+
+    def __init__(self, top=None, output_dir=None):
+        self.top = top or Config.PROFILE_TOP
+        self.output_dir = output_dir or Config.PROFILE_DIR
+        self.tests = []
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for key, value in report.user_properties:
+            if key == "time_profile":
+                self.tests.append((report.nodeid, value))
+
+    @staticmethod
+    def _row(label, buckets, wall):
+        cells = "".join(f"{buckets.get(bucket, 0.0):>11.2f}" for bucket in BUCKETS)
+        return f"{wall:>9.2f}{cells}  {label}"
+
+    def format_tables(self):
+        """Build the aggregate and slowest-tests tables (seconds)"""
+        header = f"{'total':>9}" + "".join(f"{bucket:>11}" for bucket in BUCKETS)
+        total_wall = sum(profile["wall"] for _, profile in self.tests)
+        totals = {bucket: sum(profile["buckets"].get(bucket, 0.0) for _, profile in self.tests) for bucket in BUCKETS}
+
+        lines = [f"All {len(self.tests)} tests:", header, self._row("(sum)", totals, total_wall)]
+        if total_wall:
+            shares = "".join(f"{totals[bucket] / total_wall:>11.0%}" for bucket in BUCKETS)
+            lines.append(f"{'':>9}{shares}  (share)")
+
+        slowest = sorted(self.tests, key=lambda test: -test[1]["wall"])[:self.top]
+        lines.extend(["", f"Slowest {len(slowest)} tests:", header])
+        lines.extend(self._row(nodeid, profile["buckets"], profile["wall"]) for nodeid, profile in slowest)
+        return lines
+
+    def export_folded(self, output_file=None):
+        """Write the slowest tests' stacks in folded format (flamegraph.pl, speedscope, inferno)"""
+        output_file = output_file or os.path.join(self.output_dir, "slowest.folded")
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        slowest = sorted(self.tests, key=lambda test: -test[1]["wall"])[:self.top]
+        with open(output_file, "w") as file:
+            for nodeid, profile in slowest:
+                root = nodeid.replace(";", ":").replace(" ", "_")
+                for path, seconds in sorted(profile["stacks"].items()):
+                    microseconds = int(seconds * 1e6)
+                    if microseconds:
+                        file.write(f"{root};{path} {microseconds}\n")
+        return output_file
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.tests:
+            return
+        terminalreporter.section("time breakdown")
+        for line in self.format_tables():
+            terminalreporter.write_line(line)
+        try:
+            output_file = self.export_folded()
+            terminalreporter.write_line(f"Folded stacks of the slowest tests: {output_file}")
+        except Exception as e:
+            terminalreporter.write_line(f"Failed to export folded stacks: {str(e)}")
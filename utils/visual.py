@@ -0,0 +1,215 @@
+"""
+Visual regression checks: CDP capture, fingerprint fast path and vectorized NumPy diff with anti-aliasing tolerance
+"""
+import hashlib
+import io
+import json
+import os
+import pytest
+from config.settings import Config
+from utils.screenshots import capture_screenshot_bytes, crop_element_images, element_geometry, safe_name
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+def dhash(pixels, size=8):
+    """64-bit difference hash of an RGB array, as hex"""
+    small = Image.fromarray(pixels).convert("L").resize((size + 1, size), Image.BILINEAR)
+    grey = np.asarray(small, dtype=np.int16)
+    bits = (grey[:, 1:] > grey[:, :-1]).flatten()
+    return f"{int(''.join('1' if bit else '0' for bit in bits), 2):0{size * size // 4}x}"
+
+def hamming(first, second):
+    """Number of differing bits between two hex hashes"""
+    return bin(int(first, 16) ^ int(second, 16)).count("1")
+
+def fingerprint(pixels):
+    """Exact content digest of an RGB array (shape included)"""
+    return hashlib.sha1(str(pixels.shape).encode("ascii") + pixels.tobytes()).hexdigest()
+
+def apply_masks(pixels, boxes, color=None):
+    """Paint boxes (x0, y0, x1, y1 in image pixels) with a flat color; returns a new array"""
+    masked = pixels.copy()
+    height, width = masked.shape[:2]
+    for x0, y0, x1, y1 in boxes:
+        x0, y0 = max(0, int(x0)), max(0, int(y0))
+        x1, y1 = min(width, int(round(x1))), min(height, int(round(y1)))
+        if x1 > x0 and y1 > y0:
+            masked[y0:y1, x0:x1] = color or Config.VISUAL_MASK_COLOR
+    return masked
+
+def _matched_nearby(source, other, ys, xs, threshold):
+    """True for each source pixel (ys, xs) that is within threshold of a pixel in the 3x3 neighbourhood of other"""
+    height, width = other.shape[:2]
+    pixels = source[ys, xs]
+    matched = np.zeros(len(ys), dtype=bool)
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            neighbours = other[np.clip(ys + dy, 0, height - 1), np.clip(xs + dx, 0, width - 1)]
+            matched |= np.abs(pixels - neighbours).max(axis=1) <= threshold
+    return matched
+
+def diff_mask(expected, actual, threshold=None, anti_aliasing=None):
+    """Boolean array of the pixels that differ by more than threshold in any channel
+
+    With anti-aliasing tolerance a pixel only counts when neither image has a
+    close match for it within one pixel, so edges and text rendered slightly
+    differently are not reported.
+    """
+    threshold = Config.VISUAL_PIXEL_THRESHOLD if threshold is None else threshold
+    anti_aliasing = Config.VISUAL_ANTI_ALIASING if anti_aliasing is None else anti_aliasing
+    expected = expected.astype(np.int16)
+    actual = actual.astype(np.int16)
+    different = np.abs(expected - actual).max(axis=2) > threshold
+    if not anti_aliasing or not different.any():
+        return different
+
+    # Only the differing pixels get the neighbourhood check
+    ys, xs = np.nonzero(different)
+    tolerated = (
+        _matched_nearby(actual, expected, ys, xs, threshold)
+        & _matched_nearby(expected, actual, ys, xs, threshold)
+    )
+    different[ys[tolerated], xs[tolerated]] = False
+    return different
+
+def render_diff(expected, different):
+    """Faded grey copy of the expected image with the differing pixels in red"""
+    grey = expected.astype(np.float32) @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    faded = (grey * 0.3 + 178).astype(np.uint8)
+    image = np.repeat(faded[:, :, None], 3, axis=2)
+    image[different] = (255, 0, 0)
+    return image
+
+def _decode(data):
+    return np.asarray(Image.open(io.BytesIO(data)).convert("RGB"))
+
+def _save(pixels, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    Image.fromarray(pixels).save(path, "PNG")
+
+class VisualCheck:
+    """Compares the page, or regions of it, with baselines kept per browser, viewport and page object"""
+
+    def __init__(self, driver, page_name, test_name=None):
+        if np is None or Image is None:
+            raise RuntimeError("Visual checks need NumPy and Pillow: pip install numpy Pillow")
+        self.driver = driver
+        self.page_name = page_name
+        self.test_name = test_name or os.getenv("PYTEST_CURRENT_TEST", "visual").split(" ")[0]
+
+    def baseline_dir(self, geometry):
+        browser = self.driver.capabilities.get("browserName", "browser")
+        viewport = f"{geometry['width']}x{geometry['height']}@{geometry['dpr']:g}x"
+        return os.path.join(Config.VISUAL_BASELINE_DIR, safe_name(f"{browser}_{viewport}"), safe_name(self.page_name))
+
+    def capture(self, regions=None, masks=()):
+        """Capture [(suffix, pixels)] for the viewport or each region, with the masks painted over"""
+        region_elements = [self.driver.find_element(*locator) for locator in regions or []]
+        mask_elements = [element for locator in masks for element in self.driver.find_elements(*locator)]
+        geometry = element_geometry(self.driver, [region_elements, mask_elements])
+        dpr = geometry["dpr"]
+        region_rects, mask_rects = geometry["rects"]
+
+        images = []
+        if not regions:
+            data, _ = capture_screenshot_bytes(self.driver, "png")
+            pixels = _decode(data)
+            boxes = [(x * dpr, y * dpr, (x + w) * dpr, (y + h) * dpr) for x, y, w, h in mask_rects]
+            images.append(("", apply_masks(pixels, boxes)))
+            return geometry, images
+
+        # Every region is cropped out of one capture
+        crops = crop_element_images(self.driver, region_rects, geometry, region_elements)
+        for index, ((left, top, _, _), crop, locator) in enumerate(zip(region_rects, crops, regions)):
+            if crop is None:
+                raise ValueError(f"Visual region {locator} has no visible area")
+            pixels = np.asarray(crop.convert("RGB"))
+            boxes = [
+                ((x - left) * dpr, (y - top) * dpr, (x + w - left) * dpr, (y + h - top) * dpr)
+                for x, y, w, h in mask_rects
+            ]
+            images.append((f"_region{index + 1}", apply_masks(pixels, boxes)))
+        return geometry, images
+
+    def compare(self, name, pixels, directory):
+        """Compare one image with its baseline; returns a result dict
+
+        'passed' is None when there is no baseline: baselines are only written
+        with --update-visual-baselines (VISUAL_UPDATE).
+        """
+        baseline_file = os.path.join(directory, f"{safe_name(name)}.png")
+        meta_file = os.path.join(directory, f"{safe_name(name)}.json")
+        digest = fingerprint(pixels)
+        perceptual = dhash(pixels)
+        result = {"name": name, "baseline": baseline_file, "passed": True}
+
+        output_dir = os.path.join(Config.VISUAL_DIFF_DIR, safe_name(self.test_name))
+        if Config.VISUAL_UPDATE:
+            _save(pixels, baseline_file)
+            with open(meta_file, "w") as file:
+                json.dump({"sha1": digest, "dhash": perceptual, "size": list(pixels.shape[1::-1])}, file, indent=1)
+            return dict(result, status="baseline updated")
+        if not os.path.exists(baseline_file):
+            # Never compare against a screenshot taken in the same run: keep it for review instead
+            _save(pixels, os.path.join(output_dir, f"{safe_name(name)}_actual.png"))
+            return dict(result, passed=None, status="no baseline", output_dir=output_dir)
+
+        meta = {}
+        if os.path.exists(meta_file):
+            with open(meta_file, "r") as file:
+                meta = json.load(file)
+        if meta.get("sha1") == digest:
+            # Fast path: identical content, the baseline image is not even decoded
+            return dict(result, status="unchanged")
+
+        with open(baseline_file, "rb") as file:
+            expected = _decode(file.read())
+        distance = hamming(meta["dhash"], perceptual) if "dhash" in meta else None
+        if expected.shape != pixels.shape:
+            different = None
+            status = f"size changed {expected.shape[1]}x{expected.shape[0]} -> {pixels.shape[1]}x{pixels.shape[0]}"
+        else:
+            different = diff_mask(expected, pixels)
+            count = int(different.sum())
+            status = f"{count} pixels differ ({count / different.size:.3%})"
+            if count <= Config.VISUAL_MAX_DIFF_PIXELS:
+                return dict(result, status=f"within tolerance ({status})", hash_distance=distance)
+
+        # Diff images are only written for failures
+        _save(pixels, os.path.join(output_dir, f"{safe_name(name)}_actual.png"))
+        _save(expected, os.path.join(output_dir, f"{safe_name(name)}_expected.png"))
+        if different is not None:
+            _save(render_diff(expected, different), os.path.join(output_dir, f"{safe_name(name)}_diff.png"))
+        return dict(result, passed=False, status=status, hash_distance=distance, output_dir=output_dir)
+
+    def check(self, name, regions=None, masks=()):
+        """Compare the viewport, or each region, with its baseline"""
+        geometry, images = self.capture(regions, masks)
+        directory = self.baseline_dir(geometry)
+        return [self.compare(name + suffix, pixels, directory) for suffix, pixels in images]
+
+    def assert_matches(self, name, regions=None, masks=()):
+        """Fail with the differing images' paths if any region does not match its baseline
+
+        Skips, naming the baselines to record, when some are missing and nothing differs.
+        """
+        results = self.check(name, regions, masks)
+        failures = [result for result in results if result["passed"] is False]
+        assert not failures, "Visual differences:\n" + "\n".join(
+            f"{result['name']}: {result['status']} (perceptual hash distance {result['hash_distance']}), see {result['output_dir']}"
+            for result in failures
+        )
+        missing = [result for result in results if result["passed"] is None]
+        if missing:
+            pytest.skip("No visual baseline for " + ", ".join(
+                f"{result['baseline']} (screenshot in {result['output_dir']})" for result in missing
+            ) + "; record it with --update-visual-baselines")
+        return results
@@ -0,0 +1,246 @@
+"""
+Watch mode support: file change notification and selection of affected tests
+"""
+import ast
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from config.settings import Config
+from utils.impact import PROJECT_ROOT, ImpactIndex, relative_path
+
+class FileWatcher:
+    """Reports changed files under a set of directories, via inotify where available"""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_MODIFY
+    EVENT_HEADER = struct.Struct("iIII")
+
+    IGNORED_SUFFIXES = (".pyc", ".swp", "~")
+
+    def __init__(self, directories, debounce=0.3, poll_interval=0.5):
+        self.directories = [os.path.join(PROJECT_ROOT, directory) for directory in directories]
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self._watches = {}
+        self._fd = self._init_inotify()
+        self._snapshot = None if self._fd is not None else self._take_snapshot()
+
+    @property
+    def uses_inotify(self):
+        return self._fd is not None
+
+    def _init_inotify(self):
+        if not sys.platform.startswith("linux"):
+            return None
+        try:
+            self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        self._fd = fd
+        for directory in self.directories:
+            for root, dirs, _ in os.walk(directory):
+                dirs[:] = [name for name in dirs if name != "__pycache__"]
+                self._add_watch(root)
+        return fd
+
+    def _add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.WATCH_MASK)
+        if wd >= 0:
+            self._watches[wd] = path
+
+    def _take_snapshot(self):
+        snapshot = {}
+        for directory in self.directories:
+            for root, dirs, files in os.walk(directory):
+                dirs[:] = [name for name in dirs if name != "__pycache__"]
+                for filename in files:
+                    path = os.path.join(root, filename)
+                    try:
+                        snapshot[path] = os.stat(path).st_mtime_ns
+                    except OSError:
+                        pass
+        return snapshot
+
+    def wait_for_changes(self):
+        """Block until files change, then return their project-relative paths"""
+        changed = set()
+        while not changed:
+            changed = self._read_inotify(None) if self.uses_inotify else self._poll()
+        # Collect the rest of a burst of saves (editors often write several times)
+        deadline = time.time() + self.debounce
+        while time.time() < deadline:
+            more = self._read_inotify(self.debounce) if self.uses_inotify else self._poll()
+            changed |= more
+        return {relative_path(path) for path in changed if not path.endswith(self.IGNORED_SUFFIXES)}
+
+    def _read_inotify(self, timeout):
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        data = os.read(self._fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode(errors="replace")
+            offset += length
+
+            path = os.path.join(self._watches.get(wd, ""), name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                    self._add_watch(path)
+            elif name:
+                changed.add(path)
+        return changed
+
+    def _poll(self):
+        time.sleep(self.poll_interval)
+        snapshot = self._take_snapshot()
+        changed = {
+            path for path in set(snapshot) | set(self._snapshot)
+            if snapshot.get(path) != self._snapshot.get(path)
+        }
+        self._snapshot = snapshot
+        return changed
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+class AffectedTestFinder:
+    """Maps changed files to the test files or node ids that import or use them"""
+
+    SOURCE_DIRS = ("pages", "tests", "utils", "config")
+
+    def __init__(self, test_dir="tests"):
+        self.test_dir = test_dir
+
+    def find(self, changed_paths):
+        """Get pytest targets for the changed files (empty if nothing is affected)"""
+        dependents = self._get_reverse_imports()
+        index = ImpactIndex().load()
+        targets = set()
+
+        for path in changed_paths:
+            name = os.path.basename(path)
+            if path.startswith(f"{self.test_dir}/") and name == "conftest.py":
+                return [self.test_dir]
+            if path.startswith(f"{self.test_dir}/") and name.startswith("test_") and path.endswith(".py"):
+                if os.path.exists(os.path.join(PROJECT_ROOT, path)):
+                    targets.add(path)
+            elif path.endswith(".py"):
+                test_files = self._get_test_files(path, dependents)
+                if test_files is None:
+                    return [self.test_dir]
+                targets.update(self._narrow(path, test_files, index))
+            elif path.startswith("test_data/"):
+                targets.update(self._get_data_users(name, dependents) or [self.test_dir])
+        return sorted(targets)
+
+    def _get_test_files(self, path, dependents):
+        """Test files that import the module at path, directly or transitively
+
+        None when a conftest or another run-wide file (Config.IMPACT_FULL_RUN_PATHS)
+        imports it: those affect every test, so the whole suite has to run.
+        """
+        seen = set()
+        pending = [path]
+        while pending:
+            current = pending.pop()
+            for dependent in dependents.get(current, ()):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    pending.append(dependent)
+        if any(self._is_run_wide(dependent) for dependent in seen):
+            return None
+        return {
+            candidate for candidate in seen
+            if candidate.startswith(f"{self.test_dir}/") and os.path.basename(candidate).startswith("test_")
+        }
+
+    @staticmethod
+    def _is_run_wide(path):
+        if os.path.basename(path) == "conftest.py":
+            return True
+        return any(path == prefix or path.startswith(prefix) for prefix in Config.IMPACT_FULL_RUN_PATHS)
+
+    def _narrow(self, path, test_files, index):
+        """Use the impact index, where it covers a test file, to pick single tests
+
+        The index only records page object and test symbols, so changes to
+        any other module keep every test of the files importing it.
+        """
+        if not path.startswith(("pages/", f"{self.test_dir}/")):
+            return set(test_files)
+        targets = set()
+        for test_file in test_files:
+            recorded = {nodeid: symbols for nodeid, symbols in index.tests.items() if nodeid.startswith(test_file + "::")}
+            if not recorded:
+                targets.add(test_file)
+                continue
+            targets.update(
+                nodeid for nodeid, symbols in recorded.items()
+                if any(symbol == path or symbol.startswith(path + "::") for symbol in symbols)
+            )
+        return targets
+
+    def _get_data_users(self, filename, dependents):
+        """Test files whose own source or imported modules mention a test data file"""
+        users = set()
+        for source in self._iter_sources():
+            with open(os.path.join(PROJECT_ROOT, source), "r", encoding="utf-8") as file:
+                if filename not in file.read():
+                    continue
+            if source.startswith(f"{self.test_dir}/"):
+                users.add(source)
+            users.update(self._get_test_files(source, dependents))
+        return users
+
+    def _iter_sources(self):
+        for directory in self.SOURCE_DIRS:
+            for root, dirs, files in os.walk(os.path.join(PROJECT_ROOT, directory)):
+                dirs[:] = [name for name in dirs if name != "__pycache__"]
+                for filename in files:
+                    if filename.endswith(".py"):
+                        yield relative_path(os.path.join(root, filename))
+
+    def _get_reverse_imports(self):
+        """Map each project file to the project files importing it"""
+        modules = {}
+        for source in self._iter_sources():
+            modules[source[:-3].replace("/", ".")] = source
+
+        dependents = {}
+        for source in modules.values():
+            with open(os.path.join(PROJECT_ROOT, source), "r", encoding="utf-8") as file:
+                try:
+                    tree = ast.parse(file.read())
+                except SyntaxError:
+                    continue
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    names = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom) and node.module:
+                    names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+                else:
+                    continue
+                for name in names:
+                    if name in modules:
+                        dependents.setdefault(modules[name], set()).add(source)
+        return dependents
@@ -0,0 +1,188 @@
+"""
+Core Web Vitals (LCP, CLS, TBT, INP) per page visit, tracked per page object
+"""
+from utils.page_metrics import PageMetricsRecorder
+from utils.perf_sampling import percentile
+
+VITALS = ["lcp", "cls", "tbt", "inp"]
+
+# Registered before any page script runs (Page.addScriptToEvaluateOnNewDocument),
+# so nothing is missed between navigation start and the first WebDriver call.
+# A summary is parked in sessionStorage on pagehide, so pages left through a
+# click or form submit are still reported when the vitals are read next.
+WEB_VITALS_OBSERVER_SCRIPT = """
+(function () {
+    if (window !== window.top || window.__webVitals) {
+        return;
+    }
+    var state;
+    function reset() {
+        state = window.__webVitals = {
+            lcp: null, fcp: state ? state.fcp : null, cls: 0, clsWindow: 0, clsStart: -Infinity, clsLast: -Infinity,
+            longTasks: [], interactions: {}
+        };
+    }
+    reset();
+    function observe(type, callback, options) {
+        try {
+            var init = {type: type, buffered: true};
+            for (var key in options || {}) { init[key] = options[key]; }
+            new PerformanceObserver(function (list) { list.getEntries().forEach(callback); }).observe(init);
+        } catch (e) {}
+    }
+    observe('paint', function (entry) {
+        if (entry.name === 'first-contentful-paint') { state.fcp = entry.startTime; }
+    });
+    observe('largest-contentful-paint', function (entry) { state.lcp = entry.startTime; });
+    observe('layout-shift', function (entry) {
+        if (entry.hadRecentInput) { return; }
+        // Session windows: shifts less than 1s apart within 5s; CLS is the worst window
+        if (entry.startTime - state.clsLast > 1000 || entry.startTime - state.clsStart > 5000) {
+            state.clsStart = entry.startTime;
+            state.clsWindow = 0;
+        }
+        state.clsWindow += entry.value;
+        state.clsLast = entry.startTime;
+        state.cls = Math.max(state.cls, state.clsWindow);
+    });
+    observe('longtask', function (entry) { state.longTasks.push([entry.startTime, entry.duration]); });
+    observe('event', function (entry) {
+        if (entry.interactionId) {
+            state.interactions[entry.interactionId] = Math.max(state.interactions[entry.interactionId] || 0, entry.duration);
+        }
+    }, {durationThreshold: 16});
+
+    window.__webVitalsSummary = function () {
+        var tbt = 0;
+        state.longTasks.forEach(function (task) {
+            if (state.fcp === null || task[0] >= state.fcp) { tbt += Math.max(0, task[1] - 50); }
+        });
+        var latencies = Object.keys(state.interactions).map(function (id) { return state.interactions[id]; });
+        latencies.sort(function (a, b) { return b - a; });
+        return {
+            url: location.href,
+            lcp: state.lcp,
+            cls: state.cls,
+            tbt: tbt,
+            // INP: the worst interaction, ignoring one outlier per 50 interactions
+            inp: latencies.length ? latencies[Math.min(latencies.length - 1, Math.floor(latencies.length / 50))] : null,
+            long_tasks: state.longTasks.length,
+            interactions: latencies.length
+        };
+    };
+    window.__webVitalsReset = reset;
+    addEventListener('pagehide', function () {
+        try {
+            var parked = JSON.parse(sessionStorage.getItem('__webVitals') || '[]');
+            parked.push(window.__webVitalsSummary());
+            sessionStorage.setItem('__webVitals', JSON.stringify(parked));
+        } catch (e) {}
+    });
+})();
+"""
+
+WEB_VITALS_READ_SCRIPT = """
+if (!window.__webVitalsSummary) {
+    return [];
+}
+var entries = [];
+try {
+    entries = JSON.parse(sessionStorage.getItem('__webVitals') || '[]');
+    sessionStorage.removeItem('__webVitals');
+} catch (e) {}
+entries.push(window.__webVitalsSummary());
+window.__webVitalsReset();
+return entries;
+"""
+
+def _has_data(entry):
+    return entry.get("lcp") is not None or entry.get("cls") or entry.get("long_tasks") or entry.get("interactions")
+
+class WebVitalsRecorder:
+    """Injects the Web Vitals observers and reads them back once per page object"""
+
+    _injected = set()
+    _pages = {}
+    _pending = {}
+
+    @staticmethod
+    def prepare(driver):
+        """Register the observers for every document loaded from now on; False if CDP is unavailable"""
+        session = driver.session_id
+        if session in WebVitalsRecorder._injected:
+            return True
+        if not hasattr(driver, "execute_cdp_cmd"):
+            return False
+        try:
+            driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": WEB_VITALS_OBSERVER_SCRIPT})
+        except Exception as e:
+            print(f"Failed to inject web vitals observers: {str(e)}")
+            return False
+        WebVitalsRecorder._injected.add(session)
+        return True
+
+    @staticmethod
+    def page_loaded(driver, page_name, injected=True):
+        """Attribute the current document to a page object class"""
+        if not injected:
+            # Without CDP the observers start late and only see buffered entries
+            try:
+                driver.execute_script(WEB_VITALS_OBSERVER_SCRIPT)
+            except Exception as e:
+                print(f"Failed to install web vitals observers: {str(e)}")
+        WebVitalsRecorder._pages[driver.session_id] = (page_name, driver.current_url)
+
+    @staticmethod
+    def flush(driver):
+        """Read the vitals gathered since the last read; they are added to page_metrics and kept for the test"""
+        loaded = WebVitalsRecorder._pages.get(getattr(driver, "session_id", None))
+        if loaded is None:
+            return []
+        page_name, loaded_url = loaded
+        try:
+            entries = [entry for entry in driver.execute_script(WEB_VITALS_READ_SCRIPT) if _has_data(entry)]
+        except Exception as e:
+            print(f"Failed to read web vitals: {str(e)}")
+            return []
+        for entry in entries:
+            # Documents reached from the loaded page (e.g. after a form submission) belong to no page object
+            entry["page"] = page_name if entry["url"] == loaded_url else None
+            PageMetricsRecorder.update(driver, entry["url"], {
+                vital: entry[vital] for vital in VITALS if entry[vital] is not None
+            })
+        WebVitalsRecorder._pending.setdefault(driver.session_id, []).extend(entries)
+        return entries
+
+    @staticmethod
+    def take(driver):
+        """Get and forget every entry read since the last call"""
+        return WebVitalsRecorder._pending.pop(getattr(driver, "session_id", None), [])
+
+class WebVitalsReport:
+    """Pytest plugin summarizing the run's Web Vitals per page object (controller)"""
+
+    def __init__(self):
+        self.pages = {}
+
+    def pytest_runtest_logreport(self, report):
+        if report.when != "teardown":
+            return
+        for key, value in report.user_properties:
+            if key == "page_vitals" and value["page"] is not None:
+                samples = self.pages.setdefault(value["page"], {vital: [] for vital in VITALS})
+                for vital in VITALS:
+                    if value.get(vital) is not None:
+                        samples[vital].append(value[vital])
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.pages:
+            return
+        terminalreporter.section("web vitals (p75)")
+        terminalreporter.write_line(f"{'LCP ms':>9} {'CLS':>7} {'TBT ms':>9} {'INP ms':>9} {'visits':>7}  page object")
+        for page_name, samples in sorted(self.pages.items()):
+            cells = []
+            for vital, width, precision in [("lcp", 9, 0), ("cls", 7, 3), ("tbt", 9, 0), ("inp", 9, 0)]:
+                values = samples[vital]
+                cells.append(f"{percentile(values, 0.75):>{width}.{precision}f}" if values else f"{'-':>{width}}")
+            visits = max(len(values) for values in samples.values())
+            terminalreporter.write_line(f"{' '.join(cells)} {visits:>7}  {page_name}")